@@ -0,0 +1,6 @@
+"""
+In-process benchmarks for the tracker API hot paths.
+
+Run from backend/:  python -m benchmarks.run --years 2 --output bench.json
+Compare two runs:   python -m benchmarks.compare before.json after.json
+"""
@@ -0,0 +1,187 @@
+"""
+Dashboard loads at rising concurrency against the WSGI deployment (gunicorn sync workers)
+and the ASGI one (gunicorn with uvicorn workers, async read views; see tracker.async_views).
+
+One seeded user; each client repeatedly loads the dashboard the way the frontend does:
+GET /api/dashboard/?period=<id>, /api/periods/ and /api/periods/<id>/summary/ for a random
+period. Both deployments run the same number of worker processes against the same SQLite
+file, with the response cache off so every request does its queries. --db-latency-ms adds
+a sleep before every query, standing in for the round trip to a database on another host;
+that waiting is what async workers overlap and sync workers cannot.
+The report gives, per deployment and concurrency level, latency percentiles and throughput.
+
+    python -m benchmarks.asgi_concurrency --workers 2 --concurrency 1 4 16 64 --db-latency-ms 2
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from .harness import free_port, summarize
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DEPLOYMENTS = {
+    "wsgi": ["config.wsgi:application"],
+    "asgi": ["config.asgi:application", "--worker-class", "uvicorn_worker.UvicornWorker"],
+}
+
+
+def _environment(db_path, latency_ms, cache):
+    return {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": "benchmarks.settings_latency",
+        "BENCH_DB_LATENCY_MS": str(latency_ms),
+        "DATABASE_URL": f"sqlite:///{db_path}",
+        "DJANGO_ALLOWED_HOSTS": "127.0.0.1",
+        "TRACKER_RESPONSE_CACHE_ENABLED": str(cache),
+        "TRACKER_METRICS_ENABLED": "False",
+        "SIMPLEJWT_ACCESS_LIFETIME_MIN": "240",
+    }
+
+
+def prepare_reader(env, years, results):
+    """Migrate a fresh database, seed one user and hand back an access token and the period ids."""
+    os.environ.update(env)
+    os.environ["BENCH_DB_LATENCY_MS"] = "0"
+    import django
+    django.setup()
+    from django.core.management import call_command
+
+    from tracker.auth import TrackerTokenObtainPairSerializer
+    from .seed import seed_user
+
+    call_command("migrate", verbosity=0)
+    user, periods, _ = seed_user("reader", years, random.Random(1))
+    token = TrackerTokenObtainPairSerializer.get_token(user).access_token
+    results.put({"token": str(token), "periods": [period.id for period in periods]})
+
+
+class Server:
+    def __init__(self, deployment, workers, env):
+        self.port = free_port()
+        self.base = f"http://127.0.0.1:{self.port}"
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", *DEPLOYMENTS[deployment],
+             "--bind", f"127.0.0.1:{self.port}", "--workers", str(workers), "--log-level", "warning"],
+            cwd=BACKEND_DIR, env=env,
+        )
+
+    def wait(self, timeout=60):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                with urllib.request.urlopen(self.base + "/", timeout=1):
+                    return
+            except OSError:
+                time.sleep(0.2)
+        raise RuntimeError("The server did not start.")
+
+    def stop(self):
+        self.process.terminate()
+        self.process.wait(timeout=30)
+
+
+def _get(base, url, token):
+    request = urllib.request.Request(base + url, headers={"Authorization": f"Bearer {token}"})
+    with urllib.request.urlopen(request, timeout=120) as response:
+        response.read()
+        return response.status
+
+
+def _dashboard_urls(rng, periods):
+    period = rng.choice(periods)
+    return [f"/api/dashboard/?period={period}", "/api/periods/", f"/api/periods/{period}/summary/"]
+
+
+def run_level(base, token, periods, concurrency, requests, seed):
+    """`requests` GETs shared by `concurrency` clients; returns the summary."""
+    remaining, lock = [requests], threading.Lock()
+    samples, errors = [], []
+    barrier = threading.Barrier(concurrency)
+
+    def client(index):
+        rng, queue = random.Random(seed + index), []
+        barrier.wait()
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+            if not queue:
+                queue = _dashboard_urls(rng, periods)
+            start = time.perf_counter()
+            try:
+                _get(base, queue.pop(0), token)
+            except (OSError, urllib.error.HTTPError) as exc:
+                errors.append(str(exc))
+                continue
+            samples.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(samples, time.perf_counter() - started, concurrency=concurrency, errors=len(errors))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrency vs latency: WSGI sync workers vs ASGI async read views.")
+    parser.add_argument("--workers", type=int, default=2, help="Worker processes per deployment.")
+    parser.add_argument("--concurrency", type=int, nargs="*", default=[1, 4, 16, 64])
+    parser.add_argument("--requests", type=int, default=600, help="Requests per concurrency level.")
+    parser.add_argument("--years", type=int, default=2, help="Years of monthly periods for the seeded user.")
+    parser.add_argument("--db-latency-ms", type=float, default=2.0, help="Simulated database round trip per query.")
+    parser.add_argument("--cache", action="store_true", help="Leave the response cache on.")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--deployments", nargs="*", choices=sorted(DEPLOYMENTS), default=list(DEPLOYMENTS))
+    parser.add_argument("--output", help="Write JSON results here instead of stdout.")
+    args = parser.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        env = _environment(Path(tmp) / "bench.sqlite3", args.db_latency_ms, args.cache)
+        context = multiprocessing.get_context("spawn")
+        queue = context.Queue()
+        prepare = context.Process(target=prepare_reader, args=(env, args.years, queue))
+        prepare.start()
+        seeded = queue.get()
+        prepare.join()
+
+        for deployment in args.deployments:
+            print(f"Starting the {deployment} deployment with {args.workers} worker(s)...", file=sys.stderr)
+            server = Server(deployment, args.workers, env)
+            try:
+                server.wait()
+                run_level(server.base, seeded["token"], seeded["periods"], 1, 30, args.seed)  # warm-up
+                results[deployment] = {}
+                for concurrency in args.concurrency:
+                    print(f"  {concurrency} concurrent client(s)", file=sys.stderr)
+                    results[deployment][f"c{concurrency}"] = run_level(
+                        server.base, seeded["token"], seeded["periods"], concurrency, args.requests, args.seed,
+                    )
+            finally:
+                server.stop()
+
+    report = {"parameters": vars(args), "results": results}
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+    return report
+
+
+if __name__ == "__main__":
+    main()
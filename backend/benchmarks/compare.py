@@ -0,0 +1,38 @@
+import argparse
+import json
+
+
+def flatten(results, prefix=""):
+    """{"daily_spending_writes": {"create": {...}}} -> {"daily_spending_writes.create": {...}}"""
+    flat = {}
+    for name, value in results.items():
+        if "p50_ms" in value:
+            flat[prefix + name] = value
+        else:
+            flat.update(flatten(value, f"{prefix}{name}."))
+    return flat
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark JSON files.")
+    parser.add_argument("before")
+    parser.add_argument("after")
+    args = parser.parse_args(argv)
+
+    with open(args.before) as fh:
+        before = flatten(json.load(fh)["results"])
+    with open(args.after) as fh:
+        after = flatten(json.load(fh)["results"])
+
+    print(f"{'scenario':<32} {'metric':<15} {'before':>10} {'after':>10} {'change':>8}")
+    for name in sorted(before.keys() & after.keys()):
+        for metric in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms", "queries"):
+            old, new = before[name].get(metric), after[name].get(metric)
+            if old is None or new is None:
+                continue
+            change = f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+            print(f"{name:<32} {metric:<15} {old:>10} {new:>10} {change:>8}")
+
+
+if __name__ == "__main__":
+    main()
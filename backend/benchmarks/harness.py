@@ -0,0 +1,80 @@
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    import django
+    django.setup()
+
+
+def percentile(sorted_samples, q):
+    """Nearest-rank percentile of already sorted samples."""
+    if not sorted_samples:
+        return None
+    index = max(0, min(len(sorted_samples) - 1, round(q * len(sorted_samples) + 0.5) - 1))
+    return sorted_samples[index]
+
+
+def summarize(samples, elapsed, **extra):
+    """Latency stats (ms) and throughput for one scenario."""
+    ordered = sorted(samples)
+    ms = lambda seconds: round(seconds * 1000, 3) if seconds is not None else None
+    return {
+        "n": len(samples),
+        "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else None,
+        "mean_ms": ms(statistics.fmean(samples)) if samples else None,
+        "p50_ms": ms(percentile(ordered, 0.50)),
+        "p95_ms": ms(percentile(ordered, 0.95)),
+        "p99_ms": ms(percentile(ordered, 0.99)),
+        "max_ms": ms(ordered[-1]) if ordered else None,
+        **extra,
+    }
+
+
+def measure(call, iterations, warmup=5):
+    """Run `call(i)` `iterations` times after a warm-up; returns (latencies in s, elapsed s)."""
+    for i in range(warmup):
+        call(-1 - i)
+    samples = []
+    started = time.perf_counter()
+    for i in range(iterations):
+        start = time.perf_counter()
+        call(i)
+        samples.append(time.perf_counter() - start)
+    return samples, time.perf_counter() - started
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def environment():
+    from django.conf import settings
+    from django.db import connection
+    import django
+
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=False,
+        ).stdout.strip() or None
+    except OSError:
+        revision = None
+    info = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_revision": revision,
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "db_vendor": connection.vendor,
+        "carryover_engine": getattr(settings, "TRACKER_CARRYOVER_ENGINE", None),
+    }
+    if connection.vendor == "sqlite":
+        info["sqlite"] = connection.Database.sqlite_version
+    return info
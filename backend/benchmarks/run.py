@@ -0,0 +1,306 @@
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from .harness import environment, measure, percentile, setup_django, summarize
+
+SCENARIOS = {}
+
+
+def scenario(name):
+    def register(func):
+        SCENARIOS[name] = func
+        return func
+    return register
+
+
+class Context:
+    """Seeded data plus an in-process client authenticated with a real JWT."""
+
+    def __init__(self, seeded, rng):
+        from django.test import Client
+
+        self.rng = rng
+        self.user, self.periods, self.categories = seeded[0]
+        self.client = Client()
+        self.login()
+
+    def login(self):
+        from .seed import PASSWORD
+
+        res = self.client.post("/api/token/", {"username": self.user.username, "password": PASSWORD})
+        assert res.status_code == 200, res.content
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {res.json()['access']}"}
+
+    def get(self, url, **params):
+        res = self.client.get(url, params, **self.auth)
+        assert res.status_code == 200, (url, res.status_code)
+        return res
+
+    def send(self, method, url, payload=None, expect=200):
+        res = getattr(self.client, method)(url, payload, content_type="application/json", **self.auth)
+        assert res.status_code == expect, (method, url, res.status_code, res.content[:200])
+        return res
+
+    def random_period(self):
+        return self.rng.choice(self.periods)
+
+
+def count_queries(call):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as captured:
+        call(0)
+    return len(captured.captured_queries)
+
+
+def run_scenario(call, iterations, warmup=5):
+    queries = count_queries(call)
+    samples, elapsed = measure(call, iterations, warmup=warmup)
+    return summarize(samples, elapsed, queries=queries)
+
+
+# ----- Reads -----
+
+@scenario("daily_spending_list")
+def daily_spending_list(ctx, iterations):
+    return run_scenario(lambda i: ctx.get("/api/daily-house-spendings/", period=ctx.random_period().id), iterations)
+
+
+@scenario("budget_list")
+def budget_list(ctx, iterations):
+    return run_scenario(lambda i: ctx.get("/api/budgets/", period=ctx.random_period().id), iterations)
+
+
+@scenario("ledger_export")
+def ledger_export(ctx, iterations):
+    """Full CSV export of the seeded user; also reports time to the first chunk."""
+    first_chunk = []
+
+    def call(i):
+        start = time.perf_counter()
+        res = ctx.client.get("/api/export/", {"format": "csv"}, **ctx.auth)
+        chunks = iter(res.streaming_content)
+        next(chunks)
+        first_chunk.append(time.perf_counter() - start)
+        for _ in chunks:
+            pass
+
+    result = run_scenario(call, max(1, iterations // 10), warmup=1)
+    samples = sorted(first_chunk[-result["n"]:])
+    result["first_chunk_p50_ms"] = round(percentile(samples, 0.50) * 1000, 3)
+    return result
+
+
+@scenario("list_serializers")
+def list_serializers(ctx, iterations):
+    """
+    Daily spending and budget lists of the seeded user (all periods), rendered by the DRF
+    serializers and by the values_list() readers; also the list endpoints with each path.
+    """
+    from django.test import override_settings
+    from tracker.models import Budget, DailyHouseSpending
+    from tracker.readers import READERS
+    from tracker.serializers import BudgetSerializer, DailyHouseSpendingSerializer
+
+    results = {}
+    for name, serializer_class, queryset, url in (
+        ("daily_spending", DailyHouseSpendingSerializer,
+         DailyHouseSpending.objects.filter(user=ctx.user).order_by("date", "id"), "/api/daily-house-spendings/"),
+        ("budget", BudgetSerializer,
+         Budget.objects.filter(user=ctx.user).select_related("category"), "/api/budgets/"),
+    ):
+        reader = READERS[serializer_class]
+        drf = run_scenario(lambda i: serializer_class(list(queryset.all()), many=True).data, iterations)
+        fast = run_scenario(lambda i: reader.render(list(reader.rows(queryset.all()))), iterations)
+        # The response cache would answer every repeat; measure the rendering path.
+        with override_settings(TRACKER_RESPONSE_CACHE_ENABLED=False):
+            with override_settings(TRACKER_FAST_LISTS=False):
+                drf_http = run_scenario(lambda i: ctx.get(url), iterations)
+            fast_http = run_scenario(lambda i: ctx.get(url), iterations)
+        results[name] = {
+            "rows": queryset.count(),
+            "serializer": drf, "reader": fast,
+            "speedup_p50": round(drf["p50_ms"] / fast["p50_ms"], 2) if fast["p50_ms"] else None,
+            "endpoint_serializer": drf_http, "endpoint_reader": fast_http,
+            "endpoint_speedup_p50": round(drf_http["p50_ms"] / fast_http["p50_ms"], 2) if fast_http["p50_ms"] else None,
+        }
+    return results
+
+
+# ----- Daily spending writes (one long period so rectification has a real tail) -----
+
+@scenario("daily_spending_writes")
+def daily_spending_writes(ctx, iterations):
+    """create, update and destroy measured separately against a period of 2 x (iterations + warmup) days."""
+    from tracker.carryover import rectify_period
+    from tracker.models import DailyHouseSpending, Period
+
+    warmup = 5
+    days = 2 * (iterations + warmup + 1)
+    start = date(2030, 1, 1)
+    period = Period.objects.create(
+        user=ctx.user, name="Bench", start_date=start, end_date=start + timedelta(days=days),
+        default_daily_limit=Decimal("100"),
+    )
+    DailyHouseSpending.objects.bulk_create(
+        DailyHouseSpending(user=ctx.user, period=period, date=start + timedelta(days=d),
+                           spent_amount=Decimal(ctx.rng.randint(2000, 16000)) / 100)
+        for d in range(0, days, 2)
+    )
+    rectify_period(period, ctx.user)
+    existing = list(DailyHouseSpending.objects.filter(period=period).values_list("id", flat=True))
+    free_days = list(range(1, days, 2))
+    ctx.rng.shuffle(free_days)
+    created = []
+    ctx.login()
+
+    def create(i):
+        day = free_days.pop()
+        res = ctx.send("post", "/api/daily-house-spendings/", {
+            "period": period.id, "date": str(start + timedelta(days=day)),
+            "spent_amount": str(Decimal(ctx.rng.randint(2000, 16000)) / 100), "fixed_daily_limit": "100",
+        }, expect=201)
+        created.append(res.json()["id"])
+
+    def update(i):
+        row = ctx.rng.choice(existing)
+        ctx.send("patch", f"/api/daily-house-spendings/{row}/", {
+            "spent_amount": str(Decimal(ctx.rng.randint(2000, 16000)) / 100),
+        })
+
+    def destroy(i):
+        ctx.send("delete", f"/api/daily-house-spendings/{created.pop()}/", expect=204)
+
+    results = {
+        "create": run_scenario(create, iterations, warmup),
+        "update": run_scenario(update, iterations, warmup),
+    }
+    results["destroy"] = run_scenario(destroy, len(created) - warmup - 1, warmup)
+    return results
+
+
+# ----- Auth -----
+
+@scenario("token_obtain")
+def token_obtain(ctx, iterations):
+    from .seed import PASSWORD
+
+    payload = {"username": ctx.user.username, "password": PASSWORD}
+
+    def call(i):
+        res = ctx.client.post("/api/token/", payload)
+        assert res.status_code == 200
+
+    return run_scenario(call, iterations, warmup=1)
+
+
+# Hasher configurations compared by login_throughput: (TRACKER_PASSWORD_HASHER, settings).
+LOGIN_HASHERS = {
+    "pbkdf2_1m": ("pbkdf2", {"TRACKER_PBKDF2_ITERATIONS": 1_000_000}),
+    "pbkdf2_600k": ("pbkdf2", {"TRACKER_PBKDF2_ITERATIONS": 600_000}),
+    "scrypt_n14_p5": ("scrypt", {"TRACKER_SCRYPT_WORK_FACTOR": 2 ** 14, "TRACKER_SCRYPT_PARALLELISM": 5}),
+    "scrypt_n14_p1": ("scrypt", {"TRACKER_SCRYPT_WORK_FACTOR": 2 ** 14, "TRACKER_SCRYPT_PARALLELISM": 1}),
+}
+
+
+@scenario("login_throughput")
+def login_throughput(ctx, iterations):
+    """
+    Logins per second of one process, i.e. of one sync gunicorn worker, per hasher setup.
+    The password is re-hashed under each setup first, as a login after a switch would do.
+    """
+    from django.conf import settings
+    from django.test import override_settings
+
+    from .seed import PASSWORD
+
+    payload = {"username": ctx.user.username, "password": PASSWORD}
+    results = {}
+    for name, (preferred, costs) in LOGIN_HASHERS.items():
+        hashers = [path for path in settings.PASSWORD_HASHERS if preferred in path.lower()]
+        hashers += [path for path in settings.PASSWORD_HASHERS if path not in hashers]
+        with override_settings(PASSWORD_HASHERS=hashers, **costs):
+            ctx.user.set_password(PASSWORD)
+            ctx.user.save(update_fields=["password"])
+
+            def call(i):
+                res = ctx.client.post("/api/token/", payload)
+                assert res.status_code == 200
+
+            result = run_scenario(call, iterations, warmup=1)
+        result["logins_per_second_per_worker"] = result.pop("throughput_rps")
+        results[name] = result
+    ctx.login()
+    return results
+
+
+@scenario("token_refresh")
+def token_refresh(ctx, iterations):
+    def call(i):
+        res = ctx.client.post("/api/token/refresh/")
+        assert res.status_code == 200
+
+    return run_scenario(call, iterations)
+
+
+def _run(args):
+    setup_django()
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    from .seed import seed
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        print(f"Seeding {args.users} user(s), up to {args.years} year(s) each...", file=sys.stderr)
+        ctx = Context(seed(args.users, args.years, args.seed), random.Random(args.seed))
+        results = {}
+        for name in args.only or SCENARIOS:
+            print(f"Running {name}...", file=sys.stderr)
+            iterations = args.auth_iterations if name in ("token_obtain", "login_throughput") else args.iterations
+            ctx.login()
+            results[name] = SCENARIOS[name](ctx, iterations)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        connection.close()
+        teardown_test_environment()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the tracker API hot paths in-process.")
+    parser.add_argument("--users", type=int, default=3)
+    parser.add_argument("--years", type=int, default=2, choices=range(1, 6), help="History of the main user (others get 1..years).")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--auth-iterations", type=int, default=20, help="Iterations for the login scenarios (password hashing is slow by design).")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--only", nargs="*", choices=sorted(SCENARIOS), help="Run only these scenarios.")
+    parser.add_argument("--output", help="Write JSON results here instead of stdout.")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Unless DATABASE_URL picks one, every SQLite file the run opens lives in a scratch
+        # directory removed on exit, not next to manage.py.
+        os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tmp, 'bench.sqlite3')}")
+        results = _run(args)
+        report = {"environment": environment(), "parameters": vars(args), "results": results}
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from tracker.carryover import rectify_period
+from tracker.models import (
+    Budget, BudgetCategory, DailyHouseSpending, Income, MiscellaneousCost, Period,
+)
+from tracker.rollups import rebuild_rollup
+
+User = get_user_model()
+PASSWORD = "bench-password-123"
+CATEGORIES = ["Rent", "Utilities", "Groceries", "Transport", "Insurance", "Phone", "Internet", "Savings"]
+
+
+def money(rng, low, high):
+    return Decimal(rng.randint(low * 100, high * 100)) / 100
+
+
+def _month_starts(first, months):
+    year, month = first.year, first.month
+    for _ in range(months):
+        yield date(year, month, 1)
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+@transaction.atomic
+def seed_user(username, years, rng, first_month=date(2020, 1, 1)):
+    """
+    One user with monthly periods covering `years` years, each holding incomes, budgets,
+    misc costs and a daily spending for every day, with carryovers and rollups in place.
+    """
+    user = User.objects.create_user(username=username, password=PASSWORD)
+    categories = BudgetCategory.objects.bulk_create(
+        BudgetCategory(user=user, name=name) for name in CATEGORIES
+    )
+    periods = []
+    for start in _month_starts(first_month, 12 * years):
+        end = (start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        periods.append(Period(
+            user=user, name=start.strftime("%B %Y"), start_date=start, end_date=end,
+            default_daily_limit=Decimal("100"),
+        ))
+    Period.objects.bulk_create(periods)
+
+    incomes, budgets, costs, spendings = [], [], [], []
+    for period in periods:
+        days = (period.end_date - period.start_date).days + 1
+        incomes += [
+            Income(user=user, period=period, source="Salary", amount=money(rng, 3000, 4000), date_received=period.start_date),
+            Income(user=user, period=period, source="Side", amount=money(rng, 100, 600), date_received=period.start_date + timedelta(days=14)),
+        ]
+        budgets += [
+            Budget(user=user, period=period, category=category, amount_allocated=money(rng, 50, 1200),
+                   status=rng.choice(["paid", "not_paid"]), due_date=period.start_date + timedelta(days=rng.randrange(days)))
+            for category in categories
+        ]
+        costs += [
+            MiscellaneousCost(user=user, period=period, title=f"Misc {n}", amount=money(rng, 5, 200))
+            for n in range(5)
+        ]
+        spendings += [
+            DailyHouseSpending(user=user, period=period, date=period.start_date + timedelta(days=d),
+                               spent_amount=money(rng, 20, 160), fixed_daily_limit=Decimal("100"))
+            for d in range(days)
+        ]
+    Income.objects.bulk_create(incomes)
+    Budget.objects.bulk_create(budgets)
+    MiscellaneousCost.objects.bulk_create(costs)
+    DailyHouseSpending.objects.bulk_create(spendings, batch_size=1000)
+    for period in periods:
+        rectify_period(period, user)
+        rebuild_rollup(period)
+    return user, periods, categories
+
+
+def seed(users, years, seed_value=1):
+    """Create `users` users with 1..`years` years of history each (deterministic per seed)."""
+    rng = random.Random(seed_value)
+    created = []
+    for n in range(users):
+        user_years = years if n == 0 else rng.randint(1, years)
+        created.append(seed_user(f"bench{n}", user_years, rng))
+    return created
@@ -0,0 +1,27 @@
+"""
+Settings for benchmarks.asgi_concurrency: the app's settings, plus BENCH_DB_LATENCY_MS of
+sleep before every query, standing in for the network round trip to a database server
+(PostgreSQL on another host) when benchmarking against a local SQLite file.
+"""
+import os
+import time
+
+from django.db.backends.signals import connection_created
+
+from config.settings import *  # noqa: F401,F403
+
+_LATENCY = float(os.getenv("BENCH_DB_LATENCY_MS", "0")) / 1000
+
+
+def _delay(execute, sql, params, many, context):
+    time.sleep(_LATENCY)
+    return execute(sql, params, many, context)
+
+
+def _add_latency(sender, connection, **kwargs):
+    if _delay not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_delay)
+
+
+if _LATENCY:
+    connection_created.connect(_add_latency)
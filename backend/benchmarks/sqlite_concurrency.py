@@ -0,0 +1,173 @@
+"""
+Concurrent daily-spending writes against a SQLite file, with Django's default SQLite setup
+and with the production profile (config/database.py).
+
+Each profile gets a fresh database file. Worker processes, like gunicorn sync workers, then
+write to one shared period through the API at the same time, alternating between creating a
+day (the model reads the previous day's carryover before inserting) and PATCHing a random
+existing day, so every write rectifies carryovers while the others are writing. The report
+gives write throughput, latency and the share of writes that failed with "database is locked".
+
+    python -m benchmarks.sqlite_concurrency --workers 3 --writes 100
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from .harness import summarize
+
+PROFILES = {"default": "False", "tuned": "True"}
+
+
+def _setup(db_path, tuned):
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["SQLITE_TUNED"] = tuned
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    import django
+    django.setup()
+    from django.test.utils import setup_test_environment
+    setup_test_environment()
+
+
+def _prepare(db_path, tuned, days):
+    """Migrate a fresh database and seed one user with a period of 2 x `days` days, every other one recorded."""
+    _setup(db_path, tuned)
+    from datetime import date, timedelta
+    from decimal import Decimal
+
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+
+    from tracker.carryover import rectify_period
+    from tracker.models import DailyHouseSpending, Period
+
+    call_command("migrate", verbosity=0)
+    user = get_user_model().objects.create_user(username="writer", password="unused-password")
+    start = date(2030, 1, 1)
+    period = Period.objects.create(
+        user=user, name="Contended", start_date=start, end_date=start + timedelta(days=2 * days - 1),
+        default_daily_limit=Decimal("100"),
+    )
+    DailyHouseSpending.objects.bulk_create(
+        DailyHouseSpending(user=user, period=period, date=start + timedelta(days=d), spent_amount=Decimal("50"))
+        for d in range(0, 2 * days, 2)
+    )
+    rectify_period(period, user)
+
+
+def _worker(db_path, tuned, writes, index, workers, seed, barrier, results):
+    _setup(db_path, tuned)
+    from datetime import timedelta
+
+    from django.contrib.auth import get_user_model
+    from django.db import OperationalError
+    from django.test import Client
+
+    from tracker.auth import TrackerTokenObtainPairSerializer
+    from tracker.models import DailyHouseSpending, Period
+
+    user = get_user_model().objects.get(username="writer")
+    token = TrackerTokenObtainPairSerializer.get_token(user).access_token
+    auth = {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+    period = Period.objects.get(user=user)
+    ids = list(DailyHouseSpending.objects.values_list("id", flat=True))
+    # Free (odd) days, split between the workers so creates never collide on a date.
+    free_days = list(range(1 + 2 * index, (period.end_date - period.start_date).days + 1, 2 * workers))
+    client, rng = Client(), random.Random(seed)
+    samples, locked, failed = [], 0, 0
+
+    barrier.wait()
+    started = time.perf_counter()
+    for i in range(writes):
+        spent = str(rng.randint(1000, 16000) / 100)
+        start = time.perf_counter()
+        try:
+            if i % 2 == 0 and free_days:
+                day = period.start_date + timedelta(days=free_days.pop(rng.randrange(len(free_days))))
+                res = client.post("/api/daily-house-spendings/", {
+                    "period": period.id, "date": str(day), "spent_amount": spent, "fixed_daily_limit": "100",
+                }, content_type="application/json", **auth)
+            else:
+                res = client.patch(
+                    f"/api/daily-house-spendings/{rng.choice(ids)}/", {"spent_amount": spent},
+                    content_type="application/json", **auth,
+                )
+        except OperationalError as exc:
+            locked += "locked" in str(exc)
+            failed += "locked" not in str(exc)
+            continue
+        if res.status_code in (200, 201):
+            samples.append(time.perf_counter() - start)
+        else:
+            failed += 1
+    results.put({"samples": samples, "locked": locked, "failed": failed, "elapsed": time.perf_counter() - started})
+
+
+def run_profile(name, workers, writes, days, seed):
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.sqlite3"
+        tuned = PROFILES[name]
+        prepare = context.Process(target=_prepare, args=(db_path, tuned, days))
+        prepare.start()
+        prepare.join()
+        if prepare.exitcode:
+            raise RuntimeError(f"Preparing the {name} database failed.")
+
+        barrier, results = context.Barrier(workers), context.Queue()
+        processes = [
+            context.Process(target=_worker, args=(db_path, tuned, writes, i, workers, seed + i, barrier, results))
+            for i in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        reports = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+    samples = [s for report in reports for s in report["samples"]]
+    elapsed = max(report["elapsed"] for report in reports)
+    attempted = workers * writes
+    locked = sum(report["locked"] for report in reports)
+    return summarize(
+        samples, elapsed,
+        attempted=attempted,
+        locked_errors=locked,
+        other_errors=sum(report["failed"] for report in reports),
+        lock_error_rate=round(locked / attempted, 4),
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent SQLite write benchmark: default setup vs production profile.")
+    parser.add_argument("--workers", type=int, default=3, help="Concurrent writer processes (gunicorn workers).")
+    parser.add_argument("--writes", type=int, default=100, help="Writes per worker.")
+    parser.add_argument("--days", type=int, default=365, help="Recorded days in the contended period (rectification tail).")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--profiles", nargs="*", choices=sorted(PROFILES), default=list(PROFILES))
+    parser.add_argument("--output", help="Write JSON results here instead of stdout.")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name in args.profiles:
+        print(f"Running {name} profile with {args.workers} worker(s)...", file=sys.stderr)
+        results[name] = run_profile(name, args.workers, args.writes, args.days, args.seed)
+
+    report = {"parameters": vars(args), "results": results}
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Container start-up cost: the preparation step and the time until gunicorn serves warm.
+
+Preparation, timed as separate processes on a fresh database and static root, then again
+with nothing changed (a container restart):
+- legacy: `manage.py migrate` then `manage.py collectstatic`, as entrypoint.sh used to;
+- prepare_server: both in one process, each skipped when nothing changed.
+
+Servers, each started with the same number of workers:
+- legacy: `gunicorn config.wsgi:application --workers N`, the old command line;
+- the config/gunicorn.conf.py profiles: sync, sync without preload, gthread and uvicorn.
+For each start the report gives the time until `/` answers (ready), the latency of the
+first dashboard loads, one per worker, sent together right after (their first requests pay
+for whatever was not loaded before the fork), and the proportional memory (PSS) of the
+master plus workers afterwards, on Linux.
+
+    python -m benchmarks.startup --workers 3 --repeats 3
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+from .asgi_concurrency import prepare_reader
+from .harness import free_port, summarize
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+CONFIG = ["-c", "config/gunicorn.conf.py"]
+SERVERS = {
+    "legacy": (["config.wsgi:application"], {}),
+    "sync": (CONFIG, {"GUNICORN_WORKER_CLASS": "sync"}),
+    "sync_no_preload": (CONFIG, {"GUNICORN_WORKER_CLASS": "sync", "GUNICORN_PRELOAD": "False"}),
+    "gthread": (CONFIG, {"GUNICORN_WORKER_CLASS": "gthread"}),
+    "uvicorn": (CONFIG, {"GUNICORN_WORKER_CLASS": "uvicorn"}),
+}
+
+
+def _manage(env, *command):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "manage.py", *command], cwd=BACKEND_DIR, env=env, check=True, capture_output=True)
+    return time.perf_counter() - start
+
+
+def _preparation_env(tmp, run):
+    return {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": "config.settings",
+        "DATABASE_URL": f"sqlite:///{tmp / f'prepare-{run}.sqlite3'}",
+        "STATIC_ROOT": str(tmp / f"static-{run}"),
+    }
+
+
+def time_preparation(tmp, repeats):
+    """{step: {cold, warm}} timings over `repeats` fresh databases and static roots each."""
+    samples = {"legacy": {"cold": [], "warm": []}, "prepare_server": {"cold": [], "warm": []}}
+    for run in range(repeats):
+        for step in samples:
+            env = _preparation_env(tmp, f"{step}-{run}")
+            for state in ("cold", "warm"):
+                if step == "legacy":
+                    elapsed = _manage(env, "migrate", "--noinput") + _manage(env, "collectstatic", "--noinput")
+                else:
+                    elapsed = _manage(env, "prepare_server")
+                samples[step][state].append(elapsed)
+    return {
+        step: {state: summarize(values, None) for state, values in states.items()}
+        for step, states in samples.items()
+    }
+
+
+def _pss_kb(pid):
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as fh:
+            return next(int(line.split()[1]) for line in fh if line.startswith("Pss:"))
+    except (OSError, StopIteration):
+        return None
+
+
+def _children(pid):
+    children = []
+    for entry in Path("/proc").iterdir():
+        if entry.name.isdigit():
+            try:
+                # The parent pid is the 4th field, after "pid (comm) state"; comm may hold spaces.
+                if int((entry / "stat").read_text().rsplit(")", 1)[1].split()[1]) == pid:
+                    children.append(int(entry.name))
+            except (OSError, IndexError, ValueError):
+                continue
+    return children
+
+
+def tree_pss_mb(pid):
+    values = [_pss_kb(p) for p in [pid, *_children(pid)]]
+    if any(value is None for value in values):
+        return None
+    return round(sum(values) / 1024, 1)
+
+
+def _get(url, token=None):
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    with urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=60) as response:
+        response.read()
+
+
+def start_server(name, workers, env, seeded):
+    args, extra = SERVERS[name]
+    port = free_port()
+    bind = f"127.0.0.1:{port}"
+    if args is CONFIG:
+        command = [*args]
+        extra = {**extra, "GUNICORN_BIND": bind, "GUNICORN_WORKERS": str(workers)}
+    else:
+        command = [*args, "--bind", bind, "--workers", str(workers)]
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", *command, "--log-level", "warning"],
+        cwd=BACKEND_DIR, env={**env, **extra}, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        base = f"http://{bind}"
+        while True:
+            try:
+                _get(base + "/")
+                break
+            except OSError:
+                if process.poll() is not None or time.perf_counter() - started > 60:
+                    raise RuntimeError(f"The {name} server did not start.")
+                time.sleep(0.01)
+        ready = time.perf_counter() - started
+
+        latencies = []
+
+        def first_load(period):
+            start = time.perf_counter()
+            _get(f"{base}/api/dashboard/?period={period}", seeded["token"])
+            latencies.append(time.perf_counter() - start)
+
+        threads = [threading.Thread(target=first_load, args=(seeded["periods"][i % len(seeded["periods"])],))
+                   for i in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return ready, latencies, tree_pss_mb(process.pid)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Start-up benchmark: preparation step and gunicorn profiles.")
+    parser.add_argument("--workers", type=int, default=3, help="Worker processes for every server profile.")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--servers", nargs="*", choices=list(SERVERS), default=list(SERVERS))
+    parser.add_argument("--skip-preparation", action="store_true")
+    parser.add_argument("--output", help="Write JSON results here instead of stdout.")
+    args = parser.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        if not args.skip_preparation:
+            print("Timing the preparation step...", file=sys.stderr)
+            results["preparation"] = time_preparation(tmp, args.repeats)
+
+        env = {
+            **_preparation_env(tmp, "server"),
+            "DJANGO_ALLOWED_HOSTS": "127.0.0.1",
+            "TRACKER_RESPONSE_CACHE_ENABLED": "False",
+            "SIMPLEJWT_ACCESS_LIFETIME_MIN": "60",
+        }
+        context = multiprocessing.get_context("spawn")
+        queue = context.Queue()
+        prepare = context.Process(target=prepare_reader, args=(env, 1, queue))
+        prepare.start()
+        seeded = queue.get()
+        prepare.join()
+
+        results["servers"] = {}
+        for name in args.servers:
+            print(f"Starting the {name} server {args.repeats} time(s)...", file=sys.stderr)
+            ready, first, memory = [], [], []
+            for _ in range(args.repeats):
+                seconds, latencies, pss = start_server(name, args.workers, env, seeded)
+                ready.append(seconds)
+                first.extend(latencies)
+                if pss is not None:
+                    memory.append(pss)
+            results["servers"][name] = {
+                "ready": summarize(ready, None),
+                "first_dashboard_loads": summarize(first, None),
+                "pss_mb": statistics.median(memory) if memory else None,
+            }
+
+    report = {"parameters": vars(args), "results": results}
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+    return report
+
+
+if __name__ == "__main__":
+    main()
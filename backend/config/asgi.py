@@ -12,5 +12,10 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+# Async read views for the dashboard endpoints (tracker.async_views).
+os.environ.setdefault('TRACKER_ASYNC_READS', 'True')
+# The async ORM runs each request's queries on a thread of its own, so a persistent
+# connection would be opened per request and never reused; PostgreSQL pools instead.
+os.environ.setdefault('DB_CONN_MAX_AGE', '0')
 
 application = get_asgi_application()
@@ -0,0 +1,84 @@
+"""
+SQLite production profile, shared by settings.py and settings_docker.py.
+
+SQLite allows one writer at a time. With the default rollback journal and DEFERRED
+transactions, a write transaction that has already read (the rectifications lock rows with
+select_for_update(), a no-op on SQLite) cannot wait for the write lock when another worker
+holds it: SQLite fails it at once with "database is locked" instead of calling the busy handler.
+The profile therefore:
+- starts every transaction.atomic() block with BEGIN IMMEDIATE, so writers queue for the
+  lock up front, waiting up to busy_timeout;
+- uses WAL, so readers never block the writer nor the writer the readers, with
+  synchronous=NORMAL (durable across application crashes; a power loss may drop the last
+  commits, never corrupt the file);
+- maps up to SQLITE_MMAP_SIZE bytes of the file and keeps a SQLITE_CACHE_KB page cache;
+- keeps connections open for DB_CONN_MAX_AGE seconds, so the pragmas are not re-run on
+  every request.
+WAL needs the database on a local filesystem (a Docker volume is fine, NFS is not).
+SQLITE_TUNED=False restores Django's defaults (for comparisons).
+
+PostgreSQL (a postgres:// DATABASE_URL, needs dj-database-url and psycopg) uses psycopg's
+connection pool (Django 5.1+): each worker process keeps between DB_POOL_MIN_SIZE and
+DB_POOL_MAX_SIZE connections and waits up to DB_POOL_TIMEOUT seconds for a free one.
+DB_POOL=False falls back to persistent connections (DB_CONN_MAX_AGE), e.g. behind PgBouncer.
+DATABASE_REPLICA_URL adds a "replica" alias that tracker.routers sends reads to.
+"""
+import os
+
+
+def sqlite_database(name):
+    if os.getenv('SQLITE_TUNED', 'True').lower() != 'true':
+        return {'ENGINE': 'django.db.backends.sqlite3', 'NAME': name}
+    pragmas = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 10_000)),
+        'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', 128 * 1024 * 1024)),
+        'cache_size': -int(os.getenv('SQLITE_CACHE_KB', 20_000)),  # negative: KiB, not pages
+        'temp_store': 'MEMORY',
+    }
+    return {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': name,
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+            'init_command': ';'.join(f'PRAGMA {pragma}={value}' for pragma, value in pragmas.items()),
+        },
+    }
+
+
+def postgres_database(url):
+    try:
+        import dj_database_url
+    except ImportError:
+        raise ImportError("Please install dj-database-url to parse non-sqlite DATABASE_URL")
+    if os.getenv('DB_POOL', 'True').lower() != 'true':
+        return dj_database_url.parse(
+            url, conn_max_age=int(os.getenv('DB_CONN_MAX_AGE', 600)), conn_health_checks=True,
+        )
+    # The pool replaces persistent connections: Django refuses CONN_MAX_AGE != 0 with it.
+    database = dj_database_url.parse(url, conn_max_age=0)
+    database.setdefault('OPTIONS', {})['pool'] = {
+        'min_size': int(os.getenv('DB_POOL_MIN_SIZE', 2)),
+        'max_size': int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+        'timeout': int(os.getenv('DB_POOL_TIMEOUT', 10)),
+    }
+    return database
+
+
+def database(url):
+    if url.startswith('sqlite'):
+        return sqlite_database(url.replace('sqlite:///', ''))
+    return postgres_database(url)
+
+
+def databases(default_url):
+    """DATABASES from DATABASE_URL (default_url when unset) and the optional DATABASE_REPLICA_URL."""
+    result = {'default': database(os.getenv('DATABASE_URL', default_url))}
+    replica_url = os.getenv('DATABASE_REPLICA_URL')
+    if replica_url:
+        # Tests run against the primary only: the replica alias points at the test database.
+        result['replica'] = {**database(replica_url), 'TEST': {'MIRROR': 'default'}}
+    return result
@@ -0,0 +1,85 @@
+"""
+Gunicorn server profile: `gunicorn -c config/gunicorn.conf.py` (see entrypoint.sh).
+
+GUNICORN_WORKER_CLASS  sync (default), gthread, or uvicorn (serves config.asgi, with the async
+                       dashboard reads of tracker.async_views).
+GUNICORN_WORKERS       worker processes. By default derived from the CPUs available to the
+                       container (affinity and cgroup quota): 2 x CPUs + 1 for sync, CPUs + 1
+                       for gthread, CPUs for uvicorn, at most GUNICORN_MAX_WORKERS (12).
+GUNICORN_THREADS       threads per gthread worker (4).
+GUNICORN_PRELOAD       True (default): the master imports and warms up the app (config.warmup)
+                       once, then freezes the heap so the forked workers share it copy-on-write
+                       and start serving warm. False: each worker imports and warms up its own.
+GUNICORN_TIMEOUT, GUNICORN_BIND, GUNICORN_MAX_REQUESTS (0: never recycle workers).
+"""
+import gc
+import math
+import os
+from pathlib import Path
+
+WORKER_CLASSES = {
+    "sync": "sync",
+    "gthread": "gthread",
+    "uvicorn": "uvicorn_worker.UvicornWorker",
+}
+
+
+def _flag(name, default):
+    return os.getenv(name, str(default)).lower() == "true"
+
+
+def available_cpus():
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def default_workers(kind, cpus):
+    per_class = {"sync": 2 * cpus + 1, "gthread": cpus + 1, "uvicorn": cpus}
+    return min(per_class[kind], int(os.getenv("GUNICORN_MAX_WORKERS", 12)))
+
+
+_kind = os.getenv("GUNICORN_WORKER_CLASS", "sync")
+if _kind not in WORKER_CLASSES:
+    raise ValueError(f"GUNICORN_WORKER_CLASS must be one of: {', '.join(WORKER_CLASSES)}.")
+
+wsgi_app = "config.asgi:application" if _kind == "uvicorn" else "config.wsgi:application"
+worker_class = WORKER_CLASSES[_kind]
+workers = int(os.getenv("GUNICORN_WORKERS") or default_workers(_kind, available_cpus()))
+threads = int(os.getenv("GUNICORN_THREADS", 4)) if _kind == "gthread" else 1
+preload_app = _flag("GUNICORN_PRELOAD", True)
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 60))
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 0))
+max_requests_jitter = max_requests // 10
+accesslog = "-"
+errorlog = "-"
+# Worker heartbeats on tmpfs instead of the container's overlay filesystem.
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
+
+
+def when_ready(server):
+    if not preload_app:
+        return
+    from config.warmup import warm_up
+    server.log.info("App warmed up in the master in %.0f ms", warm_up() * 1000)
+    # Move everything loaded so far out of the collector's reach: the workers' GC passes
+    # would otherwise write to (and so copy) every shared page holding an object header.
+    gc.collect()
+    gc.freeze()
+
+
+def post_worker_init(worker):
+    if preload_app:
+        return
+    from config.warmup import warm_up
+    worker.log.info("App warmed up in worker %s in %.0f ms", worker.pid, warm_up() * 1000)
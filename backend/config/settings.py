@@ -4,6 +4,8 @@ import os
 from dotenv import load_dotenv
 from urllib.parse import urlparse
 
+from .database import databases
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 load_dotenv(BASE_DIR.parent / '.env.backend')
 
@@ -25,6 +27,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'tracker.metrics.QueryMetricsMiddleware',
+    'tracker.routers.ReplicaStickinessMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -60,23 +64,37 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'config.wsgi.application'
 
-db_url = os.getenv('DATABASE_URL', f"sqlite:///{BASE_DIR / 'db.sqlite3'}")
-
-if db_url.startswith('sqlite'):
-    DATABASES = {
-        'default': {
-            'ENGINE': 'django.db.backends.sqlite3',
-            'NAME': db_url.replace('sqlite:///', ''),
-        }
-    }
-else:
-    try:
-        import dj_database_url
-    except ImportError:
-        raise ImportError("Please install dj-database-url to parse non-sqlite DATABASE_URL")
-    DATABASES = {
-        'default': dj_database_url.parse(db_url)
-    }
+# DATABASE_URL: SQLite with the production profile (the default) or PostgreSQL with a
+# connection pool; DATABASE_REPLICA_URL optionally adds a read replica (see config/database.py).
+DATABASES = databases(f"sqlite:///{BASE_DIR / 'db.sqlite3'}")
+
+# Reads go to the replica when there is one, except right after a client's writes
+# (tracker.routers): write requests, and requests within this many seconds of one, use the primary.
+TRACKER_REPLICA_ALIAS = 'replica' if 'replica' in DATABASES else None
+TRACKER_REPLICA_STICKY_SECONDS = int(os.getenv('TRACKER_REPLICA_STICKY_SECONDS', 5))
+DATABASE_ROUTERS = ['tracker.routers.PrimaryReplicaRouter']
+
+# Password hashing (tracker.hashers): "pbkdf2" (PBKDF2-SHA256) or "scrypt" (hashlib.scrypt).
+# New passwords use the chosen hasher with the costs below; hashes written with the other one,
+# or with other costs, still verify and are re-hashed on the user's next login.
+# PBKDF2 keeps Django's round count unless TRACKER_PBKDF2_ITERATIONS is set. Setting it below
+# Django's default re-hashes existing passwords to the lower count on login; that is the
+# deployment's call (OWASP's floor for PBKDF2-HMAC-SHA256 is 600k).
+TRACKER_PASSWORD_HASHER = os.getenv('TRACKER_PASSWORD_HASHER', 'pbkdf2')
+TRACKER_PBKDF2_ITERATIONS = int(os.getenv('TRACKER_PBKDF2_ITERATIONS', 0)) or None
+TRACKER_SCRYPT_WORK_FACTOR = int(os.getenv('TRACKER_SCRYPT_WORK_FACTOR', 2 ** 14))
+TRACKER_SCRYPT_PARALLELISM = int(os.getenv('TRACKER_SCRYPT_PARALLELISM', 5))
+_TRACKER_HASHERS = {
+    'pbkdf2': 'tracker.hashers.TunedPBKDF2PasswordHasher',
+    'scrypt': 'tracker.hashers.TunedScryptPasswordHasher',
+}
+PASSWORD_HASHERS = [
+    _TRACKER_HASHERS.pop(TRACKER_PASSWORD_HASHER),
+    *_TRACKER_HASHERS.values(),
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
 
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -91,15 +109,26 @@ USE_I18N = True
 USE_TZ = True
 
 STATIC_URL = 'static/'
-STATIC_ROOT = BASE_DIR / 'staticfiles'
+STATIC_ROOT = os.getenv('STATIC_ROOT', BASE_DIR / 'staticfiles')
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # Trusts the signed claims instead of loading the User per request (see tracker.auth).
+        'tracker.auth.StatelessJWTAuthentication',
     ),
+    # Opt-in keyset pagination: lists are paginated only when ?page_size= or ?cursor= is sent.
+    'DEFAULT_PAGINATION_CLASS': 'tracker.pagination.TrackerCursorPagination',
+    'PAGE_SIZE': int(os.getenv('TRACKER_PAGE_SIZE', 50)),
 }
+TRACKER_MAX_PAGE_SIZE = int(os.getenv('TRACKER_MAX_PAGE_SIZE', 500))
+# List endpoints build their payloads from values_list() rows (tracker.readers) instead of
+# ModelSerializer instances; False serializes lists through DRF again.
+TRACKER_FAST_LISTS = os.getenv('TRACKER_FAST_LISTS', 'True').lower() == 'true'
+# Serve the period list, period summary and dashboard from async views (tracker.async_views).
+# config/asgi.py turns this on; under WSGI each async view would need an event loop of its own.
+TRACKER_ASYNC_READS = os.getenv('TRACKER_ASYNC_READS', 'False').lower() == 'true'
 
 from datetime import timedelta
 ACCESS_MIN = int(os.getenv('SIMPLEJWT_ACCESS_LIFETIME_MIN', 5))
@@ -108,4 +137,52 @@ REFRESH_DAYS = int(os.getenv('SIMPLEJWT_REFRESH_LIFETIME_DAYS', 1))
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=ACCESS_MIN),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=REFRESH_DAYS),
+    'TOKEN_OBTAIN_SERIALIZER': 'tracker.auth.TrackerTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'tracker.auth.TrackerTokenRefreshSerializer',
+}
+# How long a process may serve a cached token version; bounds how long a revoked access
+# token keeps working in other workers when the tracker cache is not shared.
+TRACKER_TOKEN_VERSION_CACHE_SECONDS = int(os.getenv('TRACKER_TOKEN_VERSION_CACHE_SECONDS', 60))
+
+# Fraction (0..1) of daily-spending list requests that verify stored carryovers
+# against a full recompute and repair any drift. 0 disables the check.
+TRACKER_CARRYOVER_SAMPLE_RATE = float(os.getenv('TRACKER_CARRYOVER_SAMPLE_RATE', 0))
+
+# Where carryover running sums are computed: "window" (SQL window functions, one
+# UPDATE ... FROM per rectification), "python" (row walk) or "auto" (window for whole periods
+# when supported, row walk with early stop for the rectification after each write).
+TRACKER_CARRYOVER_ENGINE = os.getenv('TRACKER_CARRYOVER_ENGINE', 'auto')
+
+# Per-endpoint query/latency metrics for /api/ requests (Server-Timing header, /api/_metrics/).
+# With TRACKER_METRICS_DIR set, each worker writes its aggregates there for `manage.py dump_metrics`.
+TRACKER_METRICS_ENABLED = os.getenv('TRACKER_METRICS_ENABLED', 'True').lower() == 'true'
+TRACKER_METRICS_DIR = os.getenv('TRACKER_METRICS_DIR') or None
+TRACKER_METRICS_FLUSH_SECONDS = int(os.getenv('TRACKER_METRICS_FLUSH_SECONDS', 30))
+
+# Per-user response cache for tracker GETs (tracker/cache.py), on its own "tracker" alias.
+# TRACKER_CACHE_BACKEND: "locmem" (per worker, default), "file" (shared by the workers of one
+# host; TRACKER_CACHE_LOCATION is a directory), "redis" (TRACKER_CACHE_LOCATION is a
+# redis:// URL, needs the redis package) or the dotted path of any Django cache backend.
+TRACKER_RESPONSE_CACHE_ENABLED = os.getenv('TRACKER_RESPONSE_CACHE_ENABLED', 'True').lower() == 'true'
+_TRACKER_CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
 }
+_tracker_cache_backend = os.getenv('TRACKER_CACHE_BACKEND', 'locmem')
+CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'tracker': {
+        'BACKEND': _TRACKER_CACHE_BACKENDS.get(_tracker_cache_backend, _tracker_cache_backend),
+        'LOCATION': os.getenv('TRACKER_CACHE_LOCATION')
+        or (str(BASE_DIR / 'cache') if _tracker_cache_backend == 'file' else 'tracker'),
+        'TIMEOUT': int(os.getenv('TRACKER_CACHE_TIMEOUT', 300)),
+        'KEY_PREFIX': 'cost-tracker',
+    },
+}
+
+# /api/sync/: rows per page (a sync larger than that is paged). Tombstones older than
+# TRACKER_SYNC_TOMBSTONE_DAYS are pruned by `manage.py prune_tombstones`; clients with an older
+# cursor get a full resync.
+TRACKER_SYNC_PAGE_SIZE = int(os.getenv('TRACKER_SYNC_PAGE_SIZE', 1000))
+TRACKER_SYNC_TOMBSTONE_DAYS = int(os.getenv('TRACKER_SYNC_TOMBSTONE_DAYS', 90))
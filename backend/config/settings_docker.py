@@ -3,18 +3,17 @@ from .settings import *  # noqa
 import os
 from pathlib import Path
 
+from .database import sqlite_database
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = os.environ.get("DJANGO_SECRET_KEY", "dev-insecure")
 DEBUG = os.environ.get("DJANGO_DEBUG", "0") == "1"
 ALLOWED_HOSTS = os.environ.get("DJANGO_ALLOWED_HOSTS", "localhost,127.0.0.1").split(",")
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db" / "db.sqlite3",
-    }
-}
+# SQLite lives on the sqlite_data volume; a postgres:// DATABASE_URL is used as is.
+if DATABASES["default"]["ENGINE"] == "django.db.backends.sqlite3":
+    DATABASES["default"] = sqlite_database(BASE_DIR / "db" / "db.sqlite3")
 
 STATIC_URL = "/static/"
 MEDIA_URL = "/media/"
@@ -6,6 +6,7 @@ from tracker.views import (
     CookieTokenObtainPairView,
     CookieTokenRefreshView,
     LogoutView,
+    LogoutAllView,
 )
 
 # Optional: a simple root view for testing backend server availability
@@ -22,4 +23,5 @@ urlpatterns = [
     path('api/token/', CookieTokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', CookieTokenRefreshView.as_view(), name='token_refresh'),
     path('api/logout/', LogoutView.as_view(), name='logout'),
+    path('api/logout/all/', LogoutAllView.as_view(), name='logout_all'),
 ]
@@ -0,0 +1,52 @@
+"""
+App warm-up for gunicorn (config/gunicorn.conf.py).
+
+Django and DRF build a lot of process-wide state lazily, on the first request that needs it:
+URL resolver reverse maps and compiled patterns, model _meta field caches, DRF's imported
+settings classes, the password hashers. warm_up() builds it up front, without touching the
+database. With --preload it runs once in the master, so every forked worker starts warm and
+shares those pages copy-on-write; otherwise each worker runs it before accepting requests.
+"""
+import time
+
+
+def _compile(patterns):
+    for pattern in patterns:
+        pattern.pattern.regex  # compiled lazily, then cached on the pattern
+        if hasattr(pattern, "url_patterns"):
+            _compile(pattern.url_patterns)
+
+
+def warm_up():
+    """Returns the time it took, in seconds."""
+    start = time.perf_counter()
+    from django.apps import apps
+    from django.contrib.auth.hashers import get_hashers
+    from django.urls import get_resolver
+    from rest_framework.serializers import ModelSerializer
+    from rest_framework.settings import api_settings
+    from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+    resolver = get_resolver()
+    resolver.reverse_dict  # populates the reverse, namespace and app maps of every resolver
+    _compile(resolver.url_patterns)
+
+    for model in apps.get_models():
+        model._meta.get_fields()
+        model._meta.fields_map
+
+    for name in ("DEFAULT_RENDERER_CLASSES", "DEFAULT_PARSER_CLASSES", "DEFAULT_AUTHENTICATION_CLASSES",
+                 "DEFAULT_PERMISSION_CLASSES", "DEFAULT_PAGINATION_CLASS", "DEFAULT_CONTENT_NEGOTIATION_CLASS",
+                 "DEFAULT_FILTER_BACKENDS", "DEFAULT_METADATA_CLASS", "DEFAULT_VERSIONING_CLASS"):
+        getattr(api_settings, name)
+    jwt_settings.AUTH_TOKEN_CLASSES
+    jwt_settings.TOKEN_OBTAIN_SERIALIZER
+    get_hashers()
+
+    # Importing the URLconf imported the views and serializers; build each serializer's
+    # fields once, which fills the model metadata DRF reads for every instance.
+    from tracker import serializers
+    for serializer in vars(serializers).values():
+        if isinstance(serializer, type) and issubclass(serializer, ModelSerializer) and serializer.__module__ == serializers.__name__:
+            serializer().fields
+    return time.perf_counter() - start
@@ -1,17 +1,10 @@
 #!/bin/sh
 set -e
 
-echo "Applying migrations..."
-python manage.py migrate --noinput
-
-echo "Collecting static files..."
-python manage.py collectstatic --noinput
-
-echo "Starting Gunicorn..."
-exec gunicorn config.wsgi:application \
-    --bind 0.0.0.0:8000 \
-    --workers 3 \
-    --timeout 60 \
-    --access-logfile - \
-    --error-logfile -
+# Migrations and collectstatic in one process, each skipped when nothing changed.
+echo "Preparing database and static files..."
+python manage.py prepare_server
 
+# Worker class, worker count, preload and warm-up: see config/gunicorn.conf.py.
+echo "Starting Gunicorn (${GUNICORN_WORKER_CLASS:-sync})..."
+exec gunicorn -c config/gunicorn.conf.py
@@ -1,9 +1,10 @@
 from django.contrib import admin
-from .models import Period, Income, BudgetCategory, Budget, DailyHouseSpending, MiscellaneousCost
+from .models import Period, Income, BudgetCategory, Budget, DailyHouseSpending, MiscellaneousCost, PeriodRollup
 
 admin.site.register(Period)
 admin.site.register(Income)
 admin.site.register(BudgetCategory)
 admin.site.register(Budget)
 admin.site.register(DailyHouseSpending)
-admin.site.register(MiscellaneousCost)
\ No newline at end of file
+admin.site.register(MiscellaneousCost)
+admin.site.register(PeriodRollup)
\ No newline at end of file
@@ -0,0 +1,181 @@
+"""
+Async versions of the read endpoints every dashboard load starts with: the period list,
+a period's summary and the dashboard bootstrap.
+
+Under an ASGI worker (GUNICORN_WORKER_CLASS=uvicorn, see config/gunicorn.conf.py) a worker
+process serves many of these at once: while one request waits on the cache or the
+database (the async ORM runs each request's queries on a thread of its own), the event loop
+serves the others, where a sync worker would sit idle until the response is written.
+
+They are mounted in front of the DRF routes when TRACKER_ASYNC_READS is on (config/asgi.py
+turns it on). Each answers the common request, an authenticated JSON GET without
+pagination or sparse fieldsets, with the same body, ETag and response-cache entry as the
+DRF view, and hands everything else (writes, HEAD, other renderers, unknown query
+parameters, authentication errors, 404s) to that DRF view.
+"""
+from abc import ABC, abstractmethod
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
+from django.urls import path
+from django.utils.cache import parse_etags, patch_vary_headers
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from . import cache as response_cache
+from . import metrics
+from .auth import StatelessJWTAuthentication
+from .dashboard import PeriodNotFound, adashboard_payload
+from .models import Period, PeriodRollup
+from .readers import READERS as LIST_READERS
+from .rollups import rebuild_rollup
+from .serializers import PeriodSerializer, PeriodSummarySerializer
+from .summary import period_summary
+from .versions import acurrent_version, digest, make_etag, scope as version_scope
+
+
+def _negotiates_json(request):
+    """True when DRF would pick the JSON renderer for this request (Accept header, ?format=)."""
+    renderers = [renderer() for renderer in api_settings.DEFAULT_RENDERER_CLASSES]
+    renderer, _ = DefaultContentNegotiation().select_renderer(Request(request), renderers)
+    return renderer.format == "json"
+
+
+class AsyncReadView(ABC):
+    """
+    Base class: subclasses set `params` (the query parameters they understand), may override
+    version_period() and must implement get_data(); get_data() returns None to hand the request
+    to DRF. Views hold no per-request state: as_view() builds one per route, so a subclass
+    missing get_data() fails when the URLs are built.
+    """
+    params = ()
+
+    def __init__(self, sync_view):
+        self.sync_view = sync_view
+
+    @classmethod
+    def as_view(cls, sync_view):
+        instance = cls(sync_view)
+
+        async def view(request, *args, **kwargs):
+            return await instance.dispatch(request, *args, **kwargs)
+        # Writes are handed to DRF views, which are csrf-exempt too.
+        return csrf_exempt(view)
+
+    def handles(self, request, **kwargs):
+        return (
+            request.method == "GET"
+            and set(request.GET) <= set(self.params)
+            and _negotiates_json(request)
+        )
+
+    async def delegate(self, request, *args, **kwargs):
+        return await sync_to_async(self.sync_view)(request, *args, **kwargs)
+
+    def version_period(self, request, **kwargs):
+        return None
+
+    @abstractmethod
+    async def get_data(self, request, user, **kwargs):
+        """The response body for this request, or None to hand it to the DRF view."""
+
+    async def dispatch(self, request, *args, **kwargs):
+        if not self.handles(request, **kwargs):
+            return await self.delegate(request, *args, **kwargs)
+        try:
+            auth = await StatelessJWTAuthentication().aauthenticate(request)
+        except AuthenticationFailed:
+            auth = None
+        if auth is None:
+            return await self.delegate(request, *args, **kwargs)
+        user = auth[0]
+
+        # The same ETag and cache entry as ConditionalGetMixin computes for the DRF view.
+        period = self.version_period(request, **kwargs)
+        scope = version_scope(period)
+        key = (user.pk, scope, digest(user, request.get_full_path(), "json"))
+        etag = make_etag(await acurrent_version(user, period), scope, key[2])
+        if etag in parse_etags(request.META.get("HTTP_IF_NONE_MATCH", "")):
+            return self.finalize(HttpResponse(status=304), etag)
+        if response_cache.enabled():
+            cached = await response_cache.aget(*key, etag)
+            metrics.note_cache_lookup(hit=cached is not None)
+            if cached is not None:
+                content, headers = cached
+                return self.finalize(HttpResponse(content, headers=headers), etag)
+
+        data = await self.get_data(request, user, **kwargs)
+        if data is None:
+            return await self.delegate(request, *args, **kwargs)
+        renderer = JSONRenderer()
+        response = self.finalize(HttpResponse(renderer.render(data), content_type=renderer.media_type), etag)
+        if response_cache.enabled():
+            await response_cache.astore(*key, etag, response.content, dict(response.items()))
+        return response
+
+    @staticmethod
+    def finalize(response, etag):
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, no-cache"
+        patch_vary_headers(response, ("Accept",))
+        return response
+
+
+class AsyncPeriodList(AsyncReadView):
+    """GET /api/periods/ (PeriodViewSet.list)."""
+
+    def handles(self, request, **kwargs):
+        return getattr(settings, "TRACKER_FAST_LISTS", True) and super().handles(request, **kwargs)
+
+    async def get_data(self, request, user, **kwargs):
+        reader = LIST_READERS[PeriodSerializer]
+        return reader.render([row async for row in reader.rows(Period.objects.filter(user=user))])
+
+
+class AsyncPeriodSummary(AsyncReadView):
+    """GET /api/periods/{id}/summary/ (PeriodViewSet.summary)."""
+
+    def version_period(self, request, pk, **kwargs):
+        return pk
+
+    async def get_data(self, request, user, pk, **kwargs):
+        try:
+            period = await Period.objects.filter(user=user).select_related("rollup").aget(pk=pk)
+        except Period.DoesNotExist:
+            return None
+        try:
+            rollup = period.rollup
+        except PeriodRollup.DoesNotExist:
+            rollup = await sync_to_async(rebuild_rollup)(period)
+        return PeriodSummarySerializer(period_summary(period.pk, rollup)).data
+
+
+class AsyncDashboard(AsyncReadView):
+    """GET /api/dashboard/?period=<id> (DashboardView)."""
+    params = ("period",)
+
+    def handles(self, request, **kwargs):
+        period = request.GET.get("period")
+        return (period is None or period.isdigit()) and super().handles(request, **kwargs)
+
+    async def get_data(self, request, user, **kwargs):
+        period = request.GET.get("period")
+        try:
+            return await adashboard_payload(user, int(period) if period else None, {"request": request})
+        except PeriodNotFound:
+            return None
+
+
+def async_urlpatterns(sync_urls, dashboard_view):
+    """Routes for the async views, to be placed before `sync_urls` (the DRF router's) they fall back to."""
+    views = {url.name: url.callback for url in sync_urls}
+    return [
+        path('periods/', AsyncPeriodList.as_view(views['period-list']), name='period-list'),
+        path('periods/<int:pk>/summary/', AsyncPeriodSummary.as_view(views['period-summary']), name='period-summary'),
+        path('dashboard/', AsyncDashboard.as_view(dashboard_view), name='dashboard'),
+    ]
@@ -0,0 +1,172 @@
+"""
+Stateless JWT authentication: API requests are authenticated from the token's signed claims
+instead of loading the User row each time.
+
+Tokens carry the user id, `is_active`, `is_staff`, the username and the user's token version
+(TokenVersion). Authentication checks the version against a cached copy; revoke_tokens()
+bumps it, so every token issued before is refused once the cached copy is gone:
+immediately in the process that revoked (and everywhere with a shared cache backend), after
+at most TRACKER_TOKEN_VERSION_CACHE_SECONDS in other processes with a local-memory cache.
+Refresh always reads the User and TokenVersion rows, so a refreshed access token carries
+current claims, and inactive or revoked users cannot refresh.
+Tokens issued before these claims existed fall back to the database lookup.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import F
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import TokenVersion
+
+VERSION_CLAIM = "tv"
+ACTIVE_CLAIM = "act"
+STAFF_CLAIM = "stf"
+USERNAME_CLAIM = "usr"
+
+
+def _cache():
+    return caches[getattr(settings, "TRACKER_CACHE_ALIAS", "tracker")]
+
+
+def _cache_key(user_id):
+    return f"tracker:tv:{user_id}"
+
+
+def _stored_versions(user_id):
+    return TokenVersion.objects.filter(user_id=user_id).values_list("version", flat=True)
+
+
+def _version_timeout():
+    return getattr(settings, "TRACKER_TOKEN_VERSION_CACHE_SECONDS", 60)
+
+
+def stored_token_version(user_id):
+    """The version in the database; 0 for users never revoked."""
+    return _stored_versions(user_id).first() or 0
+
+
+def token_version(user_id):
+    """The user's token version, from the cache when possible."""
+    key = _cache_key(user_id)
+    version = _cache().get(key)
+    if version is None:
+        version = stored_token_version(user_id)
+        _cache().set(key, version, _version_timeout())
+    return version
+
+
+async def atoken_version(user_id):
+    """token_version() for async views."""
+    key = _cache_key(user_id)
+    version = await _cache().aget(key)
+    if version is None:
+        version = await _stored_versions(user_id).afirst() or 0
+        await _cache().aset(key, version, _version_timeout())
+    return version
+
+
+def revoke_tokens(user):
+    """Invalidate every token issued to `user` so far (logout everywhere, password change, deactivation)."""
+    user_id = getattr(user, "pk", user)
+    if not TokenVersion.objects.filter(user_id=user_id).update(version=F("version") + 1):
+        TokenVersion.objects.get_or_create(user_id=user_id, defaults={"version": 1})
+    transaction.on_commit(lambda: _cache().delete(_cache_key(user_id)))
+
+
+def stamp_claims(token, user, version):
+    token[VERSION_CLAIM] = version
+    token[ACTIVE_CLAIM] = user.is_active
+    token[STAFF_CLAIM] = user.is_staff
+    token[USERNAME_CLAIM] = user.get_username()
+    return token
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that builds request.user from the token's claims (see module docstring)."""
+
+    def _claims(self, validated_token):
+        """(user id, token version, is_active) from the token, or None for tokens without our claims."""
+        try:
+            # The claim may hold the id as a string; ownership checks compare it with FK ids.
+            user_id = self.user_model._meta.get_field(api_settings.USER_ID_FIELD).to_python(
+                validated_token[api_settings.USER_ID_CLAIM]
+            )
+            return user_id, validated_token[VERSION_CLAIM], validated_token[ACTIVE_CLAIM]
+        except KeyError:
+            return None
+
+    def _claimed_user(self, validated_token, user_id, is_active):
+        # An unsaved-looking instance with only the claimed fields: enough for ownership
+        # checks, FK assignment (user=request.user) and permission classes, without a query.
+        user = self.user_model(
+            **{api_settings.USER_ID_FIELD: user_id},
+            is_active=is_active,
+            is_staff=validated_token.get(STAFF_CLAIM, False),
+        )
+        setattr(user, user.USERNAME_FIELD, validated_token.get(USERNAME_CLAIM, ""))
+        user._state.adding = False
+        return user
+
+    @staticmethod
+    def _check(is_active, version, current):
+        if api_settings.CHECK_USER_IS_ACTIVE and not is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        if version != current:
+            raise InvalidToken("Token has been revoked.")
+
+    def get_user(self, validated_token):
+        claims = self._claims(validated_token)
+        if claims is None:
+            return super().get_user(validated_token)
+        user_id, version, is_active = claims
+        self._check(is_active, version, token_version(user_id))
+        return self._claimed_user(validated_token, user_id, is_active)
+
+    async def aget_user(self, validated_token):
+        claims = self._claims(validated_token)
+        if claims is None:
+            return await sync_to_async(super().get_user)(validated_token)
+        user_id, version, is_active = claims
+        self._check(is_active, version, await atoken_version(user_id))
+        return self._claimed_user(validated_token, user_id, is_active)
+
+    async def aauthenticate(self, request):
+        """authenticate() for async views (tracker.async_views), which run outside DRF."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+
+class TrackerTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        return stamp_claims(super().get_token(user), user, stored_token_version(user.pk))
+
+
+class TrackerTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refresh re-reads the user: revoked or inactive users are refused, claims are re-stamped."""
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        user = get_user_model().objects.filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages["no_active_account"], "no_active_account")
+        version = stored_token_version(user.pk)
+        if refresh.payload.get(VERSION_CLAIM, 0) != version:
+            raise InvalidToken("Token has been revoked.")
+        stamp_claims(refresh, user, version)
+        # ROTATE_REFRESH_TOKENS is off here: the refresh cookie is kept until it expires.
+        return {"access": str(refresh.access_token)}
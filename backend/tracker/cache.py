@@ -0,0 +1,81 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+# Digests remembered per scope for eviction; older ones simply expire with the cache timeout.
+INDEX_LIMIT = 200
+
+
+def enabled():
+    return getattr(settings, "TRACKER_RESPONSE_CACHE_ENABLED", True)
+
+
+def _cache():
+    return caches[getattr(settings, "TRACKER_CACHE_ALIAS", "tracker")]
+
+
+def _entry_key(user_id, scope, digest):
+    return f"tracker:r:{user_id}:{scope}:{digest}"
+
+
+def _index_key(user_id, scope):
+    return f"tracker:i:{user_id}:{scope}"
+
+
+def _current(entry, etag):
+    if entry is None or entry[0] != etag:
+        return None
+    return entry[1], entry[2]
+
+
+def get(user_id, scope, digest, etag):
+    """
+    Cached (content, headers) for this request, or None.
+    Entries store the ETag they were rendered under, so one left behind by a missed
+    eviction is never served once the counter has moved on.
+    """
+    return _current(_cache().get(_entry_key(user_id, scope, digest)), etag)
+
+
+async def aget(user_id, scope, digest, etag):
+    return _current(await _cache().aget(_entry_key(user_id, scope, digest)), etag)
+
+
+def store(user_id, scope, digest, etag, content, headers):
+    """`headers` is a dict of the response's headers (Content-Type, Vary, Allow, ...)."""
+    cache = _cache()
+    cache.set(_entry_key(user_id, scope, digest), (etag, content, headers))
+    index_key = _index_key(user_id, scope)
+    index = cache.get(index_key) or []
+    if digest not in index:
+        cache.set(index_key, [*index, digest][-INDEX_LIMIT:])
+
+
+async def astore(user_id, scope, digest, etag, content, headers):
+    cache = _cache()
+    await cache.aset(_entry_key(user_id, scope, digest), (etag, content, headers))
+    index_key = _index_key(user_id, scope)
+    index = await cache.aget(index_key) or []
+    if digest not in index:
+        await cache.aset(index_key, [*index, digest][-INDEX_LIMIT:])
+
+
+def evict(user_id, scopes):
+    """Drop every cached response of the user's `scopes` ("u" or "p<period id>")."""
+    cache = _cache()
+    index_keys = {scope: _index_key(user_id, scope) for scope in scopes}
+    indexes = cache.get_many(list(index_keys.values()))
+    doomed = list(indexes)
+    for scope, index_key in index_keys.items():
+        doomed.extend(_entry_key(user_id, scope, digest) for digest in indexes.get(index_key, ()))
+    if doomed:
+        cache.delete_many(doomed)
+
+
+def evict_on_commit(user_id, scopes):
+    """
+    Evict once the write is committed. A read that started before the commit may still
+    store its response afterwards, but under the old ETag, which get() no longer serves.
+    """
+    if enabled():
+        transaction.on_commit(lambda: evict(user_id, scopes))
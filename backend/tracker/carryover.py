@@ -0,0 +1,260 @@
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import DecimalField, F, Q, Sum, Value, Window
+from django.db.models.expressions import RowRange
+from django.db.models.functions import Coalesce, Round
+from django.utils import timezone
+
+from .models import DailyHouseSpending, DataVersion
+
+ZERO = Decimal("0")
+
+
+def _pk(obj):
+    return getattr(obj, "pk", obj)
+
+
+# ----- Engine selection -----
+
+def window_engine_available():
+    """UPDATE ... FROM with window functions needs PostgreSQL or SQLite >= 3.33."""
+    if connection.vendor == "postgresql":
+        return True
+    if connection.vendor == "sqlite":
+        return connection.Database.sqlite_version_info >= (3, 33)
+    return False
+
+
+def use_window_engine(incremental=False):
+    """
+    TRACKER_CARRYOVER_ENGINE selects where running sums are computed:
+    "window" (in the database), "python" (row walk) or "auto". Auto uses the window for
+    whole-period work when supported, and the row walk for incremental rectification, which
+    stops at the first row that already holds the right value instead of visiting every later
+    row of the period.
+    """
+    engine = getattr(settings, "TRACKER_CARRYOVER_ENGINE", "auto")
+    if engine == "python":
+        return False
+    if engine == "window":
+        return True
+    return not incremental and window_engine_available()
+
+
+def _engine(engine, incremental=False):
+    return engine or ("window" if use_window_engine(incremental) else "python")
+
+
+# ----- Database-side (window function) engine -----
+
+def carryover_window():
+    """
+    Expression computing each row's carryover in the database: the sum of
+    (fixed_daily_limit - spent_amount) over the earlier rows of its user/period.
+    """
+    return Round(
+        Coalesce(
+            Window(
+                Sum(F("fixed_daily_limit") - F("spent_amount")),
+                partition_by=[F("user_id"), F("period_id")],
+                order_by=[F("date").asc(), F("id").asc()],
+                frame=RowRange(start=None, end=-1),
+            ),
+            Value(ZERO),
+        ),
+        2,
+        output_field=DecimalField(max_digits=12, decimal_places=2),
+    )
+
+
+def annotate_carryovers(queryset, name="running_carryover"):
+    """Annotate a DailyHouseSpending queryset with the database-computed carryover."""
+    return queryset.annotate(**{name: carryover_window()})
+
+
+def _rectify_with_window(period, user, since=None):
+    """
+    One UPDATE ... FROM (window subquery) statement; only rows whose stored value differs are
+    written, and their updated_at and change_seq are moved so /api/sync/ picks them up. With `since`, the
+    window covers the rows from that date on only, seeded like the row walk from the stored
+    carryover of the last earlier row.
+    """
+    # The seed read, the change number and the UPDATE commit together. Inside a caller's
+    # transaction no savepoint is taken.
+    with transaction.atomic(savepoint=False):
+        seed = ZERO if since is None else _carry_before(period, user, since)
+        if seed is None:
+            since = None  # legacy rows before `since`: recompute the whole period
+            seed = ZERO
+        table = connection.ops.quote_name(DailyHouseSpending._meta.db_table)
+        date_col = connection.ops.quote_name("date")
+        params = [
+            connection.ops.adapt_datetimefield_value(timezone.now()),
+            DataVersion.objects.next_change(_pk(user)),
+            connection.ops.adapt_decimalfield_value(seed, 12, 2),
+            _pk(user), _pk(period),
+        ]
+        since_clause = ""
+        if since is not None:
+            since_clause = f"AND {date_col} >= %s"
+            params.append(connection.ops.adapt_datefield_value(since))
+        sql = f"""
+            UPDATE {table} SET carryover = w.carry, updated_at = %s, change_seq = %s
+            FROM (
+                SELECT id, ROUND(%s + COALESCE(SUM(fixed_daily_limit - spent_amount) OVER (
+                    ORDER BY {date_col}, id ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+                ), 0), 2) AS carry
+                FROM {table}
+                WHERE user_id = %s AND period_id = %s {since_clause}
+            ) AS w
+            WHERE {table}.id = w.id
+              AND ({table}.carryover IS NULL OR {table}.carryover <> w.carry)
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.rowcount
+
+
+# ----- Python (row walk) engine -----
+
+def running_carryovers(rows, seed=ZERO):
+    """
+    Assign carryover in memory to rows already ordered by (date, id).
+    Each row carries the sum of (fixed_daily_limit - spent_amount) of the rows before it.
+    """
+    carry = seed
+    for row in rows:
+        row.carryover = carry
+        carry = carry + row.fixed_daily_limit - row.spent_amount
+    return rows
+
+
+def _stamp(rows, user):
+    """Mark rewritten rows as changed, for /api/sync/."""
+    if rows:
+        now, change_seq = timezone.now(), DataVersion.objects.next_change(_pk(user))
+        for row in rows:
+            row.updated_at, row.change_seq = now, change_seq
+
+
+def _rectify_period_python(period, user):
+    with transaction.atomic():
+        rows = list(
+            DailyHouseSpending.objects
+            .select_for_update()
+            .filter(user=user, period=period)
+            .order_by("date", "id")
+        )
+        before = [row.carryover for row in rows]
+        running_carryovers(rows)
+        changed = [row for row, old in zip(rows, before) if row.carryover != old]
+        _stamp(changed, user)
+        if rows:
+            DailyHouseSpending.objects.bulk_update(rows, ["carryover", "updated_at", "change_seq"])
+        return len(rows)
+
+
+def _carry_before(period, user, since):
+    """
+    Carryover of the first row dated `since` or later, from the stored carryover of the last
+    earlier row: ZERO when there is none, None when that row has no stored carryover (a legacy
+    row: nothing earlier can be trusted).
+    """
+    prev = (
+        DailyHouseSpending.objects
+        .filter(user=user, period=period, date__lt=since)
+        .order_by("-date", "-id")
+        .values_list("carryover", "fixed_daily_limit", "spent_amount")
+        .first()
+    )
+    if prev is None:
+        return ZERO
+    if prev[0] is None:
+        return None
+    return prev[0] + prev[1] - prev[2]
+
+
+def _rectify_from_python(period, user, since, through, chunk_size):
+    # Callers write inside their own transaction; a savepoint per write would only add queries.
+    with transaction.atomic(savepoint=False):
+        carry = _carry_before(period, user, since)
+        if carry is None:
+            return _rectify_period_python(period, user)
+
+        changed = []
+        rows = (
+            DailyHouseSpending.objects.filter(user=user, period=period)
+            .select_for_update()
+            .filter(date__gte=since)
+            .order_by("date", "id")
+            .only("id", "date", "spent_amount", "fixed_daily_limit", "carryover")
+        )
+        for row in rows.iterator(chunk_size=chunk_size):
+            if row.carryover == carry:
+                if row.date > through:
+                    break
+            else:
+                row.carryover = carry
+                changed.append(row)
+            carry = carry + row.fixed_daily_limit - row.spent_amount
+
+        if changed:
+            _stamp(changed, user)
+            DailyHouseSpending.objects.bulk_update(
+                changed, ["carryover", "updated_at", "change_seq"], batch_size=chunk_size
+            )
+        return len(changed)
+
+
+# ----- Public entry points -----
+
+def rectify_period(period, user, engine=None):
+    """
+    Rewrite every carryover of the period.
+    Returns the number of rows written.
+    """
+    if _engine(engine) == "window":
+        return _rectify_with_window(period, user)
+    return _rectify_period_python(period, user)
+
+
+def rectify_from(period, user, since, through=None, chunk_size=200, engine=None):
+    """
+    Incremental walk: recompute carryovers only for rows dated on or after `since`.
+
+    Both engines trust rows before `since` and seed from the stored carryover of the last
+    earlier row. `through` is the last date whose row was itself changed (defaults to
+    `since`); once past it, the Python walk stops at the first row whose stored carryover
+    already matches, because every later row depends only on that value. The window engine
+    computes the rows from `since` on in one statement, without stopping early, so it is
+    only used here when TRACKER_CARRYOVER_ENGINE asks for it.
+    Returns the number of rows written.
+    """
+    if _engine(engine, incremental=True) == "window":
+        return _rectify_with_window(period, user, since=since)
+    return _rectify_from_python(period, user, since, through or since, chunk_size)
+
+
+def find_drift(period, user, chunk_size=500):
+    """
+    Compare stored carryovers of a period with a fresh running sum.
+    Returns the ids of rows whose stored value is missing or wrong.
+    """
+    qs = DailyHouseSpending.objects.filter(user=user, period=period).order_by("date", "id")
+    if use_window_engine():
+        return list(
+            annotate_carryovers(qs, "expected")
+            .filter(Q(carryover__isnull=True) | ~Q(carryover=F("expected")))
+            .values_list("id", flat=True)
+        )
+
+    drifted = []
+    carry = ZERO
+    rows = qs.values_list("id", "carryover", "fixed_daily_limit", "spent_amount")
+    for row_id, stored, limit, spent in rows.iterator(chunk_size=chunk_size):
+        if stored != carry:
+            drifted.append(row_id)
+        carry = carry + limit - spent
+    return drifted
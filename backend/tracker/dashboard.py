@@ -0,0 +1,99 @@
+from asgiref.sync import sync_to_async
+
+from .models import Income, Budget, BudgetCategory, DailyHouseSpending, MiscellaneousCost, Period, PeriodRollup
+from .rollups import rebuild_rollup
+from .serializers import (
+    PeriodSerializer, IncomeSerializer, BudgetSerializer, BudgetCategorySerializer,
+    DailyHouseSpendingSerializer, MiscellaneousCostSerializer, PeriodSummarySerializer,
+)
+from .summary import period_summary
+
+
+class PeriodNotFound(LookupError):
+    pass
+
+
+def _periods(user):
+    return Period.objects.filter(user=user).select_related("rollup").order_by("id")
+
+
+def _choose(periods, period_id):
+    """The requested period, or the most recently created one (as the dashboard does)."""
+    if period_id is None:
+        return periods[-1] if periods else None
+    period = next((p for p in periods if p.pk == period_id), None)
+    if period is None:
+        raise PeriodNotFound(period_id)
+    return period
+
+
+def _collections(user, period):
+    """Payload key -> (serializer, queryset) for the lists, ordered as their list endpoints order them."""
+    collections = {"categories": (BudgetCategorySerializer, BudgetCategory.objects.filter(user=user))}
+    if period is None:
+        return collections
+    rows = {"user": user, "period": period}
+    collections.update({
+        "incomes": (IncomeSerializer, Income.objects.filter(**rows)),
+        "budgets": (BudgetSerializer, Budget.objects.filter(**rows).select_related("category")),
+        "misc_costs": (MiscellaneousCostSerializer, MiscellaneousCost.objects.filter(**rows)),
+        "daily_house_spendings": (
+            DailyHouseSpendingSerializer, DailyHouseSpending.objects.filter(**rows).order_by("date", "id")
+        ),
+    })
+    return collections
+
+
+def _rollup(period):
+    try:
+        return period.rollup
+    except PeriodRollup.DoesNotExist:
+        return None
+
+
+def _render(periods, period, rollup, collections, rows, context):
+    payload = {
+        "active_period": period.pk if period else None,
+        "periods": PeriodSerializer(periods, many=True, context=context).data,
+        "categories": [],
+        "summary": None,
+        "incomes": [],
+        "budgets": [],
+        "misc_costs": [],
+        "daily_house_spendings": [],
+    }
+    if period is not None:
+        payload["summary"] = PeriodSummarySerializer(period_summary(period.pk, rollup)).data
+    for key, (serializer, _) in collections.items():
+        payload[key] = serializer(rows[key], many=True, context=context).data
+    return payload
+
+
+def dashboard_payload(user, period_id, context):
+    """
+    Everything the dashboard's first render needs, in a fixed number of queries
+    (periods with their rollups, then one per collection): the user's periods, the chosen
+    period's incomes, budgets, misc costs and daily spendings (ordered as their list endpoints
+    order them), its summary totals and the category list.
+    Without `period_id` the most recently created period is chosen, as the dashboard does.
+    """
+    periods = list(_periods(user))
+    period = _choose(periods, period_id)
+    rollup = None
+    if period is not None:
+        rollup = _rollup(period) or rebuild_rollup(period)
+    collections = _collections(user, period)
+    rows = {key: list(queryset) for key, (_, queryset) in collections.items()}
+    return _render(periods, period, rollup, collections, rows, context)
+
+
+async def adashboard_payload(user, period_id, context):
+    """dashboard_payload() for async views: the same queries, through the async ORM."""
+    periods = [period async for period in _periods(user)]
+    period = _choose(periods, period_id)
+    rollup = None
+    if period is not None:
+        rollup = _rollup(period) or await sync_to_async(rebuild_rollup)(period)
+    collections = _collections(user, period)
+    rows = {key: [row async for row in queryset] for key, (_, queryset) in collections.items()}
+    return _render(periods, period, rollup, collections, rows, context)
@@ -0,0 +1,112 @@
+import csv
+import json
+from decimal import Decimal
+
+from .models import Income, Budget, DailyHouseSpending, MiscellaneousCost
+
+ZERO = Decimal("0.00")
+
+COLUMNS = (
+    "kind", "id", "period_id", "period_name", "date", "description",
+    "amount", "daily_limit", "carryover", "remaining", "status",
+)
+FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "jsonl": ("application/x-ndjson", "jsonl"),
+}
+CHUNK_SIZE = 2000
+# Rows joined into one chunk of the response; small enough for the first bytes to leave at once.
+LINES_PER_WRITE = 500
+
+
+def _text(value):
+    return "" if value is None else str(value)
+
+
+def _incomes(rows):
+    for pk, period_id, period_name, day, source, amount in rows:
+        yield ("income", pk, period_id, period_name, day, source, amount, None, None, None, None)
+
+
+def _budgets(rows):
+    for pk, period_id, period_name, day, category, amount, status in rows:
+        yield ("budget", pk, period_id, period_name, day, category, amount, None, None, None, status)
+
+
+def _misc_costs(rows):
+    for pk, period_id, period_name, day, title, amount in rows:
+        yield ("misc_cost", pk, period_id, period_name, day, title, amount, None, None, None, None)
+
+
+def _daily_spendings(rows):
+    """Carryovers are recomputed as a running sum over rows ordered by (period, date, id)."""
+    current_period, carry = None, ZERO
+    for pk, period_id, period_name, day, spent, limit in rows:
+        if period_id != current_period:
+            current_period, carry = period_id, ZERO
+        remaining = limit - spent + carry
+        yield ("daily_spending", pk, period_id, period_name, day, None, spent, limit, carry, remaining, None)
+        carry = carry + limit - spent
+
+
+def ledger_rows(user, period=None, chunk_size=CHUNK_SIZE):
+    """
+    Every ledger row of the user (or of one period) as tuples in COLUMNS order.
+    Each table is read with values_list() through iterator(chunk_size), so only one chunk
+    of rows is held in memory at a time.
+    """
+    def rows(model, *fields, order_by):
+        qs = model.objects.filter(user=user)
+        if period is not None:
+            qs = qs.filter(period=period)
+        fields = ("id", "period_id", "period__name", *fields)
+        return qs.order_by(*order_by).values_list(*fields).iterator(chunk_size=chunk_size)
+
+    yield from _incomes(rows(Income, "date_received", "source", "amount", order_by=("period_id", "date_received", "id")))
+    yield from _budgets(rows(
+        Budget, "due_date", "category__name", "amount_allocated", "status", order_by=("period_id", "id"),
+    ))
+    yield from _misc_costs(rows(MiscellaneousCost, "date_added", "title", "amount", order_by=("period_id", "date_added", "id")))
+    yield from _daily_spendings(rows(
+        DailyHouseSpending, "date", "spent_amount", "fixed_daily_limit", order_by=("period_id", "date", "id"),
+    ))
+
+
+class _Echo:
+    """File-like object whose write() hands the line back, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def _json_value(value):
+    return value if value is None or isinstance(value, int) else str(value)
+
+
+def _batched(lines):
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= LINES_PER_WRITE:
+            yield "".join(buffer).encode()
+            buffer.clear()
+    if buffer:
+        yield "".join(buffer).encode()
+
+
+def stream_ledger(user, fmt, period=None, chunk_size=CHUNK_SIZE):
+    """
+    Encoded chunks of the export, for a StreamingHttpResponse. Rows are produced lazily, so
+    the CSV header leaves before the first query runs and memory does not grow with the ledger.
+    """
+    rows = ledger_rows(user, period, chunk_size)
+    if fmt == "csv":
+        writer = csv.writer(_Echo())
+        yield writer.writerow(COLUMNS).encode()
+        lines = (writer.writerow([_text(value) for value in row]) for row in rows)
+    else:
+        lines = (
+            json.dumps({name: _json_value(value) for name, value in zip(COLUMNS, row)}) + "\n"
+            for row in rows
+        )
+    yield from _batched(lines)
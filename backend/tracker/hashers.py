@@ -0,0 +1,28 @@
+"""
+Password hashers whose cost comes from settings, so it can be tuned per deployment.
+
+They keep Django's algorithm names, so hashes written by Django's own PBKDF2 and scrypt
+hashers still verify. When a stored hash uses another algorithm or other parameters than
+the preferred hasher, Django re-hashes the password on the next successful login.
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, ScryptPasswordHasher
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 with TRACKER_PBKDF2_ITERATIONS rounds (Django's default when unset)."""
+
+    @property
+    def iterations(self):
+        return getattr(settings, "TRACKER_PBKDF2_ITERATIONS", None) or PBKDF2PasswordHasher.iterations
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    """hashlib.scrypt with TRACKER_SCRYPT_WORK_FACTOR (N) and TRACKER_SCRYPT_PARALLELISM (p)."""
+
+    @property
+    def work_factor(self):
+        return getattr(settings, "TRACKER_SCRYPT_WORK_FACTOR", ScryptPasswordHasher.work_factor)
+
+    @property
+    def parallelism(self):
+        return getattr(settings, "TRACKER_SCRYPT_PARALLELISM", ScryptPasswordHasher.parallelism)
@@ -0,0 +1,279 @@
+import csv
+import io
+from bisect import bisect_right
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from .carryover import rectify_from
+from .models import Income, DailyHouseSpending, DataVersion, MiscellaneousCost, Period
+from .rollups import rebuild_rollup
+from .versions import bump_versions, explicit_bumps
+
+CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+KINDS = ("income", "misc_cost", "daily_spending")
+DESCRIPTION_COLUMNS = ("description", "memo", "payee", "title", "source")
+MAX_LENGTH = {"income": Income._meta.get_field("source").max_length,
+              "misc_cost": MiscellaneousCost._meta.get_field("title").max_length}
+AMOUNT_FIELD = {"income": Income._meta.get_field("amount"),
+                "misc_cost": MiscellaneousCost._meta.get_field("amount"),
+                "daily_spending": DailyHouseSpending._meta.get_field("spent_amount")}
+LIMIT_FIELD = DailyHouseSpending._meta.get_field("fixed_daily_limit")
+
+
+class ImportFormatError(ValueError):
+    """The file as a whole cannot be imported (missing columns, not CSV, ...)."""
+
+
+def _decimal(value):
+    value = (value or "").strip().replace(",", "")
+    if not value:
+        return None
+    try:
+        number = Decimal(value)
+    except InvalidOperation:
+        raise ValueError("Not a number.")
+    if not number.is_finite():
+        raise ValueError("Not a number.")
+    return number
+
+
+def _field_errors(field, value):
+    """The model field's validator messages (max_digits, decimal_places) for `value`."""
+    try:
+        for validator in field.validators:
+            validator(value)
+    except ValidationError as exc:
+        return exc.messages
+    return []
+
+
+class _Periods:
+    """The user's periods, searchable by date without a query per row."""
+
+    def __init__(self, periods):
+        self.periods = sorted(periods, key=lambda p: (p.start_date, p.id))
+        self.starts = [p.start_date for p in self.periods]
+
+    def find(self, day):
+        # Periods may overlap: take the latest-starting one that still contains the day.
+        for period in reversed(self.periods[:bisect_right(self.starts, day)]):
+            if day <= period.end_date:
+                return period
+        return None
+
+
+class StatementImport:
+    """
+    Turns a CSV statement into Income, MiscellaneousCost and DailyHouseSpending rows.
+
+    The file is read row by row and handled in chunks of CHUNK_SIZE: each chunk is parsed and
+    validated in one pass (types, lengths, digits, date inside one of the user's periods, no
+    model full_clean()), then incomes and misc costs are written with one bulk_create per chunk.
+    Daily spendings are summed per (period, date), since the model holds one row per day, and
+    upserted at the end, followed by one carryover rectification and one rollup rebuild per
+    affected period. Invalid lines are reported and skipped.
+
+    Columns (header names are case-insensitive): `date` (YYYY-MM-DD), a description
+    (description/memo/payee/title/source), and either a signed `amount` or `debit`/`credit`.
+    An optional `kind` column (income, misc_cost or daily_spending, as written by the export)
+    picks the target; otherwise credits become incomes and debits go to `debits`.
+    An optional `daily_limit` column sets the day's limit; it defaults to the period's.
+    """
+
+    def __init__(self, user, period=None, debits="daily_spending", chunk_size=CHUNK_SIZE):
+        self.user = user
+        self.debits = debits
+        self.chunk_size = chunk_size
+        periods = Period.objects.filter(user=user)
+        if period is not None:
+            periods = periods.filter(pk=period)
+        self.periods = _Periods(periods)
+        self.days = {}  # (period, date) -> [spent, limit]
+        self.touched = {}  # period id -> period
+        self.created = {"incomes": 0, "misc_costs": 0, "daily_house_spendings": 0}
+        self.errors = []
+        self.error_count = 0
+
+    # ----- Parsing -----
+
+    def _error(self, line, errors):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "errors": errors})
+
+    def _columns(self, header):
+        names = [(name or "").strip().lower() for name in header]
+        if "date" not in names:
+            raise ImportFormatError("A 'date' column is required.")
+        if "amount" not in names and not {"debit", "credit"} & set(names):
+            raise ImportFormatError("An 'amount' column (or 'debit'/'credit' columns) is required.")
+        description = next((c for c in DESCRIPTION_COLUMNS if c in names), None)
+        return {name: index for index, name in enumerate(names)}, description
+
+    def _parse(self, line, values, columns, description_column):
+        def get(name):
+            index = columns.get(name)
+            return values[index].strip() if index is not None and index < len(values) else ""
+
+        errors = {}
+        try:
+            day = date.fromisoformat(get("date"))
+        except ValueError:
+            errors["date"] = ["Use YYYY-MM-DD."]
+            day = None
+        try:
+            amount = _decimal(get("amount"))
+            if amount is None:
+                credit, debit = _decimal(get("credit")), _decimal(get("debit"))
+                amount = (credit or 0) - abs(debit or 0) if credit or debit else None
+            limit = _decimal(get("daily_limit"))
+        except ValueError as exc:
+            errors["amount"] = [str(exc)]
+            amount = limit = None
+        if amount is None and "amount" not in errors:
+            errors["amount"] = ["An amount is required."]
+        elif amount == 0:
+            errors["amount"] = ["Amount cannot be zero."]
+
+        kind = get("kind").lower() or None
+        if kind is None and amount is not None:
+            kind = "income" if amount > 0 else self.debits
+        if kind not in KINDS:
+            errors["kind"] = [f"Choose one of: {', '.join(KINDS)}."]
+        elif amount and "amount" not in errors:
+            if messages := _field_errors(AMOUNT_FIELD[kind], abs(amount)):
+                errors["amount"] = messages
+
+        text = get(description_column) if description_column else ""
+        if kind in MAX_LENGTH:
+            if not text:
+                errors["description"] = ["A description is required."]
+            elif len(text) > MAX_LENGTH[kind]:
+                errors["description"] = [f"At most {MAX_LENGTH[kind]} characters."]
+        if limit is not None and limit < 0:
+            errors["daily_limit"] = ["Cannot be negative."]
+        elif limit is not None and (messages := _field_errors(LIMIT_FIELD, limit)):
+            errors["daily_limit"] = messages
+
+        period = self.periods.find(day) if day else None
+        if day and period is None:
+            errors["date"] = ["No period of yours contains this date."]
+        if errors:
+            self._error(line, errors)
+            return None
+        return line, kind, period, day, text, abs(amount), limit
+
+    # ----- Writing -----
+
+    def _write_chunk(self, parsed):
+        incomes, costs = [], []
+        for line, kind, period, day, text, amount, limit in parsed:
+            if kind == "daily_spending":
+                spent = self.days.get((period, day), [Decimal("0")])[0] + amount
+                # Lines of the same day are summed: the total must still fit the column.
+                if messages := _field_errors(AMOUNT_FIELD[kind], spent):
+                    self._error(line, {"amount": messages})
+                    continue
+            self.touched[period.id] = period
+            if kind == "income":
+                incomes.append(Income(
+                    user=self.user, period=period, source=text, amount=amount, date_received=day,
+                    change_seq=self.change_seq,
+                ))
+            elif kind == "misc_cost":
+                # date_added is auto_now_add on the model: costs are dated on import.
+                costs.append(MiscellaneousCost(
+                    user=self.user, period=period, title=text, amount=amount, change_seq=self.change_seq,
+                ))
+            else:
+                spent = self.days.setdefault((period, day), [Decimal("0"), None])
+                spent[0] += amount
+                if limit is not None:
+                    spent[1] = limit
+        Income.objects.bulk_create(incomes)
+        MiscellaneousCost.objects.bulk_create(costs)
+        self.created["incomes"] += len(incomes)
+        self.created["misc_costs"] += len(costs)
+
+    def _finish(self):
+        rebuilt = []
+        if self.days:
+            rebuilt = upsert_daily_spendings(self.user, [
+                DailyHouseSpending(
+                    user=self.user, period=period, date=day, spent_amount=spent,
+                    fixed_daily_limit=limit if limit is not None else (period.default_daily_limit or Decimal("100")),
+                )
+                for (period, day), (spent, limit) in self.days.items()
+            ])
+            self.created["daily_house_spendings"] = len(self.days)
+        # The upsert rebuilt its periods' rollups; the others only gained incomes or costs.
+        rebuilt = {period.id for period in rebuilt}
+        for period in self.touched.values():
+            if period.id not in rebuilt:
+                rebuild_rollup(period)
+        if self.touched:
+            bump_versions(self.user, list(self.touched.values()))
+
+    def run(self, stream):
+        """Import a binary stream (e.g. an UploadedFile); everything is written in one transaction."""
+        reader = csv.reader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""))
+        try:
+            header = next(reader)
+        except StopIteration:
+            raise ImportFormatError("The file is empty.")
+        except (UnicodeDecodeError, csv.Error):
+            raise ImportFormatError("The file is not UTF-8 CSV.")
+        columns, description = self._columns(header)
+
+        with transaction.atomic(), explicit_bumps():
+            self.change_seq = DataVersion.objects.next_change(self.user.pk)
+            chunk = []
+            try:
+                for values in reader:
+                    if not any(value.strip() for value in values):
+                        continue
+                    row = self._parse(reader.line_num, values, columns, description)
+                    if row is not None:
+                        chunk.append(row)
+                    if len(chunk) >= self.chunk_size:
+                        self._write_chunk(chunk)
+                        chunk = []
+            except (UnicodeDecodeError, csv.Error) as exc:
+                raise ImportFormatError(f"Unreadable CSV near line {reader.line_num}: {exc}")
+            self._write_chunk(chunk)
+            self._finish()
+        return {"created": self.created, "errors": self.errors, "error_count": self.error_count}
+
+
+def upsert_daily_spendings(user, rows):
+    """
+    Create or overwrite (same user/period/date) daily spendings with one bulk upsert, then
+    fill in a missing period default_daily_limit, rectify carryovers over the written date
+    range and rebuild the rollup, once per affected period. Call inside a transaction.
+    Returns the affected periods.
+    """
+    change_seq = DataVersion.objects.next_change(user.pk)
+    for row in rows:
+        row.change_seq = change_seq
+    DailyHouseSpending.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['user', 'period', 'date'],
+        update_fields=['spent_amount', 'fixed_daily_limit', 'updated_at', 'change_seq'],
+    )
+    by_period = {}
+    for row in rows:
+        by_period.setdefault(row.period, []).append(row)
+    for period, period_rows in by_period.items():
+        if period.default_daily_limit is None:
+            period.default_daily_limit = period_rows[0].fixed_daily_limit
+            period.save(update_fields=['default_daily_limit', 'updated_at'])
+        dates = [r.date for r in period_rows]
+        rectify_from(period=period, user=user, since=min(dates), through=max(dates))
+        # Upserts overwrite rows whose previous values are unknown here, so rebuild.
+        rebuild_rollup(period)
+    return list(by_period)
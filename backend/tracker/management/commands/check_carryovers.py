@@ -0,0 +1,49 @@
+import random
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from tracker.carryover import find_drift, rectify_period
+from tracker.models import DailyHouseSpending
+from tracker.versions import bump_versions
+
+
+class Command(BaseCommand):
+    help = "Detect (and optionally repair) stored DailyHouseSpending carryovers that drifted from the running sum."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repair", action="store_true", help="Rewrite carryovers of drifted periods.")
+        parser.add_argument("--user", type=int, help="Only check periods of this user id.")
+        parser.add_argument("--period", type=int, help="Only check this period id.")
+        parser.add_argument(
+            "--sample", type=int, default=None,
+            help="Check only N randomly chosen (user, period) pairs instead of all of them.",
+        )
+
+    def handle(self, *args, **options):
+        pairs = DailyHouseSpending.objects.order_by().values_list("user_id", "period_id").distinct()
+        if options["user"]:
+            pairs = pairs.filter(user_id=options["user"])
+        if options["period"]:
+            pairs = pairs.filter(period_id=options["period"])
+        pairs = list(pairs)
+        if options["sample"] is not None and options["sample"] < len(pairs):
+            pairs = random.sample(pairs, options["sample"])
+
+        drifted_periods = 0
+        for user_id, period_id in pairs:
+            drifted = find_drift(period=period_id, user=user_id)
+            if not drifted:
+                continue
+            drifted_periods += 1
+            self.stdout.write(f"user={user_id} period={period_id}: {len(drifted)} drifted row(s)")
+            if options["repair"]:
+                with transaction.atomic():
+                    rectify_period(period=period_id, user=user_id)
+                    bump_versions(user_id, [period_id])
+
+        summary = f"Checked {len(pairs)} period(s), {drifted_periods} with drift."
+        if options["repair"] and drifted_periods:
+            summary += " Repaired."
+        style = self.style.WARNING if drifted_periods and not options["repair"] else self.style.SUCCESS
+        self.stdout.write(style(summary))
@@ -0,0 +1,35 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker import metrics
+
+
+class Command(BaseCommand):
+    help = "Print the per-endpoint query/latency report merged from the worker snapshots in TRACKER_METRICS_DIR."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dir", help="Snapshot directory (defaults to TRACKER_METRICS_DIR).")
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+
+    def handle(self, *args, **options):
+        directory = options["dir"] or getattr(settings, "TRACKER_METRICS_DIR", None)
+        if not directory:
+            raise CommandError("Set TRACKER_METRICS_DIR (or pass --dir) so workers write snapshots.")
+        files = sorted(Path(directory).glob("metrics-*.json"))
+        rows = metrics.report(metrics.merge(*(json.loads(f.read_text()) for f in files)))
+
+        if options["json"]:
+            self.stdout.write(json.dumps(rows, indent=2))
+            return
+        self.stdout.write(f"{len(files)} worker snapshot(s)")
+        header = f"{'endpoint':<45} {'count':>7} {'queries':>8} {'db ms':>8} {'ser ms':>8} {'avg ms':>8} {'p50':>6} {'p95':>6} {'p99':>6} {'cache':>6}"
+        self.stdout.write(header)
+        for view, row in rows.items():
+            self.stdout.write(
+                f"{view:<45} {row['count']:>7} {row['avg_queries']:>8} {row['avg_db_ms']:>8} "
+                f"{row['avg_serialize_ms']:>8} {row['avg_total_ms']:>8} {row['p50_ms']!s:>6} "
+                f"{row['p95_ms']!s:>6} {row['p99_ms']!s:>6} {row['cache_hit_rate']!s:>6}"
+            )
@@ -0,0 +1,62 @@
+import hashlib
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+
+# collectstatic's default ignore patterns.
+IGNORE_PATTERNS = ["CVS", ".*", "*~"]
+FINGERPRINT_FILE = ".static-fingerprint"
+
+
+def pending_migrations(database=DEFAULT_DB_ALIAS):
+    """What a plain `migrate` would apply: the plan to every app's latest migration."""
+    executor = MigrationExecutor(connections[database])
+    return executor.migration_plan(executor.loader.graph.leaf_nodes())
+
+
+def static_fingerprint():
+    """Digest of every file collectstatic would copy (path, size, mtime), and of the settings it copies with."""
+    entries = []
+    for finder in finders.get_finders():
+        for path, storage in finder.list(IGNORE_PATTERNS):
+            stat = os.stat(storage.path(path))
+            entries.append(f"{getattr(storage, 'prefix', None) or ''}/{path}|{stat.st_size}|{stat.st_mtime_ns}")
+    digest = hashlib.sha256(f"{settings.STATIC_ROOT}|{settings.STORAGES['staticfiles']}".encode())
+    for entry in sorted(entries):
+        digest.update(entry.encode() + b"\n")
+    return digest.hexdigest()
+
+
+class Command(BaseCommand):
+    help = (
+        "Container start: apply pending migrations and collect static files in one process, "
+        "skipping each when nothing changed since the last run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Run migrate and collectstatic regardless.")
+
+    def handle(self, *args, **options):
+        force, verbosity = options["force"], options["verbosity"]
+
+        plan = pending_migrations()
+        if plan or force:
+            self.stdout.write(f"Applying {len(plan)} migration(s)...")
+            call_command("migrate", interactive=False, verbosity=verbosity)
+        else:
+            self.stdout.write("No pending migrations, skipping migrate.")
+
+        fingerprint = static_fingerprint()
+        stamp = Path(settings.STATIC_ROOT) / FINGERPRINT_FILE
+        if not force and stamp.is_file() and stamp.read_text() == fingerprint:
+            self.stdout.write("Static files unchanged, skipping collectstatic.")
+        else:
+            call_command("collectstatic", interactive=False, verbosity=verbosity)
+            stamp.write_text(fingerprint)
+        self.stdout.write(self.style.SUCCESS("Ready to serve."))
@@ -0,0 +1,19 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from tracker.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = "Delete sync tombstones older than TRACKER_SYNC_TOMBSTONE_DAYS (clients behind that get a full resync)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, help="Retention in days (defaults to TRACKER_SYNC_TOMBSTONE_DAYS).")
+
+    def handle(self, *args, **options):
+        days = options["days"] or getattr(settings, "TRACKER_SYNC_TOMBSTONE_DAYS", 90)
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=timezone.now() - timedelta(days=days)).delete()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} tombstone(s) older than {days} day(s)."))
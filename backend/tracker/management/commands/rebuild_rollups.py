@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from tracker.models import Period
+from tracker.rollups import rebuild_rollup
+
+
+class Command(BaseCommand):
+    help = "Recompute PeriodRollup rows from the income, budget, misc-cost and spending tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, help="Only rebuild periods of this user id.")
+        parser.add_argument("--period", type=int, help="Only rebuild this period id.")
+
+    def handle(self, *args, **options):
+        periods = Period.objects.order_by("id")
+        if options["user"]:
+            periods = periods.filter(user_id=options["user"])
+        if options["period"]:
+            periods = periods.filter(pk=options["period"])
+
+        count = 0
+        for period in periods.iterator():
+            rebuild_rollup(period)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} period rollup(s)."))
@@ -0,0 +1,259 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from rest_framework import serializers
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended.
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+_current = ContextVar("tracker_request_metrics", default=None)
+
+
+class RequestMetrics:
+    """Counters for the request being served, filled by count_queries(), timed() and the response cache."""
+    __slots__ = ("queries", "db", "serialize", "cache")
+
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.serialize = 0.0
+        self.cache = None  # "hit" / "miss" when the response cache was consulted
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - start
+            self.queries += 1
+
+
+def _count_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def count_queries(connection):
+    """
+    Count the connection's queries toward the request being measured. Installed on every
+    connection when it opens (tracker.signals) rather than per request, because async views
+    run their queries on other threads, with other connections; the request is found through
+    the context variable, which follows the work to those threads.
+    """
+    if _count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_count_query)
+
+
+@contextmanager
+def timed(bucket):
+    """Add the time spent in the block to a bucket of the current request's metrics."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        setattr(metrics, bucket, getattr(metrics, bucket) + time.perf_counter() - start)
+
+
+def note_cache_lookup(hit):
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.cache = "hit" if hit else "miss"
+
+
+class TimedListSerializer(serializers.ListSerializer):
+    @property
+    def data(self):
+        with timed("serialize"):
+            return super().data
+
+
+class TimedSerializerMixin:
+    """Counts time spent producing `serializer.data` as serializer time; pair with TimedListSerializer."""
+
+    @property
+    def data(self):
+        with timed("serialize"):
+            return super().data
+
+
+def _empty_entry():
+    return {
+        "count": 0, "queries": 0, "db_ms": 0.0, "serialize_ms": 0.0,
+        "total_ms": 0.0, "max_ms": 0.0, "buckets": [0] * (len(BUCKETS_MS) + 1),
+        "cache_hits": 0, "cache_misses": 0,
+    }
+
+
+def _percentile(entry, q):
+    """Upper bound of the bucket holding the q-th request; the open last bucket reports max_ms."""
+    if not entry["count"]:
+        return None
+    rank, seen = q * entry["count"], 0
+    for bound, count in zip(BUCKETS_MS + (round(entry["max_ms"], 3),), entry["buckets"]):
+        seen += count
+        if seen >= rank:
+            return bound
+    return round(entry["max_ms"], 3)
+
+
+class MetricsRegistry:
+    """
+    In-process per-endpoint aggregates. Each gunicorn worker holds its own; with
+    TRACKER_METRICS_DIR set, workers periodically write snapshots there for `dump_metrics`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+        self._last_flush = time.monotonic()
+
+    def record(self, view, metrics, total):
+        total_ms = total * 1000
+        with self._lock:
+            entry = self._views.get(view)
+            if entry is None:
+                entry = self._views[view] = _empty_entry()
+            entry["count"] += 1
+            entry["queries"] += metrics.queries
+            entry["db_ms"] += metrics.db * 1000
+            entry["serialize_ms"] += metrics.serialize * 1000
+            entry["total_ms"] += total_ms
+            entry["max_ms"] = max(entry["max_ms"], total_ms)
+            entry["buckets"][bisect_left(BUCKETS_MS, total_ms)] += 1
+            if metrics.cache is not None:
+                entry["cache_hits" if metrics.cache == "hit" else "cache_misses"] += 1
+        self._maybe_flush()
+
+    def raw(self):
+        with self._lock:
+            return {view: {**entry, "buckets": list(entry["buckets"])} for view, entry in self._views.items()}
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+    def _maybe_flush(self):
+        directory = getattr(settings, "TRACKER_METRICS_DIR", None)
+        interval = getattr(settings, "TRACKER_METRICS_FLUSH_SECONDS", 30)
+        now = time.monotonic()
+        if not directory or now - self._last_flush < interval:
+            return
+        self._last_flush = now
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+        tmp = path / f".metrics-{os.getpid()}.tmp"
+        tmp.write_text(json.dumps(self.raw()))
+        tmp.replace(path / f"metrics-{os.getpid()}.json")
+
+
+REGISTRY = MetricsRegistry()
+
+
+def merge(*raws):
+    """Combine raw registry snapshots (e.g. one per worker)."""
+    merged = {}
+    for raw in raws:
+        for view, entry in raw.items():
+            into = merged.setdefault(view, _empty_entry())
+            for key in ("count", "queries", "db_ms", "serialize_ms", "total_ms", "cache_hits", "cache_misses"):
+                into[key] += entry.get(key, 0)
+            into["max_ms"] = max(into["max_ms"], entry["max_ms"])
+            into["buckets"] = [a + b for a, b in zip(into["buckets"], entry["buckets"])]
+    return merged
+
+
+def report(raw):
+    """Per-endpoint averages, bucketed p50/p95/p99 (bucket upper bounds, in ms) and cache hit rate."""
+    rows = {}
+    for view, entry in sorted(raw.items()):
+        n = entry["count"] or 1
+        hits, misses = entry.get("cache_hits", 0), entry.get("cache_misses", 0)
+        rows[view] = {
+            "count": entry["count"],
+            "avg_queries": round(entry["queries"] / n, 2),
+            "avg_db_ms": round(entry["db_ms"] / n, 3),
+            "avg_serialize_ms": round(entry["serialize_ms"] / n, 3),
+            "avg_total_ms": round(entry["total_ms"] / n, 3),
+            "max_ms": round(entry["max_ms"], 3),
+            "p50_ms": _percentile(entry, 0.50),
+            "p95_ms": _percentile(entry, 0.95),
+            "p99_ms": _percentile(entry, 0.99),
+            "cache_hits": hits,
+            "cache_misses": misses,
+            "cache_hit_rate": round(hits / (hits + misses), 3) if hits + misses else None,
+        }
+    return rows
+
+
+class QueryMetricsMiddleware:
+    """
+    Measures every /api/ request: SQL query count and time (see count_queries), serializer
+    time and total time. Adds a Server-Timing header and records into REGISTRY keyed by
+    "<METHOD> <url name>". Disable with TRACKER_METRICS_ENABLED = False.
+    Works in both sync (WSGI) and async (ASGI) middleware chains.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def measured(request):
+        return getattr(settings, "TRACKER_METRICS_ENABLED", True) and request.path.startswith("/api/")
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.measured(request):
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        if not self.measured(request):
+            return await self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics, time.perf_counter() - start)
+
+    def finish(self, request, response, metrics, total):
+        match = request.resolver_match
+        view = f"{request.method} {match.view_name if match else '<unresolved>'}"
+        REGISTRY.record(view, metrics, total)
+        response["Server-Timing"] = (
+            f'db;dur={metrics.db * 1000:.2f};desc="{metrics.queries} queries", '
+            f"ser;dur={metrics.serialize * 1000:.2f}, "
+            f"total;dur={total * 1000:.2f}"
+            + (f', cache;desc="{metrics.cache}"' if metrics.cache else "")
+        )
+        return response
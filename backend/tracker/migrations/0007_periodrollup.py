@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-18 07:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0006_miscellaneouscost'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PeriodRollup',
+            fields=[
+                ('period', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rollup', serialize=False, to='tracker.period')),
+                ('income_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('budgets_allocated', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('budgets_paid', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('misc_cost_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('spending_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('daily_limit_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('days_recorded', models.PositiveIntegerField(default=0)),
+                ('days_over_limit', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+INDEX = models.Index(Lower('username'), name='tracker_user_username_lower')
+
+
+def create_index(apps, schema_editor):
+    schema_editor.add_index(apps.get_model(settings.AUTH_USER_MODEL), INDEX)
+
+
+def drop_index(apps, schema_editor):
+    schema_editor.remove_index(apps.get_model(settings.AUTH_USER_MODEL), INDEX)
+
+
+class Migration(migrations.Migration):
+    """
+    Case-insensitive username lookups (signup's "already taken" check) use this expression
+    index. The user model belongs to django.contrib.auth, so the index is created here.
+    """
+
+    dependencies = [
+        ('tracker', '0010_tokenversion'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
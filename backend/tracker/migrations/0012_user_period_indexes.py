@@ -0,0 +1,52 @@
+from django.db import migrations, models
+
+# Lists filter by user and period and page in these orders (see the viewsets' cursor_ordering).
+INDEXES = [
+    ('budget', models.Index(fields=['user', 'period', 'id'], name='tracker_bud_user_id_5115af_idx')),
+    ('income', models.Index(fields=['user', 'period', 'date_received', 'id'], name='tracker_inc_user_id_d97447_idx')),
+    ('miscellaneouscost', models.Index(fields=['user', 'period', 'date_added', 'id'], name='tracker_mis_user_id_de1324_idx')),
+]
+# Same columns as the uniq_user_period_date constraint's index.
+DUPLICATE = ('dailyhousespending', models.Index(fields=['user', 'period', 'date'], name='tracker_dai_user_id_0116ee_idx'))
+
+
+def _options(schema_editor):
+    # CREATE/DROP INDEX CONCURRENTLY keeps large PostgreSQL tables writable while the index
+    # is built. SQLite has no equivalent; WAL readers are not blocked either way.
+    return {'concurrently': True} if schema_editor.connection.vendor == 'postgresql' else {}
+
+
+def add_indexes(apps, schema_editor):
+    for model_name, index in INDEXES:
+        schema_editor.add_index(apps.get_model('tracker', model_name), index, **_options(schema_editor))
+    model_name, index = DUPLICATE
+    schema_editor.remove_index(apps.get_model('tracker', model_name), index, **_options(schema_editor))
+
+
+def remove_indexes(apps, schema_editor):
+    model_name, index = DUPLICATE
+    schema_editor.add_index(apps.get_model('tracker', model_name), index, **_options(schema_editor))
+    for model_name, index in INDEXES:
+        schema_editor.remove_index(apps.get_model('tracker', model_name), index, **_options(schema_editor))
+
+
+class Migration(migrations.Migration):
+    """
+    Composite (user, period, ...) indexes for the per-period lists, built concurrently on
+    PostgreSQL, which cannot happen inside a transaction: hence atomic = False.
+    """
+    atomic = False
+
+    dependencies = [
+        ('tracker', '0011_user_username_lower_index'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[migrations.RunPython(add_indexes, remove_indexes)],
+            state_operations=[
+                *(migrations.AddIndex(model_name=model_name, index=index) for model_name, index in INDEXES),
+                migrations.RemoveIndex(model_name=DUPLICATE[0], name=DUPLICATE[1].name),
+            ],
+        ),
+    ]
@@ -0,0 +1,61 @@
+from django.db import migrations, models
+
+MODELS = ['period', 'income', 'budgetcategory', 'budget', 'dailyhousespending', 'miscellaneouscost']
+# Sync pages by change_seq.
+ADDED = [
+    ('period', models.Index(fields=['user', 'change_seq'], name='tracker_per_user_id_ea50d0_idx')),
+    ('income', models.Index(fields=['user', 'change_seq'], name='tracker_inc_user_id_c71725_idx')),
+    ('budgetcategory', models.Index(fields=['user', 'change_seq'], name='tracker_bud_user_id_91efbc_idx')),
+    ('budget', models.Index(fields=['user', 'change_seq'], name='tracker_bud_user_id_df9ed2_idx')),
+    ('dailyhousespending', models.Index(fields=['user', 'change_seq'], name='tracker_dai_user_id_6cab04_idx')),
+    ('miscellaneouscost', models.Index(fields=['user', 'change_seq'], name='tracker_mis_user_id_04f9fc_idx')),
+    ('tombstone', models.Index(fields=['user', 'change_seq'], name='tracker_tom_user_id_310a02_idx')),
+]
+
+
+def _options(schema_editor):
+    # As in 0012: build without blocking writes on PostgreSQL.
+    return {'concurrently': True} if schema_editor.connection.vendor == 'postgresql' else {}
+
+
+def add_indexes(apps, schema_editor):
+    for model_name, index in ADDED:
+        schema_editor.add_index(apps.get_model('tracker', model_name), index, **_options(schema_editor))
+
+
+def remove_indexes(apps, schema_editor):
+    for model_name, index in ADDED:
+        schema_editor.remove_index(apps.get_model('tracker', model_name), index, **_options(schema_editor))
+
+
+class Migration(migrations.Migration):
+    """
+    Per-user change numbers for /api/sync/. Existing rows start at 0, below every number
+    handed out from now on, so clients' first sync after the upgrade (their old timestamp
+    cursors are answered with a reset) sends them.
+    """
+    atomic = False
+
+    dependencies = [
+        ('tracker', '0012_user_period_indexes'),
+    ]
+
+    operations = [
+        *(
+            migrations.AddField(
+                model_name=model_name,
+                name='change_seq',
+                field=models.PositiveBigIntegerField(default=0, editable=False),
+            )
+            for model_name in MODELS
+        ),
+        migrations.AddField(
+            model_name='tombstone',
+            name='change_seq',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[migrations.RunPython(add_indexes, remove_indexes)],
+            state_operations=[migrations.AddIndex(model_name=model_name, index=index) for model_name, index in ADDED],
+        ),
+    ]
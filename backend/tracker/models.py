@@ -1,14 +1,34 @@
 # /home/alireza/cost-tracker/backend/tracker/models.py
 from decimal import Decimal
-from django.db import models
-from django.db.models import Q
+from django.db import connections, models, router, transaction
+from django.db.models import F, Q
 from django.core.exceptions import ValidationError
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
 
-class Period(models.Model):
+class ChangeTracked(models.Model):
+    """
+    Rows sent by /api/sync/. change_seq is the user's change number (see
+    DataVersionManager.next_change) of the transaction that last wrote the row: save() stamps
+    it, bulk writes and update() calls set it themselves.
+    """
+    change_seq = models.PositiveBigIntegerField(default=0, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        # The number and the row commit together, or a sync in between could skip the row.
+        with transaction.atomic(savepoint=False):
+            self.change_seq = DataVersion.objects.next_change(self.user_id)
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "change_seq"}
+            super().save(*args, **kwargs)
+
+
+class Period(ChangeTracked):
     name = models.CharField(max_length=100)
     start_date = models.DateField()
     end_date = models.DateField()
@@ -23,31 +43,51 @@ class Period(models.Model):
     )
     # New: free-form notes stored per period
     notes = models.TextField(null=True, blank=True, help_text="User notes for this period")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "change_seq"]),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.start_date} - {self.end_date})"
 
 
-class Income(models.Model):
+class Income(ChangeTracked):
     period = models.ForeignKey(Period, on_delete=models.CASCADE, related_name='incomes')
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     source = models.CharField(max_length=100)
     amount = models.DecimalField(max_digits=12, decimal_places=2)
     date_received = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Lists filter by user and period; pages are ordered by (-date_received, -id).
+            models.Index(fields=["user", "period", "date_received", "id"]),
+            models.Index(fields=["user", "change_seq"]),
+        ]
 
     def __str__(self):
         return f"{self.source} - {self.amount}"
 
 
-class BudgetCategory(models.Model):
+class BudgetCategory(ChangeTracked):
     name = models.CharField(max_length=50)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "change_seq"]),
+        ]
 
     def __str__(self):
         return self.name
 
 
-class Budget(models.Model):
+class Budget(ChangeTracked):
     STATUS_CHOICES = [
         ('paid', 'Paid'),
         ('not_paid', 'Not Paid'),
@@ -59,18 +99,28 @@ class Budget(models.Model):
     amount_allocated = models.DecimalField(max_digits=12, decimal_places=2)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='not_paid')
     due_date = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Lists filter by user and period; pages are ordered by -id.
+            models.Index(fields=["user", "period", "id"]),
+            models.Index(fields=["user", "change_seq"]),
+        ]
 
     def __str__(self):
         return f"{self.category.name} - {self.status} (Due: {self.due_date})"
 
 
-class DailyHouseSpending(models.Model):
+class DailyHouseSpending(ChangeTracked):
     date = models.DateField(db_index=True)
     period = models.ForeignKey(Period, on_delete=models.CASCADE, related_name='daily_spendings')
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='daily_spendings')
     spent_amount = models.DecimalField(max_digits=12, decimal_places=2)
     fixed_daily_limit = models.DecimalField(max_digits=12, decimal_places=2, default=100)
     carryover = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+    # Also moved by carryover rectification, which rewrites later rows of the period.
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-date", "-id"]
@@ -79,8 +129,9 @@ class DailyHouseSpending(models.Model):
             models.CheckConstraint(check=Q(spent_amount__gte=0), name="spent_amount_gte_0"),
             models.CheckConstraint(check=Q(fixed_daily_limit__gte=0), name="limit_gte_0"),
         ]
+        # uniq_user_period_date's index serves the (user, period, date) lookups and ordering.
         indexes = [
-            models.Index(fields=["user", "period", "date"]),
+            models.Index(fields=["user", "change_seq"]),
         ]
 
     def __str__(self):
@@ -112,22 +163,139 @@ class DailyHouseSpending(models.Model):
                 .first()
             )
             self.carryover = prev.remaining_for_day if prev else Decimal("0")
-        self.full_clean()
+        # Already-loaded relations need no existence query, and the unique/check constraints
+        # are validated by the serializer and enforced by the database.
+        loaded = [name for name in ("period", "user") if self._meta.get_field(name).is_cached(self)]
+        self.full_clean(exclude=loaded, validate_constraints=False)
         super().save(*args, **kwargs)
 
 
-class MiscellaneousCost(models.Model):
+class MiscellaneousCost(ChangeTracked):
     period = models.ForeignKey(Period, on_delete=models.CASCADE, related_name='misc_costs')
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     title = models.CharField(max_length=200)
     amount = models.DecimalField(max_digits=12, decimal_places=2)
     date_added = models.DateField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-date_added', '-id']
+        indexes = [
+            models.Index(fields=["user", "period", "date_added", "id"]),
+            models.Index(fields=["user", "change_seq"]),
+        ]
         constraints = [
             models.CheckConstraint(check=models.Q(amount__gte=0), name="misc_cost_amount_gte_0"),
         ]
 
     def __str__(self):
-        return f"{self.title} - {self.amount}"
\ No newline at end of file
+        return f"{self.title} - {self.amount}"
+
+class PeriodRollup(models.Model):
+    """
+    Per-period totals maintained with delta updates by the tracker viewsets on every write,
+    so reading a period's summary is a single primary-key lookup.
+    Rebuild from the raw tables with `manage.py rebuild_rollups`.
+    """
+    period = models.OneToOneField(Period, on_delete=models.CASCADE, primary_key=True, related_name='rollup')
+    income_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    budgets_allocated = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    budgets_paid = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    misc_cost_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    spending_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    daily_limit_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    days_recorded = models.PositiveIntegerField(default=0)
+    days_over_limit = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Rollup of {self.period_id}"
+
+
+class DataVersionManager(models.Manager):
+    def next_change(self, user_id):
+        """
+        Bump the user's user-wide counter and return it: the change number of the current
+        transaction, which the rows it writes are stamped with (ChangeTracked.change_seq).
+        The counter row stays locked until the transaction ends, so a user's change numbers
+        commit in order: once a sync reads the counter, every row numbered up to it is
+        committed. Call inside the write's transaction.
+        """
+        qs = self.filter(user_id=user_id, period__isnull=True)
+        connection = connections[router.db_for_write(self.model)]
+        for _ in range(2):
+            if connection.features.can_return_columns_from_insert:  # UPDATE ... RETURNING too
+                table = connection.ops.quote_name(self.model._meta.db_table)
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f"UPDATE {table} SET version = version + 1"
+                        f" WHERE user_id = %s AND period_id IS NULL RETURNING version",
+                        [user_id],
+                    )
+                    row = cursor.fetchone()
+                if row is not None:
+                    return row[0]
+            elif qs.update(version=F("version") + 1):
+                return qs.values_list("version", flat=True).get()
+            self.bulk_create([self.model(user_id=user_id)], ignore_conflicts=True)
+        raise DataVersion.DoesNotExist(f"No user-wide counter for user {user_id}.")
+
+
+class DataVersion(models.Model):
+    """
+    Write counters behind the tracker ETags: one user-wide row (period NULL) and one row per
+    period, bumped in the same transaction as every API write that changes what a GET returns.
+    The user-wide counter also numbers the user's changes for /api/sync/ (next_change).
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='data_versions')
+    period = models.ForeignKey(Period, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    version = models.PositiveBigIntegerField(default=0)
+
+    objects = DataVersionManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "period"], name="uniq_user_period_version"),
+            models.UniqueConstraint(
+                fields=["user"], condition=Q(period__isnull=True), name="uniq_user_wide_version"
+            ),
+        ]
+
+    def __str__(self):
+        return f"v{self.version} of user {self.user_id} / period {self.period_id}"
+
+
+class Tombstone(models.Model):
+    """
+    Deleted rows, kept for /api/sync/ so clients holding a local copy learn about deletes.
+    `kind` is the collection name used by the sync payload ("incomes", "budgets", ...).
+    Rows deleted together with their period are covered by the period's tombstone.
+    change_seq is the delete's change number (see ChangeTracked).
+    Prune old ones with `manage.py prune_tombstones`.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='tombstones')
+    kind = models.CharField(max_length=32)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+    change_seq = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "deleted_at"]),
+            models.Index(fields=["user", "change_seq"]),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id} deleted {self.deleted_at}"
+
+
+class TokenVersion(models.Model):
+    """
+    Per-user counter stamped into every JWT (tracker.auth). Bumping it revokes all tokens
+    issued before: access tokens on their next request, refresh tokens on their next refresh.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='token_version')
+    version = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"token v{self.version} of user {self.user_id}"
@@ -0,0 +1,27 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class TrackerCursorPagination(CursorPagination):
+    """
+    Keyset pagination for the tracker list endpoints.
+
+    Opt-in: a request is paginated only when it sends `cursor` or `page_size`, so clients
+    that expect a plain list keep getting one. Each viewset picks its keyset with a
+    `cursor_ordering` attribute matching its natural ordering.
+    """
+    page_size_query_param = 'page_size'
+    ordering = ('-id',)
+
+    @property
+    def max_page_size(self):
+        return getattr(settings, 'TRACKER_MAX_PAGE_SIZE', 500)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_ordering(self, request, queryset, view):
+        return tuple(getattr(view, 'cursor_ordering', self.ordering))
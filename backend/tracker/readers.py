@@ -0,0 +1,159 @@
+"""
+Read-only list payloads built from values_list() rows instead of ModelSerializer instances.
+
+Each reader returns exactly what its serializer's `.data` would for the same rows: same
+keys in the same order, Decimals quantized and formatted the way DRF's DecimalField does,
+dates as ISO strings. The parity tests in tracker.tests pin this; a serializer change that
+alters the list output must be mirrored here.
+"""
+import decimal
+from operator import attrgetter
+
+from .metrics import timed
+from .models import Period, Income, Budget, BudgetCategory, DailyHouseSpending, MiscellaneousCost
+from .serializers import (
+    PeriodSerializer, IncomeSerializer, BudgetSerializer, BudgetCategorySerializer,
+    DailyHouseSpendingSerializer, MiscellaneousCostSerializer,
+)
+
+ZERO = decimal.Decimal("0")
+
+
+def _money(max_digits, decimal_places):
+    """DecimalField.to_representation() with the quantize context built once, not per value."""
+    exponent = decimal.Decimal(".1") ** decimal_places
+    context = decimal.getcontext().copy()
+    context.prec = max_digits
+
+    def fmt(value):
+        if value is None:
+            return None
+        return f"{value.quantize(exponent, context=context):f}"
+    return fmt
+
+
+def _model_money(model, name):
+    field = model._meta.get_field(name)
+    return _money(field.max_digits, field.decimal_places)
+
+
+def _date(value):
+    return None if value is None else value.isoformat()
+
+
+class ListReader:
+    """
+    The serializer's readable fields, in its order, as (name, columns, get) entries: the
+    values_list() columns a field needs and how to turn a row into its value. Readers render
+    all fields or a subset (sparse fieldsets), selecting only the columns that subset needs.
+    """
+
+    def __init__(self, *fields):
+        self.fields = fields
+        self.names = tuple(name for name, _, _ in fields)
+
+    def columns(self, names=None, extra=()):
+        columns = {"id": None}
+        for name, needs, _ in self.fields:
+            if names is None or name in names:
+                columns.update(dict.fromkeys(needs))
+        columns.update(dict.fromkeys(extra))
+        return tuple(columns)
+
+    def only(self, queryset, names, extra=()):
+        """The same projection for querysets of model instances (retrieve, serializer lists)."""
+        columns = self.columns(names, extra)
+        # A deferred relation cannot stay in select_related(): keep only the ones still read.
+        related = {column.split("__")[0] for column in columns if "__" in column}
+        queryset = queryset.select_related(None)
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset.only(*columns)
+
+    def rows(self, queryset, names=None, extra=()):
+        """
+        Named rows with the columns of `names` (all fields when None) plus `extra`; cursor
+        pagination reads its ordering fields off them as attributes, so pass those as `extra`.
+        """
+        return queryset.values_list(*self.columns(names, extra), named=True)
+
+    def render(self, rows, names=None):
+        with timed("serialize"):
+            getters = [(name, get) for name, _, get in self.fields if names is None or name in names]
+            return [{name: get(row) for name, get in getters} for row in rows]
+
+
+def _column(name):
+    return name, (name,), attrgetter(name)
+
+
+def _money_column(model, name):
+    fmt = _model_money(model, name)
+    return name, (name,), lambda r: fmt(getattr(r, name))
+
+
+def _date_column(name):
+    return name, (name,), lambda r: _date(getattr(r, name))
+
+
+def _period_reader():
+    return ListReader(
+        _column("id"), _column("name"), _date_column("start_date"), _date_column("end_date"),
+        _money_column(Period, "total_savings"), _money_column(Period, "default_daily_limit"),
+        _column("notes"),
+    )
+
+
+def _income_reader():
+    return ListReader(
+        _column("id"), _column("source"), _money_column(Income, "amount"),
+        _date_column("date_received"), _column("period"),
+    )
+
+
+def _category_reader():
+    return ListReader(_column("id"), _column("name"))
+
+
+def _budget_reader():
+    return ListReader(
+        _column("id"), _column("period"),
+        ("category", ("category", "category__name"), lambda r: {"id": r.category, "name": r.category__name}),
+        _money_column(Budget, "amount_allocated"), _column("status"), _date_column("due_date"),
+    )
+
+
+def _daily_spending_reader():
+    # carryover and remaining_for_day are declared on the serializer as DecimalField(12, 2).
+    money = _money(12, 2)
+    day_columns = ("spent_amount", "fixed_daily_limit", "carryover")
+
+    def remaining(r):
+        # Same arithmetic as DailyHouseSpending.remaining_for_day / is_over_limit.
+        return r.fixed_daily_limit - r.spent_amount + (r.carryover if r.carryover is not None else ZERO)
+
+    return ListReader(
+        _column("id"), _date_column("date"), _column("period"),
+        _money_column(DailyHouseSpending, "spent_amount"), _money_column(DailyHouseSpending, "fixed_daily_limit"),
+        ("carryover", ("carryover",), lambda r: money(r.carryover)),
+        ("remaining_for_day", day_columns, lambda r: money(remaining(r))),
+        ("is_over_limit", day_columns, lambda r: remaining(r) < 0),
+    )
+
+
+def _misc_cost_reader():
+    return ListReader(
+        _column("id"), _column("period"), _column("title"),
+        _money_column(MiscellaneousCost, "amount"), _date_column("date_added"),
+    )
+
+
+# Serializer class -> reader producing the same list output.
+READERS = {
+    PeriodSerializer: _period_reader(),
+    IncomeSerializer: _income_reader(),
+    BudgetCategorySerializer: _category_reader(),
+    BudgetSerializer: _budget_reader(),
+    DailyHouseSpendingSerializer: _daily_spending_reader(),
+    MiscellaneousCostSerializer: _misc_cost_reader(),
+}
@@ -0,0 +1,68 @@
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import DailyHouseSpending, PeriodRollup
+from .summary import OVER_LIMIT, raw_totals
+
+
+def _pk(obj):
+    return getattr(obj, "pk", obj)
+
+
+def rebuild_rollup(period):
+    """Recompute a period's rollup from the row tables and store it."""
+    rollup, _ = PeriodRollup.objects.update_or_create(period_id=_pk(period), defaults=raw_totals(period))
+    return rollup
+
+
+def get_rollup(period):
+    """Single-row lookup; periods that predate rollups are built on first read."""
+    rollup = PeriodRollup.objects.filter(period_id=_pk(period)).first()
+    return rollup or rebuild_rollup(period)
+
+
+def _days_over_limit():
+    over = (
+        DailyHouseSpending.objects
+        .filter(OVER_LIMIT, period_id=OuterRef("period_id"))
+        .order_by()
+        .values("period_id")
+        .annotate(n=Count("id"))
+        .values("n")
+    )
+    return Coalesce(Subquery(over, output_field=IntegerField()), Value(0))
+
+
+def apply_rollup_delta(period, recount_over_limit=False, **deltas):
+    """
+    Add `deltas` (column -> signed amount) to the period's rollup in one UPDATE.
+    Call after the row write, inside the same transaction. With `recount_over_limit`,
+    days_over_limit is recounted in the same statement, since a carryover change can move
+    any later day across the limit. A missing rollup is rebuilt from the already-written rows.
+    """
+    values = {name: F(name) + delta for name, delta in deltas.items() if delta}
+    if recount_over_limit:
+        values["days_over_limit"] = _days_over_limit()
+    if not values:
+        return
+    values["updated_at"] = timezone.now()
+    if not PeriodRollup.objects.filter(period_id=_pk(period)).update(**values):
+        rebuild_rollup(period)
+
+
+def apply_rollup_change(old_period, old, new_period, new, recount_over_limit=False):
+    """
+    Move a row's contribution (column -> amount dicts) from its state before an update
+    to its state after it, across periods if the row changed period.
+    """
+    if _pk(old_period) == _pk(new_period):
+        deltas = {name: new.get(name, 0) - old.get(name, 0) for name in {*old, *new}}
+        apply_rollup_delta(new_period, recount_over_limit=recount_over_limit, **deltas)
+    else:
+        apply_rollup_delta(old_period, recount_over_limit=recount_over_limit, **negate(old))
+        apply_rollup_delta(new_period, recount_over_limit=recount_over_limit, **new)
+
+
+def negate(contribution):
+    return {name: -amount for name, amount in contribution.items()}
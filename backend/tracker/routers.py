@@ -0,0 +1,107 @@
+"""
+Primary/replica routing for the PostgreSQL deployment (see config/database.py).
+
+Reads go to the TRACKER_REPLICA_ALIAS database, everything else to "default". Reads stay on
+the primary when the replica could be behind what the client expects to see:
+- during write requests (the whole request is pinned) and inside a transaction on the primary;
+- for TRACKER_REPLICA_STICKY_SECONDS after a successful write from the same client, which
+  ReplicaStickinessMiddleware remembers in a cookie, so a client reads its own writes;
+- for TokenVersion, so a revocation is never undone by a lagging replica refilling the cache.
+Without a replica alias every query goes to "default" and the middleware does nothing.
+"""
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_use_primary = ContextVar("tracker_use_primary", default=False)
+
+STICKY_COOKIE = "tracker_primary"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def replica_alias():
+    return getattr(settings, "TRACKER_REPLICA_ALIAS", None)
+
+
+@contextmanager
+def use_primary():
+    """Send every read in the block to the primary."""
+    token = _use_primary.set(True)
+    try:
+        yield
+    finally:
+        _use_primary.reset(token)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        alias = replica_alias()
+        if (
+            alias is None
+            or _use_primary.get()
+            or model._meta.label == "tracker.TokenVersion"
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica is a copy made by the database server; never migrate it directly.
+        return db != replica_alias()
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Pins write requests to the primary, and GETs that arrive within
+    TRACKER_REPLICA_STICKY_SECONDS of a successful write by the same client (cookie).
+    The pin is a context variable, so it covers the queries async views run on other threads.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if replica_alias() is None:
+            return self.get_response(request)
+        with self.pin(request):
+            response = self.get_response(request)
+        return self.remember_write(request, response)
+
+    async def __acall__(self, request):
+        if replica_alias() is None:
+            return await self.get_response(request)
+        with self.pin(request):
+            response = await self.get_response(request)
+        return self.remember_write(request, response)
+
+    @staticmethod
+    def pin(request):
+        if request.method not in SAFE_METHODS or STICKY_COOKIE in request.COOKIES:
+            return use_primary()
+        return nullcontext()
+
+    @staticmethod
+    def remember_write(request, response):
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(
+                STICKY_COOKIE, "1",
+                max_age=getattr(settings, "TRACKER_REPLICA_STICKY_SECONDS", 5),
+                httponly=True, samesite="Lax", secure=request.is_secure(),
+            )
+        return response
@@ -1,6 +1,8 @@
 # /home/alireza/cost-tracker/backend/tracker/serializers.py
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.db.models import Value
+from django.db.models.functions import Lower
 from .models import (
     Period,
     Income,
@@ -9,13 +11,25 @@ from .models import (
     DailyHouseSpending,
     MiscellaneousCost,
 )
+from .metrics import TimedListSerializer, TimedSerializerMixin
 
 User = get_user_model()
 
 
-class PeriodSerializer(serializers.ModelSerializer):
+class SparseFieldsSerializerMixin:
+    """Accepts `fields=` (readable field names to keep); the other readable fields are dropped."""
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in [name for name, field in self.fields.items() if not field.write_only and name not in fields]:
+                self.fields.pop(name)
+
+
+class PeriodSerializer(SparseFieldsSerializerMixin, TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Period
+        list_serializer_class = TimedListSerializer
         fields = [
             'id', 'name', 'start_date', 'end_date',
             'total_savings',
@@ -36,9 +50,24 @@ class PeriodSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class IncomeSerializer(serializers.ModelSerializer):
+class PeriodSummarySerializer(TimedSerializerMixin, serializers.Serializer):
+    period = serializers.IntegerField()
+    income_total = serializers.DecimalField(max_digits=14, decimal_places=2)
+    budgets_allocated = serializers.DecimalField(max_digits=14, decimal_places=2)
+    budgets_paid = serializers.DecimalField(max_digits=14, decimal_places=2)
+    budgets_unpaid = serializers.DecimalField(max_digits=14, decimal_places=2)
+    left_after_budgets = serializers.DecimalField(max_digits=14, decimal_places=2)
+    misc_cost_total = serializers.DecimalField(max_digits=14, decimal_places=2)
+    spending_total = serializers.DecimalField(max_digits=14, decimal_places=2)
+    final_carryover = serializers.DecimalField(max_digits=14, decimal_places=2)
+    days_recorded = serializers.IntegerField()
+    days_over_limit = serializers.IntegerField()
+
+
+class IncomeSerializer(SparseFieldsSerializerMixin, TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Income
+        list_serializer_class = TimedListSerializer
         fields = ['id', 'source', 'amount', 'date_received', 'period']
         read_only_fields = ['id']
 
@@ -55,7 +84,7 @@ class IncomeSerializer(serializers.ModelSerializer):
 
     def validate_period(self, value):
         request = self.context.get('request')
-        if value.user != request.user:
+        if value.user_id != request.user.pk:
             raise serializers.ValidationError("You cannot assign income to another user's period.")
         return value
 
@@ -72,9 +101,10 @@ class IncomeSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class BudgetCategorySerializer(serializers.ModelSerializer):
+class BudgetCategorySerializer(SparseFieldsSerializerMixin, TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = BudgetCategory
+        list_serializer_class = TimedListSerializer
         fields = ['id', 'name']
         read_only_fields = ['id']
 
@@ -83,7 +113,7 @@ class BudgetCategorySerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class BudgetSerializer(serializers.ModelSerializer):
+class BudgetSerializer(SparseFieldsSerializerMixin, TimedSerializerMixin, serializers.ModelSerializer):
     category_id = serializers.PrimaryKeyRelatedField(
         queryset=BudgetCategory.objects.all(),
         write_only=True,
@@ -93,6 +123,7 @@ class BudgetSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Budget
+        list_serializer_class = TimedListSerializer
         fields = ['id', 'period', 'category_id', 'category', 'amount_allocated', 'status', 'due_date']
         read_only_fields = ['id']
 
@@ -103,13 +134,13 @@ class BudgetSerializer(serializers.ModelSerializer):
 
     def validate_period(self, value):
         request = self.context.get('request')
-        if value.user != request.user:
+        if value.user_id != request.user.pk:
             raise serializers.ValidationError("You cannot assign a budget to another user's period.")
         return value
 
     def validate_category(self, value):
         request = self.context.get('request')
-        if value.user != request.user:
+        if value.user_id != request.user.pk:
             raise serializers.ValidationError("You cannot assign a budget to another user's category.")
         return value
 
@@ -118,7 +149,7 @@ class BudgetSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class DailyHouseSpendingSerializer(serializers.ModelSerializer):
+class DailyHouseSpendingSerializer(SparseFieldsSerializerMixin, TimedSerializerMixin, serializers.ModelSerializer):
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
     carryover = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
     remaining_for_day = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
@@ -126,6 +157,7 @@ class DailyHouseSpendingSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = DailyHouseSpending
+        list_serializer_class = TimedListSerializer
         fields = [
             'id',
             'date',
@@ -151,7 +183,7 @@ class DailyHouseSpendingSerializer(serializers.ModelSerializer):
 
     def validate_period(self, value):
         request = self.context.get('request')
-        if value.user != request.user:
+        if value.user_id != request.user.pk:
             raise serializers.ValidationError("You cannot record spending against another user's period.")
         return value
 
@@ -164,11 +196,12 @@ class DailyHouseSpendingSerializer(serializers.ModelSerializer):
         return attrs
 
 
-class MiscellaneousCostSerializer(serializers.ModelSerializer):
+class MiscellaneousCostSerializer(SparseFieldsSerializerMixin, TimedSerializerMixin, serializers.ModelSerializer):
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
 
     class Meta:
         model = MiscellaneousCost
+        list_serializer_class = TimedListSerializer
         fields = ['id', 'period', 'user', 'title', 'amount', 'date_added']
         read_only_fields = ['id', 'date_added']
 
@@ -185,7 +218,7 @@ class MiscellaneousCostSerializer(serializers.ModelSerializer):
 
     def validate_period(self, value):
         request = self.context.get('request')
-        if value.user != request.user:
+        if value.user_id != request.user.pk:
             raise serializers.ValidationError("You cannot add a cost to another user's period.")
         return value
 
@@ -203,7 +236,9 @@ class SignupSerializer(serializers.ModelSerializer):
         value = value.strip()
         if not value:
             raise serializers.ValidationError("Username cannot be empty.")
-        if User.objects.filter(username__iexact=value).exists():
+        # LOWER(username) = LOWER(%s) is served by the tracker_user_username_lower index
+        # (username__iexact compiles to LIKE on SQLite, which cannot use it).
+        if User.objects.alias(username_lower=Lower('username')).filter(username_lower=Lower(Value(value))).exists():
             raise serializers.ValidationError("Username is already taken.")
         return value
 
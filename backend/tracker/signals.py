@@ -0,0 +1,121 @@
+from django.contrib.auth import get_user_model
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import cache, metrics
+from .auth import revoke_tokens
+from .models import Budget, BudgetCategory, DailyHouseSpending, Income, MiscellaneousCost, Period
+from .sync import KIND_BY_MODEL, record_tombstones
+from .versions import bump_versions, bumped_explicitly, scope
+
+PERIOD_ROWS = (Income, Budget, DailyHouseSpending, MiscellaneousCost)
+
+
+def _cascaded(sender, origin):
+    """True when the delete was cascaded from another model's (a period's, a user's)."""
+    return not issubclass(getattr(origin, "model", type(origin)), sender)
+
+
+@receiver(post_delete, sender=Period)
+def period_deleted(sender, instance, origin=None, **kwargs):
+    """
+    A deleted period takes its rows (and its DataVersion counter) with it, whether deleted
+    through the API, the admin or a cascade: drop its cached responses and bump the user-wide
+    counter that the period list hangs on, and leave a tombstone for /api/sync/.
+    """
+    cache.evict_on_commit(instance.user_id, [scope(instance)])
+    origin_model = getattr(origin, "model", type(origin))
+    if issubclass(origin_model, get_user_model()):
+        return  # the user's counters are being deleted too
+    bump_versions(instance.user_id)
+    record_tombstones(instance.user_id, "periods", [instance.pk])
+
+
+# Writes made outside the API views (admin, shell, management commands) bump the DataVersion
+# counters here, so ETags and cached responses do not outlive them. The views bump once per
+# write themselves (see versions.explicit_bumps). Bulk ORM calls (bulk_create(), update())
+# send no signals: call bump_versions() after them.
+
+@receiver(post_save, sender=Period)
+def period_saved(sender, instance, **kwargs):
+    if not bumped_explicitly():
+        bump_versions(instance.user_id, [instance])
+
+
+@receiver(pre_save)
+def row_saving(sender, instance, **kwargs):
+    """Remember the period a row is moved away from, whose counter must change too."""
+    if sender in PERIOD_ROWS and instance.pk is not None and not bumped_explicitly():
+        instance._tracker_old_period_id = (
+            sender.objects.filter(pk=instance.pk).values_list("period_id", flat=True).first()
+        )
+
+
+@receiver(post_save)
+def row_saved(sender, instance, **kwargs):
+    if sender in PERIOD_ROWS and not bumped_explicitly():
+        old_period = instance.__dict__.pop("_tracker_old_period_id", None)
+        bump_versions(instance.user_id, [old_period, instance.period_id])
+
+
+@receiver(post_delete)
+def row_deleted(sender, instance, origin=None, **kwargs):
+    if sender in PERIOD_ROWS and not bumped_explicitly() and not _cascaded(sender, origin):
+        bump_versions(instance.user_id, [instance.period_id])
+        record_tombstones(instance.user_id, KIND_BY_MODEL[sender], [instance.pk])
+
+
+@receiver(post_save, sender=BudgetCategory)
+def category_saved(sender, instance, **kwargs):
+    # Budgets show their category's name in every period.
+    if not bumped_explicitly():
+        bump_versions(instance.user_id, everything=True)
+
+
+@receiver(post_delete, sender=BudgetCategory)
+def category_deleted(sender, instance, origin=None, **kwargs):
+    if not bumped_explicitly() and not _cascaded(sender, origin):
+        bump_versions(instance.user_id, everything=True)
+        record_tombstones(instance.user_id, "categories", [instance.pk])
+
+
+# Permission flags that access tokens carry as claims (tracker.auth); changing one revokes them.
+PRIVILEGE_FIELDS = ("is_staff", "is_superuser")
+
+
+@receiver(pre_save, sender=get_user_model())
+def user_saving(sender, instance, update_fields=None, **kwargs):
+    """Remember the permission flags a save may change (logins save last_login only: no query)."""
+    if instance.pk is None or (update_fields is not None and not set(PRIVILEGE_FIELDS) & set(update_fields)):
+        return
+    instance._tracker_old_privileges = (
+        sender.objects.filter(pk=instance.pk).values_list(*PRIVILEGE_FIELDS).first()
+    )
+
+
+@receiver(post_save, sender=get_user_model())
+def user_saved(sender, instance, created=False, **kwargs):
+    """
+    A password change, a deactivation or a change of staff/superuser status revokes the user's
+    JWTs (see tracker.auth), so a demoted admin loses staff access at once.
+    set_password() leaves the raw password on the instance until save() returns, while the
+    hash upgrade done by check_password() clears it first, so rehashing on login does not log
+    anyone out.
+    """
+    old_privileges = instance.__dict__.pop("_tracker_old_privileges", None)
+    if created:
+        return
+    privileges = tuple(getattr(instance, name) for name in PRIVILEGE_FIELDS)
+    if (
+        not instance.is_active
+        or getattr(instance, "_password", None) is not None
+        or (old_privileges is not None and tuple(old_privileges) != privileges)
+    ):
+        revoke_tokens(instance)
+
+
+@receiver(connection_created)
+def connection_opened(sender, connection, **kwargs):
+    """Request metrics count queries on every connection, whichever thread opened it."""
+    metrics.count_queries(connection)
@@ -0,0 +1,78 @@
+from decimal import Decimal
+
+from django.db.models import Count, DecimalField, F, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+from .models import Income, Budget, DailyHouseSpending, MiscellaneousCost
+
+ZERO = Decimal("0")
+MONEY = DecimalField(max_digits=14, decimal_places=2)
+
+# remaining_for_day < 0, i.e. carryover + fixed_daily_limit - spent_amount < 0 (missing carryover counts as 0)
+OVER_LIMIT = (
+    Q(carryover__lt=F("spent_amount") - F("fixed_daily_limit"))
+    | Q(carryover__isnull=True, spent_amount__gt=F("fixed_daily_limit"))
+)
+
+# Columns shared by raw_totals() and PeriodRollup
+TOTAL_FIELDS = (
+    "income_total", "budgets_allocated", "budgets_paid", "misc_cost_total",
+    "spending_total", "daily_limit_total", "days_recorded", "days_over_limit",
+)
+
+
+def _total(expression, **extra):
+    return Coalesce(Sum(expression, **extra), Value(ZERO), output_field=MONEY)
+
+
+def raw_totals(period):
+    """
+    Totals for one period straight from the row tables, one aggregate query per table.
+    Keys match the PeriodRollup columns.
+    """
+    incomes = Income.objects.filter(period=period).aggregate(total=_total("amount"))
+    budgets = Budget.objects.filter(period=period).aggregate(
+        allocated=_total("amount_allocated"),
+        paid=_total("amount_allocated", filter=Q(status="paid")),
+    )
+    misc = MiscellaneousCost.objects.filter(period=period).aggregate(total=_total("amount"))
+    spendings = DailyHouseSpending.objects.filter(period=period).aggregate(
+        spent=_total("spent_amount"),
+        limit=_total("fixed_daily_limit"),
+        days=Count("id"),
+        days_over_limit=Count("id", filter=OVER_LIMIT),
+    )
+    return {
+        "income_total": incomes["total"],
+        "budgets_allocated": budgets["allocated"],
+        "budgets_paid": budgets["paid"],
+        "misc_cost_total": misc["total"],
+        "spending_total": spendings["spent"],
+        "daily_limit_total": spendings["limit"],
+        "days_recorded": spendings["days"],
+        "days_over_limit": spendings["days_over_limit"],
+    }
+
+
+def period_summary(period_id, totals):
+    """
+    Shape totals (a PeriodRollup or a raw_totals() dict) into the summary payload.
+    `final_carryover` is what is left after the last recorded day, i.e. the running
+    sum of (fixed_daily_limit - spent_amount) over the whole period.
+    """
+    if not isinstance(totals, dict):
+        totals = {name: getattr(totals, name) for name in TOTAL_FIELDS}
+    return {
+        "period": period_id,
+        "income_total": totals["income_total"],
+        "budgets_allocated": totals["budgets_allocated"],
+        "budgets_paid": totals["budgets_paid"],
+        "budgets_unpaid": totals["budgets_allocated"] - totals["budgets_paid"],
+        "left_after_budgets": totals["income_total"] - totals["budgets_allocated"],
+        "misc_cost_total": totals["misc_cost_total"],
+        "spending_total": totals["spending_total"],
+        "final_carryover": totals["daily_limit_total"] - totals["spending_total"],
+        "days_recorded": totals["days_recorded"],
+        "days_over_limit": totals["days_over_limit"],
+    }
+
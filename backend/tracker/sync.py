@@ -0,0 +1,150 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import (
+    Period, Income, Budget, BudgetCategory, DailyHouseSpending, MiscellaneousCost, DataVersion, Tombstone,
+)
+from .serializers import (
+    PeriodSerializer, IncomeSerializer, BudgetSerializer, BudgetCategorySerializer,
+    DailyHouseSpendingSerializer, MiscellaneousCostSerializer,
+)
+from .versions import current_version
+
+# Collection name -> (model, serializer, related objects the serializer reads).
+SOURCES = {
+    "periods": (Period, PeriodSerializer, ()),
+    "incomes": (Income, IncomeSerializer, ()),
+    "categories": (BudgetCategory, BudgetCategorySerializer, ()),
+    "budgets": (Budget, BudgetSerializer, ("category",)),
+    "daily_house_spendings": (DailyHouseSpending, DailyHouseSpendingSerializer, ()),
+    "misc_costs": (MiscellaneousCost, MiscellaneousCostSerializer, ()),
+}
+KIND_BY_MODEL = {model: kind for kind, (model, _, _) in SOURCES.items()}
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+KINDS = list(SOURCES)
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class Cursor(NamedTuple):
+    """
+    A sync sends the rows whose change_seq is in (since, upto]: upto is the user's change
+    counter when the sync started (None until then) and since is -1 for a full sync. Rows are
+    paged collection by collection in (change_seq, id) order; kind, seq and id locate the last
+    row sent (id 0: none yet in that collection). issued is when the sync started, checked against the tombstone retention.
+    """
+    since: int
+    upto: Optional[int]
+    issued: datetime
+    kind: int = 0
+    seq: int = 0
+    id: int = 0
+
+
+def _micros(moment):
+    return (moment - _EPOCH) // timedelta(microseconds=1)
+
+
+def encode_cursor(cursor):
+    """Opaque to clients: "upto.issued" once a sync is complete, all fields while paging."""
+    if cursor.since == cursor.upto:
+        return f"{cursor.upto}.{_micros(cursor.issued)}"
+    return ".".join(map(str, (cursor.since, cursor.upto, _micros(cursor.issued), cursor.kind, cursor.seq, cursor.id)))
+
+
+def decode_cursor(cursor):
+    try:
+        values = [int(value) for value in cursor.split(".")]
+    except (AttributeError, ValueError):
+        raise InvalidCursor("since must be a cursor returned by a previous sync.")
+    if len(values) == 1 and values[0] >= 0:
+        # A timestamp cursor from before change numbers: too old to trust, resync.
+        return Cursor(since=-1, upto=None, issued=_EPOCH)
+    if len(values) == 2 and min(values) >= 0:
+        since, issued = values
+        return Cursor(since=since, upto=None, issued=_EPOCH + timedelta(microseconds=issued))
+    if len(values) == 6 and values[0] >= -1 and min(values[1:]) >= 0 and values[3] < len(KINDS):
+        since, upto, issued, kind, seq, row_id = values
+        if since <= upto:
+            return Cursor(since, upto, _EPOCH + timedelta(microseconds=issued), kind, seq, row_id)
+    raise InvalidCursor("since must be a cursor returned by a previous sync.")
+
+
+def record_tombstones(user, kind, ids):
+    """Call inside the delete's transaction."""
+    change_seq = DataVersion.objects.next_change(getattr(user, "pk", user))
+    Tombstone.objects.bulk_create(
+        [Tombstone(user_id=getattr(user, "pk", user), kind=kind, object_id=pk, change_seq=change_seq) for pk in ids]
+    )
+
+
+def _page(user, cursor, page_size, context):
+    """Rows of the page starting after `cursor`'s position, and the position after them (None at the end)."""
+    changes, remaining = {kind: [] for kind in KINDS}, page_size
+    for index in range(cursor.kind, len(KINDS)):
+        kind = KINDS[index]
+        model, serializer_class, related = SOURCES[kind]
+        qs = model.objects.filter(user=user, change_seq__gt=cursor.since, change_seq__lte=cursor.upto)
+        if index == cursor.kind and cursor.id:
+            qs = qs.filter(Q(change_seq__gt=cursor.seq) | Q(change_seq=cursor.seq, id__gt=cursor.id))
+        rows = list(qs.select_related(*related).order_by("change_seq", "id")[:remaining + 1])
+        full_page = len(rows) > remaining
+        rows = rows[:remaining]
+        changes[kind] = serializer_class(rows, many=True, context=context).data
+        remaining -= len(rows)
+        if full_page:
+            return changes, cursor._replace(kind=index, seq=rows[-1].change_seq, id=rows[-1].id)
+        if not remaining and index + 1 < len(KINDS):
+            return changes, cursor._replace(kind=index + 1, seq=0, id=0)
+    return changes, None
+
+
+def changes_since(user, cursor, context):
+    """
+    One page of the rows of `user` changed since `cursor` (all rows when None) and of the ids
+    deleted since then.
+
+    Every write stamps the rows it changes with the user's change number (next_change), and
+    the counter row stays locked until the write commits, so once the counter reads N every
+    change numbered N or less is visible: a sync sends the changes numbered up to the counter
+    it read first, and the next one starts above that, whatever the clocks or the commit
+    delays. Pages hold at most TRACKER_SYNC_PAGE_SIZE rows; while `more` is true, call again
+    with the returned cursor (changes made meanwhile come with the next sync).
+    A cursor older than the tombstone retention cannot see every delete: `reset` is then true,
+    every row is returned and the client should replace its copy.
+    """
+    now = timezone.now()
+    retention = timedelta(days=getattr(settings, "TRACKER_SYNC_TOMBSTONE_DAYS", 90))
+    page_size = getattr(settings, "TRACKER_SYNC_PAGE_SIZE", 1000)
+    reset = cursor is not None and cursor.issued < now - retention
+    if cursor is None or reset:
+        cursor = Cursor(since=-1, upto=None, issued=now)
+    if cursor.upto is None:
+        cursor = cursor._replace(upto=current_version(user), issued=now)
+
+    deleted = {kind: [] for kind in KINDS}
+    if cursor.since >= 0 and (cursor.kind, cursor.id) == (0, 0):
+        tombstones = (
+            Tombstone.objects.filter(user=user, change_seq__gt=cursor.since, change_seq__lte=cursor.upto)
+            .order_by("change_seq", "id")
+            .values_list("kind", "object_id")
+        )
+        for kind, object_id in tombstones:
+            deleted.setdefault(kind, []).append(object_id)
+
+    changes, position = _page(user, cursor, page_size, context)
+    return {
+        "cursor": encode_cursor(position or Cursor(cursor.upto, cursor.upto, cursor.issued)),
+        "full": cursor.since < 0,
+        "reset": reset,
+        "more": position is not None,
+        "changes": changes,
+        "deleted": deleted,
+    }
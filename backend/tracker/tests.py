@@ -1,3 +1,1482 @@
-from django.test import TestCase
+import csv
+import json
+import os
+import random
+import runpy
+import tempfile
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
 
-# Create your tests here.
+from io import StringIO
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.http import HttpResponse
+from asgiref.sync import sync_to_async
+from django.test import AsyncRequestFactory, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from config.database import databases, sqlite_database
+from config.warmup import warm_up
+
+from . import metrics
+from .async_views import AsyncReadView, async_urlpatterns
+from .auth import TrackerTokenObtainPairSerializer
+from .carryover import (
+    annotate_carryovers, find_drift, rectify_from, rectify_period, running_carryovers,
+)
+from .hashers import TunedPBKDF2PasswordHasher
+from .models import (
+    Period, Income, Budget, BudgetCategory, DailyHouseSpending, MiscellaneousCost, PeriodRollup, Tombstone,
+)
+from .rollups import rebuild_rollup
+from .routers import STICKY_COOKIE, PrimaryReplicaRouter, ReplicaStickinessMiddleware, use_primary
+from .serializers import PeriodSummarySerializer
+from .summary import period_summary, raw_totals
+from .urls import router
+from .versions import bump_versions
+from .views import DashboardView
+
+User = get_user_model()
+
+
+class TrackerTestCase(TestCase):
+    """Shared fixtures: one user with one authenticated client and a 60-day period."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="alice", password="secret123")
+        cls.period = Period.objects.create(
+            user=cls.user,
+            name="Autumn",
+            start_date=date(2025, 9, 1),
+            end_date=date(2025, 10, 30),
+        )
+
+    def setUp(self):
+        # Token versions and responses are cached per user id, and ids are reused between tests.
+        caches["tracker"].clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def add_spending(self, day, spent, limit=Decimal("100"), period=None):
+        period = period or self.period
+        return DailyHouseSpending.objects.create(
+            user=self.user,
+            period=period,
+            date=period.start_date + timedelta(days=day),
+            spent_amount=Decimal(spent),
+            fixed_daily_limit=Decimal(limit),
+        )
+
+    def stored_carryovers(self, period=None):
+        return list(
+            DailyHouseSpending.objects
+            .filter(user=self.user, period=period or self.period)
+            .order_by("date", "id")
+            .values_list("id", "carryover")
+        )
+
+
+class IncrementalCarryoverTests(TrackerTestCase):
+    def random_amount(self, rng):
+        return Decimal(rng.randint(0, 25000)) / 100
+
+    def apply_random_change(self, rng, rows_by_day):
+        """Mutate one row directly (as a view would) and return (since, through)."""
+        free_days = [d for d in range(60) if d not in rows_by_day]
+        op = rng.choice(["create", "update", "move", "delete"] if rows_by_day else ["create"])
+        if op == "create" and free_days:
+            day = rng.choice(free_days)
+            row = self.add_spending(day, self.random_amount(rng), self.random_amount(rng))
+            rows_by_day[day] = row
+            return row.date, row.date
+        if op == "delete" or (op == "create" and not free_days):
+            day = rng.choice(list(rows_by_day))
+            row = rows_by_day.pop(day)
+            row.delete()
+            return row.date, row.date
+        day = rng.choice(list(rows_by_day))
+        row = rows_by_day[day]
+        old_date = row.date
+        if op == "move" and free_days:
+            new_day = rng.choice(free_days)
+            row.date = self.period.start_date + timedelta(days=new_day)
+            rows_by_day[new_day] = rows_by_day.pop(day)
+        else:
+            row.spent_amount = self.random_amount(rng)
+            if rng.random() < 0.3:
+                row.fixed_daily_limit = self.random_amount(rng)
+        row.save()
+        return min(old_date, row.date), max(old_date, row.date)
+
+    def test_incremental_matches_full_walk(self):
+        for engine in ("python", "window"):
+            for seed in range(30):
+                rng = random.Random(seed)
+                DailyHouseSpending.objects.all().delete()
+                rows_by_day = {}
+                for _ in range(rng.randint(1, 40)):
+                    since, through = self.apply_random_change(rng, rows_by_day)
+                    rectify_from(
+                        self.period, self.user, since=since, through=through,
+                        chunk_size=7, engine=engine,
+                    )
+                    incremental = self.stored_carryovers()
+                    rectify_period(self.period, self.user, engine="python")
+                    self.assertEqual(incremental, self.stored_carryovers(), f"{engine} seed={seed}")
+
+    def test_stops_once_stored_carryover_matches(self):
+        for day in range(10):
+            self.add_spending(day, "100")
+        rectify_period(self.period, self.user)
+        row = DailyHouseSpending.objects.get(user=self.user, date=self.period.start_date + timedelta(days=4))
+        row.spent_amount = Decimal("80")
+        row.save()
+        written = rectify_from(self.period, self.user, since=row.date, engine="python")
+        self.assertEqual(written, 5)
+
+        # A change that keeps the day's net unchanged leaves later rows untouched.
+        row.spent_amount = Decimal("70")
+        row.fixed_daily_limit = Decimal("90")
+        row.save()
+        written = rectify_from(self.period, self.user, since=row.date, engine="python")
+        self.assertEqual(written, 0)
+
+
+class WindowCarryoverTests(TrackerTestCase):
+    def setUp(self):
+        super().setUp()
+        rng = random.Random(7)
+        for day in rng.sample(range(60), 25):
+            self.add_spending(day, Decimal(rng.randint(0, 20000)) / 100, Decimal(rng.randint(0, 20000)) / 100)
+
+    def test_annotation_matches_python_walk(self):
+        qs = DailyHouseSpending.objects.filter(user=self.user, period=self.period).order_by("date", "id")
+        expected = [(r.id, r.carryover) for r in running_carryovers(list(qs))]
+        annotated = list(annotate_carryovers(qs).values_list("id", "running_carryover"))
+        self.assertEqual(annotated, expected)
+
+    def test_window_rectification_matches_python_walk(self):
+        rectify_period(self.period, self.user, engine="python")
+        expected = self.stored_carryovers()
+        DailyHouseSpending.objects.update(carryover=None)
+        self.assertEqual(rectify_period(self.period, self.user, engine="window"), 25)
+        self.assertEqual(self.stored_carryovers(), expected)
+        self.assertEqual(rectify_period(self.period, self.user, engine="window"), 0)
+
+    def test_auto_walks_incrementally_and_windows_whole_periods(self):
+        row = DailyHouseSpending.objects.order_by("date").last()
+        with mock.patch("tracker.carryover._rectify_with_window", return_value=0) as window:
+            rectify_from(self.period, self.user, since=row.date)
+            window.assert_not_called()
+            rectify_period(self.period, self.user)
+            window.assert_called_once_with(self.period, self.user)
+
+    def test_window_from_a_date_reads_only_the_rows_after_it(self):
+        rectify_period(self.period, self.user, engine="python")
+        ids = [i for i, _ in self.stored_carryovers()]
+        expected = self.stored_carryovers()
+        DailyHouseSpending.objects.filter(id__in=ids[:3] + ids[20:]).update(carryover=Decimal("1.23"))
+        since = DailyHouseSpending.objects.get(id=ids[10]).date
+        self.assertEqual(rectify_from(self.period, self.user, since=since, engine="window"), 5)
+        stored = self.stored_carryovers()
+        self.assertEqual(stored[3:], expected[3:])
+        self.assertEqual({c for _, c in stored[:3]}, {Decimal("1.23")})
+
+    def test_find_drift_agrees_across_engines(self):
+        rectify_period(self.period, self.user)
+        ids = [i for i, _ in self.stored_carryovers()]
+        DailyHouseSpending.objects.filter(id__in=ids[3:5]).update(carryover=Decimal("1.23"))
+        for engine in ("python", "window"):
+            with self.settings(TRACKER_CARRYOVER_ENGINE=engine):
+                self.assertEqual(find_drift(self.period, self.user), ids[3:5])
+
+
+class DailyHouseSpendingWriteTests(TrackerTestCase):
+    url = "/api/daily-house-spendings/"
+
+    def test_create_update_delete_keep_carryovers_consistent(self):
+        for day, spent in [(0, "90"), (1, "120"), (3, "50")]:
+            res = self.client.post(self.url, {
+                "date": str(self.period.start_date + timedelta(days=day)),
+                "period": self.period.id,
+                "spent_amount": spent,
+                "fixed_daily_limit": "100",
+            })
+            self.assertEqual(res.status_code, 201, res.data)
+        self.assertEqual(
+            [c for _, c in self.stored_carryovers()],
+            [Decimal("0"), Decimal("10"), Decimal("-10")],
+        )
+
+        middle = DailyHouseSpending.objects.get(date=self.period.start_date + timedelta(days=1))
+        res = self.client.patch(f"{self.url}{middle.id}/", {"date": str(self.period.start_date + timedelta(days=5))})
+        self.assertEqual(res.status_code, 200, res.data)
+        self.assertEqual(
+            [c for _, c in self.stored_carryovers()],
+            [Decimal("0"), Decimal("10"), Decimal("60")],
+        )
+
+        first = DailyHouseSpending.objects.get(date=self.period.start_date)
+        res = self.client.delete(f"{self.url}{first.id}/")
+        self.assertEqual(res.status_code, 204)
+        self.assertEqual(
+            [c for _, c in self.stored_carryovers()],
+            [Decimal("0"), Decimal("50")],
+        )
+
+    def test_moving_a_row_to_another_period_rectifies_both(self):
+        other = Period.objects.create(
+            user=self.user, name="Winter",
+            start_date=date(2025, 11, 1), end_date=date(2025, 11, 30),
+        )
+        first = self.add_spending(0, "40")
+        self.add_spending(1, "100")
+        self.add_spending(0, "70", period=other)
+        rectify_period(self.period, self.user)
+        rectify_period(other, self.user)
+
+        res = self.client.patch(f"{self.url}{first.id}/", {"period": other.id, "date": "2025-11-02"})
+        self.assertEqual(res.status_code, 200, res.data)
+        self.assertEqual([c for _, c in self.stored_carryovers()], [Decimal("0")])
+        self.assertEqual([c for _, c in self.stored_carryovers(other)], [Decimal("0"), Decimal("30")])
+
+
+class DailyHouseSpendingReadTests(TrackerTestCase):
+    url = "/api/daily-house-spendings/"
+
+    def setUp(self):
+        super().setUp()
+        for day, spent in [(0, "90"), (1, "120"), (2, "50")]:
+            self.add_spending(day, spent)
+        rectify_period(self.period, self.user)
+
+    def test_list_serves_stored_carryovers_in_date_order(self):
+        res = self.client.get(self.url, {"period": self.period.id})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([r["carryover"] for r in res.data], ["0.00", "10.00", "-10.00"])
+        self.assertEqual([r["remaining_for_day"] for r in res.data], ["10.00", "-10.00", "40.00"])
+
+    def test_retrieve_reads_a_single_row(self):
+        row = DailyHouseSpending.objects.get(date=self.period.start_date + timedelta(days=2))
+        with self.assertNumQueries(2):  # ETag version lookup + the row
+            res = self.client.get(f"{self.url}{row.id}/")
+        self.assertEqual(res.data["carryover"], "-10.00")
+
+    def test_check_carryovers_detects_and_repairs_drift(self):
+        DailyHouseSpending.objects.filter(date=self.period.start_date + timedelta(days=1)).update(carryover=Decimal("7"))
+        out = StringIO()
+        call_command("check_carryovers", stdout=out)
+        self.assertIn("1 drifted row(s)", out.getvalue())
+        self.assertEqual(DailyHouseSpending.objects.filter(carryover=Decimal("7")).count(), 1)
+
+        call_command("check_carryovers", "--repair", "--sample", "5", stdout=StringIO())
+        self.assertEqual(
+            [c for _, c in self.stored_carryovers()],
+            [Decimal("0"), Decimal("10"), Decimal("-10")],
+        )
+
+    @override_settings(TRACKER_CARRYOVER_SAMPLE_RATE=1)
+    def test_sampled_list_repairs_drift(self):
+        DailyHouseSpending.objects.filter(date=self.period.start_date).update(carryover=None)
+        with self.assertLogs("tracker.views", level="WARNING"):
+            res = self.client.get(self.url, {"period": self.period.id})
+        self.assertEqual(res.data[0]["carryover"], "0.00")
+        # The repair is taken into the ETag: the repaired body is what it validates.
+        again = self.client.get(self.url, {"period": self.period.id}, HTTP_IF_NONE_MATCH=res["ETag"])
+        self.assertEqual(again.status_code, 304)
+
+
+class DailyHouseSpendingBulkTests(TrackerTestCase):
+    url = "/api/daily-house-spendings/bulk/"
+
+    def item(self, day, spent, **extra):
+        return {
+            "date": str(self.period.start_date + timedelta(days=day)),
+            "period": self.period.id,
+            "spent_amount": spent,
+            "fixed_daily_limit": "100",
+            **extra,
+        }
+
+    def test_upserts_valid_items_and_reports_invalid_ones(self):
+        self.add_spending(1, "30")
+        res = self.client.post(self.url, [
+            self.item(0, "90"),
+            self.item(1, "120"),               # overwrites the existing day
+            self.item(2, "-5"),                # invalid amount
+            self.item(90, "10"),               # outside the period
+            self.item(0, "10"),                # duplicate within the batch
+            self.item(3, "50"),
+        ], format="json")
+        self.assertEqual(res.status_code, 201, res.data)
+        self.assertEqual([e["index"] for e in res.data["errors"]], [2, 3, 4])
+        self.assertEqual([r["spent_amount"] for r in res.data["results"]], ["90.00", "120.00", "50.00"])
+        self.assertEqual([r["carryover"] for r in res.data["results"]], ["0.00", "10.00", "-10.00"])
+        self.assertEqual(DailyHouseSpending.objects.count(), 3)
+        self.assertEqual(find_drift(self.period, self.user), [])
+        self.period.refresh_from_db()
+        self.assertEqual(self.period.default_daily_limit, Decimal("100"))
+
+    def test_rejects_batch_without_valid_items(self):
+        res = self.client.post(self.url, [self.item(0, "-1")], format="json")
+        self.assertEqual(res.status_code, 400)
+        res = self.client.post(self.url, self.item(0, "1"), format="json")
+        self.assertEqual(res.status_code, 400)
+
+    def test_cannot_write_into_another_users_period(self):
+        bob = User.objects.create_user(username="bob", password="secret123")
+        self.client.force_authenticate(bob)
+        res = self.client.post(self.url, [self.item(0, "10")], format="json")
+        self.assertEqual(res.status_code, 400)
+        self.assertFalse(DailyHouseSpending.objects.exists())
+
+
+class PeriodSummaryTests(TrackerTestCase):
+    @override_settings(TRACKER_RESPONSE_CACHE_ENABLED=False)  # the second read must reach the view
+    def test_summary_totals(self):
+        Income.objects.create(user=self.user, period=self.period, source="Salary", amount="3000", date_received=self.period.start_date)
+        Income.objects.create(user=self.user, period=self.period, source="Bonus", amount="500.50", date_received=self.period.start_date)
+        rent = BudgetCategory.objects.create(user=self.user, name="Rent")
+        Budget.objects.create(user=self.user, period=self.period, category=rent, amount_allocated="1200", status="paid")
+        Budget.objects.create(user=self.user, period=self.period, category=rent, amount_allocated="300")
+        MiscellaneousCost.objects.create(user=self.user, period=self.period, title="Gift", amount="45.25")
+        for day, spent in [(0, "90"), (1, "150"), (2, "120"), (3, "20")]:
+            self.add_spending(day, spent)
+        rectify_period(self.period, self.user)
+
+        # Rows written outside the viewsets: the first read builds the rollup.
+        self.client.get(f"/api/periods/{self.period.id}/summary/")
+        with self.assertNumQueries(2):  # ETag version lookup + period joined with its rollup
+            res = self.client.get(f"/api/periods/{self.period.id}/summary/")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data, {
+            "period": self.period.id,
+            "income_total": "3500.50",
+            "budgets_allocated": "1500.00",
+            "budgets_paid": "1200.00",
+            "budgets_unpaid": "300.00",
+            "left_after_budgets": "2000.50",
+            "misc_cost_total": "45.25",
+            "spending_total": "380.00",
+            "final_carryover": "20.00",
+            "days_recorded": 4,
+            "days_over_limit": 2,
+        })
+
+    def test_empty_period_and_ownership(self):
+        res = self.client.get(f"/api/periods/{self.period.id}/summary/")
+        self.assertEqual(res.data["income_total"], "0.00")
+        self.assertEqual(res.data["days_over_limit"], 0)
+        self.client.force_authenticate(User.objects.create_user(username="bob", password="secret123"))
+        res = self.client.get(f"/api/periods/{self.period.id}/summary/")
+        self.assertEqual(res.status_code, 404)
+
+
+class ListReaderParityTests(TrackerTestCase):
+    """The values_list() readers must render lists byte-for-byte like the serializers."""
+    endpoints = (
+        "/api/periods/", "/api/incomes/", "/api/categories/", "/api/budgets/",
+        "/api/daily-house-spendings/", "/api/misc-costs/",
+    )
+
+    def setUp(self):
+        super().setUp()
+        Period.objects.create(user=self.user, name="Bare", start_date=date(2025, 11, 1), end_date=date(2025, 11, 30))
+        Period.objects.filter(pk=self.period.pk).update(default_daily_limit=Decimal("87.5"), notes="Notes", total_savings=Decimal("12"))
+        self.add_spending(0, "150")
+        self.add_spending(1, "30.05", limit="99.99")
+        self.add_spending(2, "0")
+        DailyHouseSpending.objects.filter(date=self.period.start_date + timedelta(days=2)).update(carryover=None)
+        Income.objects.create(user=self.user, period=self.period, source="Salary", amount="1000.1", date_received=self.period.start_date)
+        category = BudgetCategory.objects.create(user=self.user, name="Rent")
+        Budget.objects.create(user=self.user, period=self.period, category=category, amount_allocated="400", status="paid")
+        Budget.objects.create(user=self.user, period=self.period, category=category, amount_allocated="0.5", due_date=date(2025, 9, 9))
+        MiscellaneousCost.objects.create(user=self.user, period=self.period, title="Fix", amount="7")
+
+    def assertSameOutput(self, url, params=None):
+        res = self.client.get(url, params)
+        with override_settings(TRACKER_FAST_LISTS=False):
+            expected = self.client.get(url, params)
+        self.assertEqual(res.status_code, 200, url)
+        self.assertEqual(res.content, expected.content, url)
+
+    def test_lists_match_serializers(self):
+        for url in self.endpoints:
+            self.assertSameOutput(url)
+            self.assertSameOutput(url, {"period": self.period.id})
+
+    def test_pages_match_serializers(self):
+        for url in self.endpoints:
+            first = self.client.get(url, {"page_size": 2})
+            self.assertSameOutput(url, {"page_size": 2})
+            if first.data["next"]:
+                cursor = parse_qs(urlparse(first.data["next"]).query)["cursor"][0]
+                self.assertSameOutput(url, {"page_size": 2, "cursor": cursor})
+
+    def test_budget_category_comes_from_the_same_query(self):
+        with self.assertNumQueries(2):  # version lookup + the values_list() query
+            res = self.client.get("/api/budgets/")
+        self.assertEqual(res.data[0]["category"], {"id": Budget.objects.first().category_id, "name": "Rent"})
+
+
+class SparseFieldsTests(TrackerTestCase):
+    url = "/api/daily-house-spendings/"
+
+    def setUp(self):
+        super().setUp()
+        self.add_spending(0, "150")
+        self.add_spending(1, "30")
+        self.add_spending(2, "10")
+
+    def get_with_sql(self, url, params):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(url, params)
+        self.assertEqual(res.status_code, 200, res.content)
+        return res, queries.captured_queries[-1]["sql"]
+
+    @override_settings(TRACKER_RESPONSE_CACHE_ENABLED=False)  # both paths answer the same URL
+    def test_fields_narrow_the_payload_and_the_select(self):
+        for fast in (True, False):
+            with self.subTest(fast=fast), override_settings(TRACKER_FAST_LISTS=fast):
+                res, sql = self.get_with_sql(self.url, {"fields": "spent_amount,id,date"})
+                self.assertEqual(json.loads(res.content)[0], {"id": res.data[0]["id"], "date": "2025-09-01", "spent_amount": "150.00"})
+                self.assertNotIn("carryover", sql)
+                self.assertNotIn("fixed_daily_limit", sql)
+
+    def test_exclude_drops_fields_and_joins(self):
+        category = BudgetCategory.objects.create(user=self.user, name="Rent")
+        budget = Budget.objects.create(user=self.user, period=self.period, category=category, amount_allocated="400")
+        for url in ("/api/budgets/", f"/api/budgets/{budget.id}/"):
+            res, sql = self.get_with_sql(url, {"exclude": "category,due_date"})
+            data = res.data[0] if isinstance(res.data, list) else res.data
+            self.assertEqual(list(data), ["id", "period", "amount_allocated", "status"])
+            self.assertNotIn("JOIN", sql)
+
+    def test_computed_fields_read_their_columns(self):
+        res = self.client.get(self.url, {"fields": "is_over_limit"})
+        self.assertEqual([row["is_over_limit"] for row in res.data], [True, False, False])
+
+    def test_pages_keep_their_cursor(self):
+        first = self.client.get(self.url, {"fields": "spent_amount", "page_size": 2})
+        self.assertEqual(first.data["results"], [{"spent_amount": "150.00"}, {"spent_amount": "30.00"}])
+        cursor = parse_qs(urlparse(first.data["next"]).query)["cursor"][0]
+        rest = self.client.get(self.url, {"fields": "spent_amount", "page_size": 2, "cursor": cursor})
+        self.assertEqual(rest.data["results"], [{"spent_amount": "10.00"}])
+
+    def test_rejects_unknown_or_empty_field_sets(self):
+        res = self.client.get(self.url, {"fields": "id,nope"})
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("nope", str(res.data["fields"]))
+        self.assertEqual(self.client.get(self.url, {"fields": "id", "exclude": "id"}).status_code, 400)
+
+
+class PeriodRollupTests(TrackerTestCase):
+    def assertRollupMatchesRows(self, period=None):
+        period = period or self.period
+        rollup = PeriodRollup.objects.get(period=period)
+        for name, value in raw_totals(period).items():
+            self.assertEqual(getattr(rollup, name), value, name)
+
+    def test_writes_through_the_api_keep_rollup_in_step(self):
+        PeriodRollup.objects.create(period=self.period)
+        other = self.client.post("/api/periods/", {
+            "name": "Winter", "start_date": "2025-11-01", "end_date": "2025-11-30",
+        }).data["id"]
+        self.assertTrue(PeriodRollup.objects.filter(period_id=other).exists())
+        day = lambda n: str(self.period.start_date + timedelta(days=n))
+
+        income = self.client.post("/api/incomes/", {
+            "period": self.period.id, "source": "Salary", "amount": "3000", "date_received": day(0),
+        }).data["id"]
+        self.client.patch(f"/api/incomes/{income}/", {"amount": "3100"})
+        category = self.client.post("/api/categories/", {"name": "Rent"}).data["id"]
+        budget = self.client.post("/api/budgets/", {
+            "period": self.period.id, "category_id": category, "amount_allocated": "1200",
+        }).data["id"]
+        self.client.patch(f"/api/budgets/{budget}/", {"status": "paid"})
+        self.client.post("/api/budgets/", {
+            "period": self.period.id, "category_id": category, "amount_allocated": "99",
+        })
+        cost = self.client.post("/api/misc-costs/", {
+            "period": self.period.id, "title": "Gift", "amount": "45",
+        }).data["id"]
+        for n, spent in [(0, "90"), (1, "150"), (2, "120")]:
+            self.client.post("/api/daily-house-spendings/", {
+                "period": self.period.id, "date": day(n), "spent_amount": spent, "fixed_daily_limit": "100",
+            })
+        self.assertRollupMatchesRows()
+        self.assertEqual(PeriodRollup.objects.get(period=self.period).days_over_limit, 2)
+
+        first = DailyHouseSpending.objects.get(date=self.period.start_date)
+        self.client.patch(f"/api/daily-house-spendings/{first.id}/", {"spent_amount": "0"})
+        self.assertRollupMatchesRows()
+        self.client.patch(f"/api/daily-house-spendings/{first.id}/", {"period": other, "date": "2025-11-03"})
+        self.client.delete(f"/api/misc-costs/{cost}/")
+        self.client.delete(f"/api/budgets/{budget}/")
+        self.client.patch(f"/api/incomes/{income}/", {"period": other, "date_received": "2025-11-02"})
+        self.client.post("/api/daily-house-spendings/bulk/", [
+            {"period": self.period.id, "date": day(1), "spent_amount": "10", "fixed_daily_limit": "100"},
+        ], format="json")
+        self.assertEqual(Income.objects.get(pk=income).period_id, other)
+        self.assertEqual(DailyHouseSpending.objects.get(pk=first.id).period_id, other)
+        self.assertRollupMatchesRows()
+        self.assertRollupMatchesRows(Period.objects.get(pk=other))
+
+    def test_deleting_a_category_drops_its_budgets_from_the_summary(self):
+        PeriodRollup.objects.create(period=self.period)
+        category = self.client.post("/api/categories/", {"name": "Rent"}).data["id"]
+        budget = self.client.post("/api/budgets/", {
+            "period": self.period.id, "category_id": category, "amount_allocated": "1200",
+        }).data["id"]
+        self.client.patch(f"/api/budgets/{budget}/", {"status": "paid"})
+        self.assertEqual(self.client.delete(f"/api/categories/{category}/").status_code, 204)
+
+        summary = self.client.get(f"/api/periods/{self.period.id}/summary/").data
+        expected = PeriodSummarySerializer(period_summary(self.period.pk, rebuild_rollup(self.period))).data
+        self.assertEqual(summary, expected)
+        self.assertEqual(summary["budgets_allocated"], "0.00")
+        self.assertEqual(self.client.get("/api/dashboard/", {"period": self.period.id}).data["summary"], expected)
+
+    def test_rebuild_rollups_command(self):
+        Income.objects.create(user=self.user, period=self.period, source="Salary", amount="10", date_received=self.period.start_date)
+        call_command("rebuild_rollups", stdout=StringIO())
+        self.assertRollupMatchesRows()
+
+
+class CursorPaginationTests(TrackerTestCase):
+    def walk(self, url, **params):
+        pages, res = [], self.client.get(url, params)
+        while True:
+            self.assertEqual(res.status_code, 200)
+            pages.append(res.data["results"])
+            if not res.data["next"]:
+                return pages
+            res = self.client.get(res.data["next"])
+
+    def test_lists_are_unpaginated_unless_requested(self):
+        MiscellaneousCost.objects.create(user=self.user, period=self.period, title="Gift", amount="5")
+        res = self.client.get("/api/misc-costs/")
+        self.assertIsInstance(res.data, list)
+
+    def test_daily_spending_pages_keep_stored_carryovers(self):
+        for day in range(7):
+            self.add_spending(day, str(80 + 10 * day))
+        rectify_period(self.period, self.user)
+        full = self.client.get("/api/daily-house-spendings/", {"period": self.period.id}).data
+
+        pages = self.walk("/api/daily-house-spendings/", period=self.period.id, page_size=3)
+        self.assertEqual([len(p) for p in pages], [3, 3, 1])
+        paged = [row for page in pages for row in page]
+        self.assertEqual(paged, full)
+
+    def test_page_size_is_capped(self):
+        for n in range(3):
+            Income.objects.create(user=self.user, period=self.period, source=f"S{n}", amount="1", date_received=self.period.start_date)
+        with self.settings(TRACKER_MAX_PAGE_SIZE=2):
+            pages = self.walk("/api/incomes/", page_size=100)
+        self.assertEqual([len(p) for p in pages], [2, 1])
+
+
+class QueryCountTests(TrackerTestCase):
+    """
+    Pins the number of SQL queries per endpoint so N+1 regressions fail the build.
+    Lists are checked at two sizes to prove the count does not grow with the rows.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        PeriodRollup.objects.create(period=cls.period)
+        bump_versions(cls.user, [cls.period])
+        cls.category = BudgetCategory.objects.create(user=cls.user, name="Rent")
+
+    def seed(self, n):
+        for i in range(n):
+            Income.objects.create(user=self.user, period=self.period, source="Salary", amount="1", date_received=self.period.start_date)
+            Budget.objects.create(user=self.user, period=self.period, category=BudgetCategory.objects.create(user=self.user, name=f"C{i}"), amount_allocated="1")
+            MiscellaneousCost.objects.create(user=self.user, period=self.period, title="Gift", amount="1")
+            self.add_spending(len(self.stored_carryovers()), "1")
+
+    def test_list_endpoints_use_two_queries_regardless_of_size(self):
+        urls = ["/api/periods/", "/api/incomes/", "/api/budgets/", "/api/categories/",
+                "/api/misc-costs/", "/api/daily-house-spendings/"]
+        for n in (1, 10):
+            self.seed(n)
+            for url in urls:
+                # The ETag's version lookup, then the list itself.
+                with self.subTest(url=url, rows=n), self.assertNumQueries(2):
+                    self.assertEqual(self.client.get(url, {"period": self.period.id}).status_code, 200)
+
+    @override_settings(TRACKER_FAST_LISTS=False, TRACKER_RESPONSE_CACHE_ENABLED=False)
+    def test_serializer_lists_load_only_the_rendered_columns(self):
+        self.seed(3)
+        for url in ("/api/periods/", "/api/incomes/", "/api/budgets/", "/api/categories/",
+                    "/api/misc-costs/", "/api/daily-house-spendings/"):
+            with self.subTest(url=url), CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.client.get(url, {"period": self.period.id}).status_code, 200)
+            self.assertEqual(len(queries), 2)
+            sql = queries.captured_queries[-1]["sql"]
+            for column in ("created_at", "updated_at", "change_seq", "user_id"):
+                self.assertNotIn(f'."{column}"', sql.split(" FROM ")[0])
+
+    def test_write_endpoints(self):
+        self.seed(3)
+        income = Income.objects.first()
+        budget = Budget.objects.first()
+        spending = DailyHouseSpending.objects.order_by("date").first()
+        day = lambda n: str(self.period.start_date + timedelta(days=n))
+        cases = [
+            # (expected queries, method, url, payload); every write takes a change number for /api/sync/.
+            (2, "get", f"/api/budgets/{budget.id}/", None),
+            (7, "post", "/api/incomes/", {"period": self.period.id, "source": "Bonus", "amount": "2", "date_received": day(2)}),
+            (7, "patch", f"/api/incomes/{income.id}/", {"amount": "3"}),
+            (8, "post", "/api/budgets/", {"period": self.period.id, "category_id": self.category.id, "amount_allocated": "3"}),
+            (7, "patch", f"/api/budgets/{budget.id}/", {"status": "paid"}),
+            (7, "post", "/api/misc-costs/", {"period": self.period.id, "title": "Gift", "amount": "3"}),
+            # Daily spendings: + the carryover walk (seed row, later rows, change number and update of
+            # the changed ones).
+            (13, "post", "/api/daily-house-spendings/", {"period": self.period.id, "date": day(20), "spent_amount": "3"}),
+            (11, "patch", f"/api/daily-house-spendings/{spending.id}/", {"spent_amount": "7"}),
+            (12, "delete", f"/api/daily-house-spendings/{spending.id}/", None),
+            (8, "delete", f"/api/incomes/{income.id}/", None),
+        ]
+        for expected, method, url, payload in cases:
+            with self.subTest(method=method, url=url), self.assertNumQueries(expected):
+                args = (url, payload) if payload else (url,)
+                res = getattr(self.client, method)(*args)
+            self.assertLess(res.status_code, 300, res.data if hasattr(res, "data") else res)
+
+
+class QueryPlanTests(TrackerTestCase):
+    """
+    Runs EXPLAIN QUERY PLAN on every query the read endpoints issue, so a dropped index or
+    a filter that stops matching one fails the build instead of turning into a table scan.
+    """
+    seed = QueryCountTests.seed
+
+    def plans(self, url, params):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url, params).status_code, 200)
+        with connection.cursor() as cursor:
+            for query in queries.captured_queries:
+                cursor.execute("EXPLAIN QUERY PLAN " + query["sql"])
+                yield query["sql"], [row[-1] for row in cursor.fetchall()]
+
+    def test_read_endpoints_never_scan_a_table(self):
+        self.seed(3)
+        urls = ["/api/periods/", "/api/incomes/", "/api/budgets/", "/api/categories/", "/api/misc-costs/",
+                "/api/daily-house-spendings/", f"/api/periods/{self.period.id}/summary/", "/api/dashboard/", "/api/sync/"]
+        for url in urls:
+            for sql, plan in self.plans(url, {"period": self.period.id}):
+                with self.subTest(url=url, sql=sql):
+                    self.assertFalse([step for step in plan if step.startswith("SCAN")], plan)
+
+    def test_period_lists_page_in_index_order(self):
+        self.seed(3)
+        lists = {"/api/incomes/": "tracker_income", "/api/budgets/": "tracker_budget",
+                 "/api/misc-costs/": "tracker_miscellaneouscost", "/api/daily-house-spendings/": "tracker_dailyhousespending"}
+        for url, table in lists.items():
+            _, plan = list(self.plans(url, {"period": self.period.id, "page_size": 2}))[-1]
+            with self.subTest(url=url):
+                # One index serves both the (user, period) filter and the page order: no sort step.
+                self.assertIn("(user_id=? AND period_id=?)", plan[0])
+                self.assertTrue(plan[0].startswith(f"SEARCH {table} USING INDEX"), plan)
+                self.assertFalse([step for step in plan if "TEMP B-TREE" in step], plan)
+
+
+class ConditionalGetTests(TrackerTestCase):
+    def get(self, url, etag=None, **params):
+        headers = {"HTTP_IF_NONE_MATCH": etag} if etag else {}
+        return self.client.get(url, params, **headers)
+
+    def test_unchanged_list_returns_304_with_a_single_lookup(self):
+        self.add_spending(0, "10")
+        res = self.get("/api/daily-house-spendings/", period=self.period.id)
+        self.assertEqual(res["Cache-Control"], "private, no-cache")
+        with self.assertNumQueries(1):
+            again = self.get("/api/daily-house-spendings/", res["ETag"], period=self.period.id)
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again["ETag"], res["ETag"])
+        self.assertFalse(again.content)
+
+    def test_writes_change_the_etag(self):
+        url = "/api/incomes/"
+        etag = self.get(url, period=self.period.id)["ETag"]
+        created = self.client.post(url, {
+            "period": self.period.id, "source": "Salary", "amount": "5", "date_received": "2025-09-02",
+        })
+        self.assertEqual(created.status_code, 201)
+        res = self.get(url, etag, period=self.period.id)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(res.data), 1)
+
+        # Category renames show up in every period's budget list.
+        category = BudgetCategory.objects.create(user=self.user, name="Rent")
+        Budget.objects.create(user=self.user, period=self.period, category=category, amount_allocated="1")
+        budgets = self.get("/api/budgets/", period=self.period.id)
+        self.client.patch(f"/api/categories/{category.id}/", {"name": "Housing"})
+        res = self.get("/api/budgets/", budgets["ETag"], period=self.period.id)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data[0]["category"]["name"], "Housing")
+
+    def test_etag_depends_on_user_query_and_period(self):
+        url = "/api/daily-house-spendings/"
+        etag = self.get(url, period=self.period.id)["ETag"]
+        self.assertEqual(self.get(url, etag, period=self.period.id, page_size=5).status_code, 200)
+        self.assertEqual(self.get(url, etag).status_code, 200)
+
+        # A write to another period leaves this period's ETag alone.
+        other = Period.objects.create(user=self.user, name="Other", start_date=date(2025, 11, 1), end_date=date(2025, 11, 30))
+        self.client.post(url, {"period": other.id, "date": "2025-11-02", "spent_amount": "5"})
+        self.assertEqual(self.get(url, etag, period=self.period.id).status_code, 304)
+
+        self.client.force_authenticate(User.objects.create_user(username="bob", password="secret123"))
+        self.assertEqual(self.get(url, etag, period=self.period.id).status_code, 200)
+
+
+class DashboardTests(TrackerTestCase):
+    url = "/api/dashboard/"
+
+    def seed(self, n):
+        category = BudgetCategory.objects.create(user=self.user, name=f"C{n}")
+        for i in range(n):
+            Income.objects.create(user=self.user, period=self.period, source="Salary", amount="10", date_received=self.period.start_date)
+            Budget.objects.create(user=self.user, period=self.period, category=category, amount_allocated="2")
+            MiscellaneousCost.objects.create(user=self.user, period=self.period, title="Gift", amount="1")
+        self.add_spending(n, "150")
+        rebuild_rollup(self.period)
+
+    def test_payload_matches_the_individual_endpoints(self):
+        self.seed(2)
+        data = self.client.get(self.url).data
+        self.assertEqual(data["active_period"], self.period.id)
+        self.assertEqual(data["summary"], self.client.get(f"/api/periods/{self.period.id}/summary/").data)
+        for key, url in [("periods", "/api/periods/"), ("categories", "/api/categories/"),
+                         ("incomes", "/api/incomes/"), ("budgets", "/api/budgets/"),
+                         ("misc_costs", "/api/misc-costs/"), ("daily_house_spendings", "/api/daily-house-spendings/")]:
+            with self.subTest(key=key):
+                self.assertEqual(data[key], self.client.get(url, {"period": self.period.id}).data)
+
+    def test_fixed_query_count(self):
+        for n in (1, 8):
+            self.seed(n)
+            # ETag version lookup, periods with rollups, categories and the four collections.
+            with self.subTest(rows=n), self.assertNumQueries(7):
+                self.assertEqual(self.client.get(self.url, {"period": self.period.id}).status_code, 200)
+
+    def test_etag_and_errors(self):
+        res = self.client.get(self.url)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=res["ETag"]).status_code, 304)
+        self.client.post("/api/periods/", {"name": "Winter", "start_date": "2025-11-01", "end_date": "2025-11-30"})
+        fresh = self.client.get(self.url, HTTP_IF_NONE_MATCH=res["ETag"])
+        self.assertEqual(fresh.status_code, 200)
+        self.assertEqual(fresh.data["periods"][-1]["name"], "Winter")
+        self.assertEqual(fresh.data["incomes"], [])
+
+        other = Period.objects.create(user=User.objects.create_user(username="bob", password="secret123"),
+                                      name="Bob's", start_date=date(2025, 9, 1), end_date=date(2025, 9, 30))
+        self.assertEqual(self.client.get(self.url, {"period": other.id}).status_code, 404)
+        self.assertEqual(self.client.get(self.url, {"period": "x"}).status_code, 400)
+
+
+class AsyncReadViewTests(TrackerTestCase):
+    def setUp(self):
+        super().setUp()
+        token = TrackerTokenObtainPairSerializer.get_token(self.user).access_token
+        self.headers = {"authorization": f"Bearer {token}"}
+        self.views = {url.name: url.callback for url in async_urlpatterns(router.urls, DashboardView.as_view())}
+        self.factory = AsyncRequestFactory()
+        self.summary_url = f"/api/periods/{self.period.id}/summary/"
+        Income.objects.create(user=self.user, period=self.period, source="Salary", amount="10", date_received=self.period.start_date)
+        self.add_spending(0, "150")
+        rebuild_rollup(self.period)
+
+    async def call(self, name, url, data=None, method="get", headers=None, **kwargs):
+        request = getattr(self.factory, method)(url, data, headers=self.headers if headers is None else headers)
+        return await self.views[name](request, **kwargs)
+
+    async def test_responses_match_the_drf_views(self):
+        for name, url, kwargs in [
+            ("period-list", "/api/periods/", {}),
+            ("period-summary", self.summary_url, {"pk": self.period.id}),
+            ("dashboard", "/api/dashboard/", {}),
+            ("dashboard", f"/api/dashboard/?period={self.period.id}", {}),
+        ]:
+            with self.subTest(url=url):
+                expected = await sync_to_async(self.client.get)(url)
+                res = await self.call(name, url, **kwargs)
+                self.assertEqual(res.status_code, 200)
+                self.assertFalse(hasattr(res, "data"), "answered by DRF")
+                self.assertEqual(res.content, expected.content)
+                self.assertEqual(res["Content-Type"], expected["Content-Type"])
+                self.assertEqual(res["ETag"], expected["ETag"])
+
+    def test_views_without_get_data_fail_when_routed(self):
+        class Incomplete(AsyncReadView):
+            pass
+
+        with self.assertRaises(TypeError):
+            Incomplete.as_view(DashboardView.as_view())
+
+    async def test_etag_and_shared_response_cache(self):
+        res = await self.call("dashboard", "/api/dashboard/")
+        not_modified = await self.call("dashboard", "/api/dashboard/", headers={**self.headers, "if-none-match": res["ETag"]})
+        self.assertEqual(not_modified.status_code, 304)
+        with self.settings(TRACKER_RESPONSE_CACHE_ENABLED=True):
+            await self.call("period-list", "/api/periods/")
+            drf = await sync_to_async(self.client.get)("/api/periods/")
+        self.assertIn('cache;desc="hit"', drf["Server-Timing"])
+
+    async def test_other_requests_are_handed_to_drf(self):
+        created = await self.call("period-list", "/api/periods/", {
+            "name": "Winter", "start_date": "2025-11-01", "end_date": "2025-11-30",
+        }, method="post")
+        self.assertEqual(created.status_code, 201)
+        sparse = await self.call("period-list", "/api/periods/?fields=name")
+        self.assertEqual([list(row) for row in json.loads(sparse.render().content)], [["name"], ["name"]])
+        self.assertEqual((await self.call("period-list", "/api/periods/", headers={})).status_code, 401)
+        self.assertEqual((await self.call("period-summary", "/api/periods/999/summary/", pk=999)).status_code, 404)
+        self.assertEqual((await self.call("dashboard", "/api/dashboard/?period=x")).status_code, 400)
+
+    async def test_metrics_middleware_counts_async_queries(self):
+        async def get_response(request):
+            await Period.objects.acount()
+            return HttpResponse()
+        response = await metrics.QueryMetricsMiddleware(get_response)(self.factory.get("/api/periods/"))
+        self.assertIn('desc="1 queries"', response["Server-Timing"])
+
+
+class ExportTests(TrackerTestCase):
+    url = "/api/export/"
+
+    def setUp(self):
+        super().setUp()
+        self.add_spending(0, "150")
+        self.add_spending(1, "30")
+        self.add_spending(2, "100", limit="50")
+        Income.objects.create(user=self.user, period=self.period, source="Salary", amount="1000", date_received=self.period.start_date)
+        category = BudgetCategory.objects.create(user=self.user, name="Rent, flat")
+        Budget.objects.create(user=self.user, period=self.period, category=category, amount_allocated="400", status="paid")
+        # Stored carryovers are ignored: the export recomputes them.
+        DailyHouseSpending.objects.update(carryover=Decimal("999"))
+
+    def export(self, **params):
+        res = self.client.get(self.url, params)
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res.streaming)
+        return b"".join(res.streaming_content).decode(), res
+
+    def test_csv(self):
+        body, res = self.export(format="csv")
+        self.assertEqual(res["Content-Disposition"], 'attachment; filename="ledger.csv"')
+        rows = list(csv.DictReader(StringIO(body)))
+        self.assertEqual([r["kind"] for r in rows], ["income", "budget", "daily_spending", "daily_spending", "daily_spending"])
+        self.assertEqual(rows[1]["description"], "Rent, flat")
+        self.assertEqual(rows[1]["status"], "paid")
+        days = rows[2:]
+        self.assertEqual([d["carryover"] for d in days], ["0.00", "-50.00", "20.00"])
+        self.assertEqual([d["remaining"] for d in days], ["-50.00", "20.00", "-30.00"])
+
+    def test_jsonl_for_one_period(self):
+        other = Period.objects.create(user=self.user, name="Other", start_date=date(2025, 11, 1), end_date=date(2025, 11, 30))
+        self.add_spending(0, "5", period=other)
+        body, res = self.export(format="jsonl", period=other.id)
+        lines = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0]["id"], DailyHouseSpending.objects.get(period=other).id)
+        self.assertEqual(lines[0]["period_name"], "Other")
+        self.assertEqual(lines[0]["carryover"], "0.00")
+        self.assertEqual(res["Content-Type"], "application/x-ndjson")
+
+    def test_rejects_bad_format_and_foreign_period(self):
+        self.assertEqual(self.client.get(self.url, {"format": "xml"}).status_code, 400)
+        bob = User.objects.create_user(username="bob", password="secret123")
+        other = Period.objects.create(user=bob, name="Bob's", start_date=date(2025, 9, 1), end_date=date(2025, 9, 30))
+        self.assertEqual(self.client.get(self.url, {"period": other.id}).status_code, 404)
+
+
+class ImportTests(TrackerTestCase):
+    url = "/api/import/"
+
+    def upload(self, text, **data):
+        upload = SimpleUploadedFile("statement.csv", text.encode(), content_type="text/csv")
+        return self.client.post(self.url, {"file": upload, **data}, format="multipart")
+
+    def test_signed_amounts(self):
+        self.add_spending(1, "30")
+        res = self.upload(
+            "Date,Description,Amount\n"
+            "2025-09-01,Salary,\"1,500.00\"\n"
+            "2025-09-01,Groceries,-60\n"
+            "2025-09-01,Bakery,-30\n"
+            "2025-09-02,Groceries,-120\n"   # overwrites the existing day
+            "2025-09-03,Groceries,-50\n"
+        )
+        self.assertEqual(res.status_code, 201, res.data)
+        self.assertEqual(res.data["created"], {"incomes": 1, "misc_costs": 0, "daily_house_spendings": 3})
+        self.assertEqual(res.data["error_count"], 0)
+        days = DailyHouseSpending.objects.filter(period=self.period).order_by("date")
+        self.assertEqual([d.spent_amount for d in days], [Decimal("90"), Decimal("120"), Decimal("50")])
+        self.assertEqual([c for _, c in self.stored_carryovers()], [Decimal("0"), Decimal("10"), Decimal("-10")])
+        self.assertEqual(find_drift(self.period, self.user), [])
+        self.assertEqual(Income.objects.get().amount, Decimal("1500"))
+        rollup = PeriodRollup.objects.get(period=self.period)
+        for name, value in raw_totals(self.period).items():
+            self.assertEqual(getattr(rollup, name), value, name)
+
+    def test_debit_credit_columns_and_kind_column(self):
+        res = self.upload(
+            "date,memo,debit,credit\n2025-09-05,Coffee,4.50,\n2025-09-06,Refund,,10\n",
+            debits="misc_cost",
+        )
+        self.assertEqual(res.status_code, 201, res.data)
+        self.assertEqual(MiscellaneousCost.objects.get().amount, Decimal("4.50"))
+        self.assertEqual(Income.objects.get().source, "Refund")
+
+        res = self.upload("kind,date,description,amount,daily_limit\ndaily_spending,2025-09-07,,25,40\n")
+        self.assertEqual(res.status_code, 201, res.data)
+        day = DailyHouseSpending.objects.get()
+        self.assertEqual((day.spent_amount, day.fixed_daily_limit), (Decimal("25"), Decimal("40")))
+
+    def test_reports_bad_lines_and_keeps_good_ones(self):
+        res = self.upload(
+            "date,description,amount\n"
+            "2025-13-01,Bad date,-5\n"
+            "2025-09-01,No amount,\n"
+            "2024-01-01,Outside every period,-5\n"
+            "\n"
+            "2025-09-01,,10\n"                # incomes need a description
+            "2025-09-01,Groceries,-5\n"
+        )
+        self.assertEqual(res.status_code, 201, res.data)
+        self.assertEqual(res.data["error_count"], 4)
+        self.assertEqual([e["line"] for e in res.data["errors"]], [2, 3, 4, 6])
+        self.assertEqual(DailyHouseSpending.objects.count(), 1)
+
+    def test_reports_amounts_the_columns_cannot_hold(self):
+        res = self.upload(
+            "date,description,amount,daily_limit\n"
+            "2025-09-01,Groceries,NaN,\n"
+            "2025-09-01,Groceries,-Infinity,\n"
+            "2025-09-01,Salary,sNaN,\n"
+            "2025-09-01,Groceries,-123456789012345.123,\n"
+            "2025-09-01,Groceries,-5.125,\n"
+            "2025-09-01,Groceries,-5,1e20\n"
+            "2025-09-02,Groceries,-9999999999.99,\n"
+            "2025-09-02,Groceries,-1,\n"          # the day's total would overflow
+            "2025-09-03,Groceries,-5,\n"
+        )
+        self.assertEqual(res.status_code, 201, res.data)
+        self.assertEqual([e["line"] for e in res.data["errors"]], [2, 3, 4, 5, 6, 7, 9])
+        self.assertEqual(res.data["created"], {"incomes": 0, "misc_costs": 0, "daily_house_spendings": 2})
+        self.assertEqual(
+            list(DailyHouseSpending.objects.order_by("date").values_list("spent_amount", flat=True)),
+            [Decimal("9999999999.99"), Decimal("5")],
+        )
+
+    def test_rejects_unusable_files_and_foreign_periods(self):
+        res = self.upload("description,amount\nGroceries,-5\n")
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("file", res.data)
+        self.assertEqual(self.upload("date,amount\n2025-09-01,abc\n").status_code, 400)
+        self.assertEqual(self.upload("date,amount\n", debits="income").status_code, 400)
+        bob = User.objects.create_user(username="bob", password="secret123")
+        other = Period.objects.create(user=bob, name="Bob's", start_date=date(2025, 9, 1), end_date=date(2025, 9, 30))
+        self.assertEqual(self.upload("date,amount\n2025-09-01,-5\n", period=other.id).status_code, 404)
+        self.assertFalse(DailyHouseSpending.objects.exists())
+
+    def test_round_trips_an_export(self):
+        self.add_spending(0, "150")
+        Income.objects.create(user=self.user, period=self.period, source="Salary", amount="1000", date_received=self.period.start_date)
+        body = b"".join(self.client.get("/api/export/", {"format": "csv"}).streaming_content).decode()
+        DailyHouseSpending.objects.all().delete()
+        Income.objects.all().delete()
+        res = self.upload(body)
+        self.assertEqual(res.status_code, 201, res.data)
+        self.assertEqual(res.data["created"], {"incomes": 1, "misc_costs": 0, "daily_house_spendings": 1})
+        self.assertEqual(DailyHouseSpending.objects.get().spent_amount, Decimal("150"))
+
+
+class SyncTests(TrackerTestCase):
+    url = "/api/sync/"
+
+    def sync(self, since=None):
+        res = self.client.get(self.url, {"since": since} if since else {})
+        self.assertEqual(res.status_code, 200, res.data)
+        return res.data
+
+    def test_full_then_deltas_with_tombstones(self):
+        later = self.add_spending(3, "10")
+        income = Income.objects.create(user=self.user, period=self.period, source="Salary", amount="5", date_received=self.period.start_date)
+        full = self.sync()
+        self.assertTrue(full["full"])
+        self.assertEqual([p["id"] for p in full["changes"]["periods"]], [self.period.id])
+        self.assertEqual(len(full["changes"]["daily_house_spendings"]), 1)
+        self.assertEqual(len(full["changes"]["incomes"]), 1)
+
+        cursor = self.sync()["cursor"]
+        self.assertFalse(any(self.sync(cursor)["changes"].values()))
+
+        # Inserting an earlier day moves the carryover of the later one: both come back.
+        created = self.client.post("/api/daily-house-spendings/", {
+            "period": self.period.id, "date": str(self.period.start_date), "spent_amount": "1",
+        })
+        self.client.delete(f"/api/incomes/{income.id}/")
+        delta = self.sync(cursor)
+        self.assertFalse(delta["full"])
+        self.assertEqual(
+            [row["id"] for row in delta["changes"]["daily_house_spendings"]], [created.data["id"], later.id]
+        )
+        # The first spending also set the period's default daily limit.
+        self.assertEqual(delta["changes"]["periods"][0]["default_daily_limit"], "100.00")
+        self.assertEqual(delta["changes"]["budgets"], [])
+        self.assertEqual(delta["deleted"]["incomes"], [income.id])
+        self.assertEqual(delta["changes"]["incomes"], [])
+
+    def test_rectified_rows_and_renamed_categories_are_resent(self):
+        later = self.add_spending(5, "10")
+        category = BudgetCategory.objects.create(user=self.user, name="Rent")
+        budget = Budget.objects.create(user=self.user, period=self.period, category=category, amount_allocated="1")
+        cursor = self.sync()["cursor"]
+        self.client.post("/api/daily-house-spendings/", {
+            "period": self.period.id, "date": str(self.period.start_date), "spent_amount": "30",
+        })
+        self.client.patch(f"/api/categories/{category.id}/", {"name": "Housing"})
+        delta = self.sync(cursor)
+        spendings = {row["id"]: row for row in delta["changes"]["daily_house_spendings"]}
+        self.assertEqual(spendings[later.id]["carryover"], "70.00")
+        self.assertEqual([b["id"] for b in delta["changes"]["budgets"]], [budget.id])
+        self.assertEqual(delta["changes"]["budgets"][0]["category"]["name"], "Housing")
+
+    def test_deleting_a_period_or_category_leaves_tombstones(self):
+        category = BudgetCategory.objects.create(user=self.user, name="Rent")
+        budget = Budget.objects.create(user=self.user, period=self.period, category=category, amount_allocated="1")
+        cursor = self.sync()["cursor"]
+        self.client.delete(f"/api/categories/{category.id}/")
+        self.client.delete(f"/api/periods/{self.period.id}/")
+        deleted = self.sync(cursor)["deleted"]
+        self.assertEqual(deleted["budgets"], [budget.id])
+        self.assertEqual(deleted["categories"], [category.id])
+        self.assertEqual(deleted["periods"], [self.period.id])
+
+    def test_cursors_follow_change_numbers_not_clocks(self):
+        cursor = self.sync()["cursor"]
+        # Stamped long ago (a clock step, a transaction that committed late): still sent.
+        income = Income.objects.create(user=self.user, period=self.period, source="Salary", amount="5", date_received=self.period.start_date)
+        Income.objects.filter(pk=income.pk).update(updated_at=timezone.now() - timedelta(days=1))
+        delta = self.sync(cursor)
+        self.assertEqual([row["id"] for row in delta["changes"]["incomes"]], [income.id])
+        self.assertFalse(any(self.sync(delta["cursor"])["changes"].values()))
+
+    @override_settings(TRACKER_SYNC_PAGE_SIZE=2)
+    def test_pages(self):
+        for day in range(3):
+            self.add_spending(day, "10")
+        Income.objects.create(user=self.user, period=self.period, source="Salary", amount="5", date_received=self.period.start_date)
+        pages, cursor = [], None
+        while True:
+            page = self.sync(cursor)
+            pages.append(page)
+            cursor = page["cursor"]
+            if len(pages) == 1:
+                # Written while paging: not part of this sync, first in the next one.
+                late = MiscellaneousCost.objects.create(user=self.user, period=self.period, title="Gift", amount="1")
+            if not page["more"]:
+                break
+        self.assertTrue(all(page["full"] for page in pages))
+        self.assertTrue(all(sum(map(len, page["changes"].values())) <= 2 for page in pages))
+        rows = {kind: [row["id"] for page in pages for row in page["changes"][kind]] for kind in pages[0]["changes"]}
+        self.assertEqual(len(rows["periods"]), 1)
+        self.assertEqual(len(rows["incomes"]), 1)
+        self.assertEqual(len(set(rows["daily_house_spendings"])), 3)
+        self.assertEqual(rows["misc_costs"], [])
+        delta = self.sync(cursor)
+        self.assertEqual([row["id"] for row in delta["changes"]["misc_costs"]], [late.id])
+        self.assertFalse(delta["more"])
+
+    def test_bad_and_expired_cursors(self):
+        for cursor in ("yesterday", "1.2.3", "-5.1", "3.2.1.0.0.0"):
+            with self.subTest(cursor=cursor):
+                self.assertEqual(self.client.get(self.url, {"since": cursor}).status_code, 400)
+        # Timestamp cursors from before change numbers, and cursors past the tombstone retention.
+        issued = (timezone.now() - timedelta(days=400) - datetime(1970, 1, 1, tzinfo=dt_timezone.utc)) // timedelta(microseconds=1)
+        for cursor in ("1", f"5.{issued}"):
+            with self.subTest(cursor=cursor):
+                data = self.sync(cursor)
+                self.assertTrue(data["reset"])
+                self.assertTrue(data["full"])
+                self.assertEqual(len(data["changes"]["periods"]), 1)
+
+    def test_prune_tombstones_command(self):
+        Tombstone.objects.create(user=self.user, kind="incomes", object_id=1)
+        old = Tombstone.objects.create(user=self.user, kind="incomes", object_id=2)
+        Tombstone.objects.filter(pk=old.pk).update(deleted_at=old.deleted_at - timedelta(days=400))
+        out = StringIO()
+        call_command("prune_tombstones", stdout=out)
+        self.assertEqual(list(Tombstone.objects.values_list("object_id", flat=True)), [1])
+
+
+@override_settings(TRACKER_RESPONSE_CACHE_ENABLED=True)
+class ResponseCacheTests(TrackerTestCase):
+    def setUp(self):
+        super().setUp()
+        metrics.REGISTRY.reset()
+
+    def get_json(self, url, **params):
+        res = self.client.get(url, params)
+        self.assertEqual(res.status_code, 200)
+        return json.loads(res.content), res
+
+    def test_hits_skip_the_row_tables_and_writes_evict(self):
+        url = "/api/incomes/"
+        payload = {"period": self.period.id, "source": "Salary", "amount": "5", "date_received": "2025-09-02"}
+        self.client.post(url, payload)
+        first, _ = self.get_json(url, period=self.period.id)
+        with self.assertNumQueries(1):
+            cached, res = self.get_json(url, period=self.period.id)
+        self.assertEqual(cached, first)
+        self.assertIn('cache;desc="hit"', res["Server-Timing"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(url, {**payload, "amount": "7"})
+        fresh, _ = self.get_json(url, period=self.period.id)
+        self.assertEqual(len(fresh), 2)
+
+        row = metrics.report(metrics.REGISTRY.raw())["GET income-list"]
+        self.assertEqual((row["cache_hits"], row["cache_misses"]), (1, 2))
+
+    def test_keys_are_per_user_and_query(self):
+        self.add_spending(0, "10")
+        url = "/api/daily-house-spendings/"
+        mine, _ = self.get_json(url, period=self.period.id)
+        paged, _ = self.get_json(url, period=self.period.id, page_size=1)
+        self.assertEqual(len(mine), 1)
+        self.assertEqual(len(paged["results"]), 1)
+
+        self.client.force_authenticate(User.objects.create_user(username="bob", password="secret123"))
+        theirs, _ = self.get_json(url, period=self.period.id)
+        self.assertEqual(theirs, [])
+
+    def test_deleting_a_period_evicts_its_responses(self):
+        self.add_spending(0, "10")
+        url = "/api/daily-house-spendings/"
+        self.assertEqual(len(self.get_json(url, period=self.period.id)[0]), 1)
+        periods, _ = self.get_json("/api/periods/")
+        self.assertEqual(len(periods), 1)
+
+        period_id = self.period.id
+        with self.captureOnCommitCallbacks(execute=True):
+            self.period.delete()  # as the admin would: no viewset hook involved
+        self.assertEqual(self.get_json(url, period=period_id)[0], [])
+        self.assertEqual(self.get_json("/api/periods/")[0], [])
+
+    def test_writes_outside_the_api_evict(self):
+        url = "/api/incomes/"
+        other = Period.objects.create(user=self.user, name="Winter", start_date=date(2025, 11, 1), end_date=date(2025, 11, 30))
+        self.assertEqual(self.get_json(url, period=self.period.id)[0], [])
+        with self.captureOnCommitCallbacks(execute=True):
+            income = Income.objects.create(user=self.user, period=self.period, source="Salary", amount="5",
+                                           date_received=self.period.start_date)
+        self.assertEqual(len(self.get_json(url, period=self.period.id)[0]), 1)
+
+        # Moving a row changes both periods' lists.
+        self.assertEqual(self.get_json(url, period=other.id)[0], [])
+        with self.captureOnCommitCallbacks(execute=True):
+            income.period = other
+            income.save()
+        self.assertEqual(self.get_json(url, period=self.period.id)[0], [])
+        self.assertEqual(len(self.get_json(url, period=other.id)[0]), 1)
+
+        category = BudgetCategory.objects.create(user=self.user, name="Rent")
+        Budget.objects.create(user=self.user, period=self.period, category=category, amount_allocated="1")
+        budgets, res = self.get_json("/api/budgets/", period=self.period.id)
+        self.assertEqual(budgets[0]["category"]["name"], "Rent")
+        with self.captureOnCommitCallbacks(execute=True):
+            category.name = "Housing"
+            category.save()
+        budgets, fresh = self.get_json("/api/budgets/", period=self.period.id)
+        self.assertEqual(budgets[0]["category"]["name"], "Housing")
+        self.assertNotEqual(fresh["ETag"], res["ETag"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            income.delete()
+        self.assertEqual(self.get_json(url, period=other.id)[0], [])
+
+    def test_hits_keep_the_response_headers(self):
+        for url in ("/api/incomes/", f"/api/periods/{self.period.id}/", "/api/dashboard/"):
+            _, miss = self.get_json(url)
+            _, hit = self.get_json(url)
+            self.assertIn('cache;desc="hit"', hit["Server-Timing"])
+            for header in ("Content-Type", "Allow", "Vary", "ETag", "Cache-Control"):
+                with self.subTest(url=url, header=header):
+                    self.assertEqual(hit.get(header), miss.get(header))
+
+    def test_file_backend(self):
+        with tempfile.TemporaryDirectory() as tmp, self.settings(CACHES={
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+            "tracker": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": tmp},
+        }):
+            first, _ = self.get_json("/api/periods/")
+            with self.assertNumQueries(1):
+                self.assertEqual(self.get_json("/api/periods/")[0], first)
+
+
+class StatelessAuthTests(TrackerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+
+    def login(self, client=None):
+        client = client or self.client
+        res = client.post("/api/token/", {"username": "alice", "password": "secret123"})
+        self.assertEqual(res.status_code, 200, res.data)
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {res.data['access']}")
+        return res.data["access"]
+
+    def test_requests_do_not_load_the_user(self):
+        self.login()
+        self.client.get("/api/periods/")  # caches the token version
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.post("/api/incomes/", {
+                "period": self.period.id, "source": "Salary", "amount": "10", "date_received": "2025-09-01",
+            })
+        self.assertEqual(res.status_code, 201, res.data)
+        self.assertFalse([q for q in queries.captured_queries if "auth_user" in q["sql"]])
+        self.assertEqual(Income.objects.get().user, self.user)
+
+    def test_logout_everywhere_revokes_access_and_refresh_tokens(self):
+        self.login()
+        other = APIClient()
+        self.login(other)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(other.post("/api/logout/all/").status_code, 200)
+        self.assertEqual(self.client.get("/api/periods/").status_code, 401)
+        self.assertEqual(self.client.post("/api/token/refresh/").status_code, 401)
+        self.login()
+        self.assertEqual(self.client.get("/api/periods/").status_code, 200)
+
+    def test_password_change_and_deactivation_revoke_tokens(self):
+        self.login()
+        user = User.objects.get(pk=self.user.pk)
+        user.check_password("secret123")  # a hash upgrade on login must not revoke anything
+        self.assertEqual(self.client.get("/api/periods/").status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            user.set_password("another456")
+            user.save()
+        self.assertEqual(self.client.get("/api/periods/").status_code, 401)
+        user.set_password("secret123")
+        user.save()
+        self.login()
+        with self.captureOnCommitCallbacks(execute=True):
+            user.is_active = False
+            user.save()
+        self.assertEqual(self.client.get("/api/periods/").status_code, 401)
+        self.assertEqual(self.client.post("/api/token/refresh/").status_code, 401)
+
+    def test_staff_changes_revoke_tokens(self):
+        user = User.objects.get(pk=self.user.pk)
+        user.is_staff = True
+        user.save()
+        self.login()
+        self.assertEqual(self.client.get("/api/_metrics/").status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            user.is_staff = False
+            user.save()
+        self.assertEqual(self.client.get("/api/_metrics/").status_code, 401)
+        self.login()
+        self.assertEqual(self.client.get("/api/_metrics/").status_code, 403)
+        with self.captureOnCommitCallbacks(execute=True):
+            user.first_name = "Alice"
+            user.save()  # other profile edits leave tokens alone
+        self.assertEqual(self.client.get("/api/periods/").status_code, 200)
+
+    def test_refresh_restamps_claims_and_old_tokens_still_work(self):
+        self.login()
+        User.objects.filter(pk=self.user.pk).update(is_staff=True)
+        access = self.client.post("/api/token/refresh/").data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.assertEqual(self.client.get("/api/_metrics/").status_code, 200)
+        legacy = AccessToken.for_user(self.user)  # issued without the tracker claims
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {legacy}")
+        self.assertEqual(self.client.get("/api/periods/").status_code, 200)
+
+
+@override_settings(TRACKER_PBKDF2_ITERATIONS=1000, TRACKER_SCRYPT_WORK_FACTOR=2 ** 10, TRACKER_SCRYPT_PARALLELISM=1)
+class PasswordHashingTests(TrackerTestCase):
+    def login(self):
+        return self.client.post("/api/token/", {"username": "alice", "password": "secret123"})
+
+    def test_login_rehashes_to_the_preferred_hasher(self):
+        self.user.set_password("secret123")
+        self.user.save()
+        self.assertTrue(User.objects.get(pk=self.user.pk).password.startswith("pbkdf2_sha256$1000$"))
+        scrypt_first = ["tracker.hashers.TunedScryptPasswordHasher", "tracker.hashers.TunedPBKDF2PasswordHasher"]
+        with override_settings(PASSWORD_HASHERS=scrypt_first):
+            access = self.login().data["access"]
+            self.assertTrue(User.objects.get(pk=self.user.pk).password.startswith("scrypt$1024$"))
+            # The upgrade is not a password change: tokens stay valid.
+            self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+            self.assertEqual(self.client.get("/api/periods/").status_code, 200)
+        with override_settings(TRACKER_PBKDF2_ITERATIONS=2000):
+            self.assertEqual(self.login().status_code, 200)
+        self.assertTrue(User.objects.get(pk=self.user.pk).password.startswith("pbkdf2_sha256$2000$"))
+
+    @override_settings(TRACKER_PBKDF2_ITERATIONS=None)
+    def test_pbkdf2_defaults_to_djangos_rounds(self):
+        self.assertEqual(TunedPBKDF2PasswordHasher().iterations, PBKDF2PasswordHasher.iterations)
+
+    def test_signup_rejects_usernames_differing_only_in_case(self):
+        res = self.client.post("/api/signup/", {"username": "ALICE", "password": "secret123"})
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("username", res.data)
+        res = self.client.post("/api/signup/", {"username": "bob", "password": "secret123"})
+        self.assertEqual(res.status_code, 201)
+
+
+class SQLiteProfileTests(TestCase):
+    def test_profile_sets_pragmas_and_immediate_transactions(self):
+        with mock.patch.dict(os.environ, {"SQLITE_BUSY_TIMEOUT_MS": "2500"}):
+            config = sqlite_database("/tmp/x.sqlite3")
+        self.assertEqual(config["OPTIONS"]["transaction_mode"], "IMMEDIATE")
+        self.assertIn("PRAGMA journal_mode=WAL", config["OPTIONS"]["init_command"])
+        self.assertIn("PRAGMA busy_timeout=2500", config["OPTIONS"]["init_command"])
+        self.assertGreater(config["CONN_MAX_AGE"], 0)
+        with mock.patch.dict(os.environ, {"SQLITE_TUNED": "False"}):
+            self.assertNotIn("OPTIONS", sqlite_database("/tmp/x.sqlite3"))
+
+    def test_replica_url_adds_mirrored_replica_alias(self):
+        env = {"DATABASE_URL": "sqlite:////tmp/primary.sqlite3", "DATABASE_REPLICA_URL": "sqlite:////tmp/replica.sqlite3"}
+        with mock.patch.dict(os.environ, env):
+            config = databases("sqlite:///unused.sqlite3")
+        self.assertEqual(config["default"]["NAME"], "/tmp/primary.sqlite3")
+        self.assertEqual(config["replica"]["NAME"], "/tmp/replica.sqlite3")
+        self.assertEqual(config["replica"]["TEST"], {"MIRROR": "default"})
+        with mock.patch.dict(os.environ, {"DATABASE_URL": "sqlite:////tmp/primary.sqlite3"}):
+            os.environ.pop("DATABASE_REPLICA_URL", None)  # restored by patch.dict
+            self.assertEqual(set(databases("sqlite:///unused.sqlite3")), {"default"})
+
+
+class ServerProfileTests(TestCase):
+    def gunicorn_config(self, **env):
+        with mock.patch.dict(os.environ, env):
+            return runpy.run_path(str(settings.BASE_DIR / "config" / "gunicorn.conf.py"))
+
+    def test_worker_class_and_count(self):
+        config = self.gunicorn_config(GUNICORN_WORKER_CLASS="uvicorn", GUNICORN_WORKERS="3")
+        self.assertEqual((config["worker_class"], config["workers"]), ("uvicorn_worker.UvicornWorker", 3))
+        self.assertEqual(config["wsgi_app"], "config.asgi:application")
+        self.assertTrue(config["preload_app"])
+        self.assertEqual(config["default_workers"]("sync", 2), 5)
+        self.assertEqual(config["default_workers"]("gthread", 2), 3)
+        with mock.patch.dict(os.environ, {"GUNICORN_MAX_WORKERS": "4"}):
+            self.assertEqual(config["default_workers"]("sync", 8), 4)
+        with self.assertRaises(ValueError):
+            self.gunicorn_config(GUNICORN_WORKER_CLASS="eventlet")
+
+    def test_warm_up_populates_url_resolver(self):
+        self.assertGreaterEqual(warm_up(), 0)
+        self.assertTrue(get_resolver()._populated)
+
+    def test_prepare_server_skips_unchanged_steps(self):
+        with tempfile.TemporaryDirectory() as tmp, self.settings(STATIC_ROOT=tmp):
+            first, second = StringIO(), StringIO()
+            call_command("prepare_server", verbosity=0, stdout=first)
+            call_command("prepare_server", verbosity=0, stdout=second)
+            self.assertTrue(os.path.exists(os.path.join(tmp, "admin")))
+        self.assertIn("skipping migrate", first.getvalue())
+        self.assertNotIn("skipping collectstatic", first.getvalue())
+        self.assertIn("skipping collectstatic", second.getvalue())
+
+
+@override_settings(TRACKER_REPLICA_ALIAS="replica", TRACKER_REPLICA_STICKY_SECONDS=7)
+class ReplicaRoutingTests(SimpleTestCase):
+    # Not a TestCase: its per-test transaction would pin every read to the primary.
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+
+    def routed(self, request):
+        seen = []
+
+        def get_response(request):
+            seen.append(self.router.db_for_read(Income))
+            return HttpResponse(status=201 if request.method == "POST" else 200)
+        response = ReplicaStickinessMiddleware(get_response)(request)
+        return seen[0], response
+
+    def test_reads_go_to_replica_and_writes_to_primary(self):
+        self.assertEqual(self.router.db_for_read(Income), "replica")
+        self.assertEqual(self.router.db_for_write(Income), "default")
+        with use_primary():
+            self.assertEqual(self.router.db_for_read(Income), "default")
+        self.assertFalse(self.router.allow_migrate("replica", "tracker"))
+        self.assertTrue(self.router.allow_migrate("default", "tracker"))
+        with self.settings(TRACKER_REPLICA_ALIAS=None):
+            self.assertEqual(self.router.db_for_read(Income), "default")
+
+    def test_token_versions_and_transactions_read_the_primary(self):
+        from .models import TokenVersion
+        self.assertEqual(self.router.db_for_read(TokenVersion), "default")
+        with mock.patch.object(connection, "in_atomic_block", True):
+            self.assertEqual(self.router.db_for_read(Income), "default")
+
+    def test_reads_stick_to_primary_after_a_write(self):
+        factory = RequestFactory()
+        db, response = self.routed(factory.post("/api/incomes/"))
+        self.assertEqual(db, "default")
+        self.assertEqual(response.cookies[STICKY_COOKIE]["max-age"], 7)
+        self.assertTrue(response.cookies[STICKY_COOKIE]["httponly"])
+
+        request = factory.get("/api/incomes/")
+        request.COOKIES[STICKY_COOKIE] = "1"
+        self.assertEqual(self.routed(request)[0], "default")
+        db, response = self.routed(factory.get("/api/incomes/"))
+        self.assertEqual(db, "replica")
+        self.assertNotIn(STICKY_COOKIE, response.cookies)
+
+
+class MetricsTests(TrackerTestCase):
+    def setUp(self):
+        super().setUp()
+        metrics.REGISTRY.reset()
+
+    @override_settings(TRACKER_RESPONSE_CACHE_ENABLED=False)  # both GETs run the list's 2 queries
+    def test_server_timing_header_and_registry(self):
+        self.add_spending(0, "10")
+        res = self.client.get("/api/daily-house-spendings/", {"period": self.period.id})
+        self.assertRegex(res["Server-Timing"], r'^db;dur=[\d.]+;desc="2 queries", ser;dur=[\d.]+, total;dur=[\d.]+$')
+        self.client.get("/api/daily-house-spendings/", {"period": self.period.id})
+
+        row = metrics.report(metrics.REGISTRY.raw())["GET daily-house-spending-list"]
+        self.assertEqual(row["count"], 2)
+        self.assertEqual(row["avg_queries"], 2)
+        self.assertIsNotNone(row["p95_ms"])
+        self.assertFalse(self.client.get("/").has_header("Server-Timing"))
+
+    def test_metrics_endpoint_is_staff_only(self):
+        self.client.get("/api/periods/")
+        self.assertEqual(self.client.get("/api/_metrics/").status_code, 403)
+        self.client.force_authenticate(User.objects.create_user(username="ops", password="secret123", is_staff=True))
+        res = self.client.get("/api/_metrics/")
+        self.assertEqual(res.status_code, 200)
+        self.assertIn("GET period-list", res.data["endpoints"])
+
+    def test_dump_metrics_merges_worker_snapshots(self):
+        self.client.get("/api/periods/")
+        with tempfile.TemporaryDirectory() as tmp, self.settings(TRACKER_METRICS_DIR=tmp, TRACKER_METRICS_FLUSH_SECONDS=0):
+            self.client.get("/api/periods/")
+            out = StringIO()
+            call_command("dump_metrics", "--json", stdout=out)
+        self.assertEqual(json.loads(out.getvalue())["GET period-list"]["count"], 2)
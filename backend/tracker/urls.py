@@ -1,5 +1,7 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from .async_views import async_urlpatterns
 from .views import (
     PeriodViewSet,
     IncomeViewSet,
@@ -8,6 +10,11 @@ from .views import (
     DailyHouseSpendingViewSet,
     SignupView,
     MiscellaneousCostViewSet,
+    MetricsView,
+    SyncView,
+    DashboardView,
+    ExportView,
+    ImportView,
 )
 
 router = DefaultRouter()
@@ -19,6 +26,14 @@ router.register(r'daily-house-spendings', DailyHouseSpendingViewSet, basename='d
 router.register(r'misc-costs', MiscellaneousCostViewSet, basename='misc-cost')
 
 urlpatterns = [
+    # Async period list, summary and dashboard under ASGI (see tracker.async_views).
+    *(async_urlpatterns(router.urls, DashboardView.as_view())
+      if getattr(settings, 'TRACKER_ASYNC_READS', False) else []),
     path('', include(router.urls)),
     path('signup/', SignupView.as_view(), name='signup'),
+    path('dashboard/', DashboardView.as_view(), name='dashboard'),
+    path('sync/', SyncView.as_view(), name='sync'),
+    path('export/', ExportView.as_view(), name='export'),
+    path('import/', ImportView.as_view(), name='import'),
+    path('_metrics/', MetricsView.as_view(), name='metrics'),
 ]
\ No newline at end of file
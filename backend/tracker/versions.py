@@ -0,0 +1,98 @@
+import hashlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.models import F, Q
+
+from . import cache
+from .models import DataVersion
+
+# Part of every ETag; bump when a response shape changes so cached bodies are not reused.
+ETAG_SCHEMA = 2
+
+
+_explicit = ContextVar("tracker_explicit_bumps", default=False)
+
+
+@contextmanager
+def explicit_bumps():
+    """
+    Writes inside the block call bump_versions() themselves, once per write, as the API views
+    do: the model signal receivers (tracker.signals) then leave the counters alone.
+    """
+    token = _explicit.set(True)
+    try:
+        yield
+    finally:
+        _explicit.reset(token)
+
+
+def bumped_explicitly():
+    return _explicit.get()
+
+
+def _pk(obj):
+    return getattr(obj, "pk", obj)
+
+
+def scope(period=None):
+    """Name of a counter: "u" for the user-wide one, "p<id>" for a period's."""
+    return "u" if period is None else f"p{_pk(period)}"
+
+
+def bump_versions(user, periods=(), everything=False):
+    """
+    Bump the user-wide counter and those of `periods` (or every counter of the user with
+    `everything`, for writes such as category renames that show up in all periods).
+    Call inside the write's transaction. Missing rows are created, then bumped, and the
+    cached responses of the bumped scopes are evicted after commit.
+    """
+    period_ids = {_pk(p) for p in periods if p is not None}
+    qs = DataVersion.objects.filter(user_id=_pk(user))
+    if everything:
+        if cache.enabled():
+            period_ids |= set(qs.exclude(period=None).values_list("period_id", flat=True))
+    else:
+        qs = qs.filter(Q(period__isnull=True) | Q(period_id__in=period_ids))
+    cache.evict_on_commit(_pk(user), [scope(None), *map(scope, period_ids)])
+    if qs.update(version=F("version") + 1) >= len(period_ids) + 1:
+        return
+    existing = set(qs.values_list("period_id", flat=True))
+    missing = ({None} | period_ids) - existing
+    DataVersion.objects.bulk_create(
+        [DataVersion(user_id=_pk(user), period_id=pid) for pid in missing], ignore_conflicts=True
+    )
+    # Bump again so a row created concurrently by another writer still counts this write.
+    created = Q(period_id__in=missing - {None})
+    if None in missing:
+        created |= Q(period__isnull=True)
+    qs.filter(created).update(version=F("version") + 1)
+
+
+def _versions(user, period):
+    return DataVersion.objects.filter(user_id=_pk(user), period_id=_pk(period)).values_list("version", flat=True)
+
+
+def current_version(user, period=None):
+    """One indexed lookup; 0 for counters never bumped."""
+    return _versions(user, period).first() or 0
+
+
+async def acurrent_version(user, period=None):
+    """current_version() for async views."""
+    return await _versions(user, period).afirst() or 0
+
+
+def digest(user, full_path, renderer_format):
+    """Identifies one representation: user, URL (with query string) and renderer."""
+    key = f"{ETAG_SCHEMA}|{_pk(user)}|{full_path}|{renderer_format}"
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+
+def request_digest(request):
+    return digest(request.user, request.get_full_path(), request.accepted_renderer.format)
+
+
+def make_etag(version, scope, digest):
+    """Strong ETag: changes whenever the scope's counter or the representation does."""
+    return f'"{scope}-{version}-{digest}"'
@@ -1,200 +1,698 @@
 # /home/alireza/cost-tracker/backend/tracker/views.py
+import logging
+import os
+import random
+
 from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import parse_etags
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
-from decimal import Decimal
-
 from django.db import transaction
 from rest_framework.viewsets import ModelViewSet
-from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from rest_framework.parsers import MultiPartParser
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 
-from .models import Period, Income, Budget, BudgetCategory, DailyHouseSpending, MiscellaneousCost
+from .models import Period, Income, Budget, BudgetCategory, DailyHouseSpending, MiscellaneousCost, PeriodRollup
+from . import metrics
+from .auth import revoke_tokens
+from .carryover import find_drift, rectify_period, rectify_from
+from .rollups import apply_rollup_change, apply_rollup_delta, negate, rebuild_rollup
+from .dashboard import PeriodNotFound, dashboard_payload
+from .export import FORMATS as EXPORT_FORMATS, stream_ledger
+from .readers import READERS as LIST_READERS
+from .importer import KINDS as IMPORT_KINDS, ImportFormatError, StatementImport, upsert_daily_spendings
+from .summary import period_summary
+from .sync import KIND_BY_MODEL, InvalidCursor, changes_since, decode_cursor, record_tombstones
+from . import cache as response_cache
+from .versions import (
+    bump_versions, current_version, explicit_bumps, make_etag, request_digest, scope as version_scope,
+)
 from .serializers import (
     PeriodSerializer, IncomeSerializer,
     BudgetSerializer, BudgetCategorySerializer,
     DailyHouseSpendingSerializer, SignupSerializer,
-    MiscellaneousCostSerializer
+    MiscellaneousCostSerializer, PeriodSummarySerializer,
 )
 
-# Helper: ensure the related object belongs to the current user
+logger = logging.getLogger(__name__)
+
+# Helper: ensure the related object belongs to the current user (compares ids, no User query)
 def validate_ownership(obj, user):
-    if obj.user != user:
+    if obj.user_id != user.pk:
         raise PermissionDenied("This object doesn't belong to you.")
 
+class ShortCircuit(Exception):
+    """Raised from initial() to answer a GET without running the handler."""
+
+    def __init__(self, response):
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """
+    Strong ETags and a per-user response cache for GETs, both driven by DataVersion counters.
+    The counter is read (one indexed lookup) after authentication and before the handler:
+    - an If-None-Match hit returns 304;
+    - otherwise a response cached under the same ETag is returned as is (see tracker.cache);
+    either way without querying the row tables or serializing.
+    Lists filtered by ?period= use that period's counter; everything else the user-wide one.
+    Writes bump the counters in their transaction and evict the scope's cached responses after
+    commit (see bump_versions); writes made elsewhere are bumped by tracker.signals. Responses
+    carry `Cache-Control: private, no-cache`, so browsers revalidate on their own.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        with explicit_bumps():
+            return super().dispatch(request, *args, **kwargs)
+
+    def get_version_period(self):
+        """Period whose counter covers this GET, or None for the user-wide counter."""
+        return None if self.detail else self.request.query_params.get('period')
+
+    def prepare_versioned_get(self, period):
+        """Hook run before the counter is read; writes it makes (and bumps) are in the ETag."""
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.etag = self.cache_key = None
+        if request.method not in ('GET', 'HEAD'):
+            return
+        period = self.get_version_period()
+        if period is not None and not str(period).isdigit():
+            return
+        self.prepare_versioned_get(period)
+        scope, digest = version_scope(period), request_digest(request)
+        self.etag = make_etag(current_version(request.user, period), scope, digest)
+        if self.etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            raise ShortCircuit(Response(status=status.HTTP_304_NOT_MODIFIED))
+        if not response_cache.enabled():
+            return
+        self.cache_key = (request.user.pk, scope, digest)
+        cached = response_cache.get(*self.cache_key, self.etag)
+        metrics.note_cache_lookup(hit=cached is not None)
+        if cached is not None:
+            self.cache_key = None
+            content, headers = cached
+            raise ShortCircuit(HttpResponse(content, headers=headers))
+
+    def handle_exception(self, exc):
+        if isinstance(exc, ShortCircuit):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if getattr(self, 'etag', None) and response.status_code in (200, 304):
+            response['ETag'] = self.etag
+            response['Cache-Control'] = 'private, no-cache'
+        if getattr(self, 'cache_key', None) and response.status_code == 200 and isinstance(response, Response):
+            response.render()
+            response_cache.store(*self.cache_key, self.etag, response.content, dict(response.items()))
+        return response
+
+class SparseFieldsMixin:
+    """
+    `?fields=a,b` / `?exclude=c` on GET list and retrieve: only those serializer fields are
+    rendered, and only the columns they need are read (values_list() for lists, only() for
+    model instances; see tracker.readers). Unknown names are a 400.
+    """
+    sparse_actions = ('list', 'retrieve')
+
+    def get_sparse_fields(self):
+        """Field names to render, in serializer order, or None for all of them."""
+        if not hasattr(self, '_sparse_fields'):
+            self._sparse_fields = self._parse_sparse_fields()
+        return self._sparse_fields
+
+    def _parse_sparse_fields(self):
+        params = self.request.query_params
+        if self.action not in self.sparse_actions or not ({'fields', 'exclude'} & set(params)):
+            return None
+        available = LIST_READERS[self.get_serializer_class()].names
+        names, errors = available, {}
+        for param in ('fields', 'exclude'):
+            if param not in params:
+                continue
+            requested = {name.strip() for name in params[param].split(',') if name.strip()}
+            unknown = sorted(requested - set(available))
+            if unknown:
+                errors[param] = [f"Unknown field(s): {', '.join(unknown)}. Choose from: {', '.join(available)}."]
+            elif param == 'fields':
+                names = tuple(name for name in names if name in requested)
+            else:
+                names = tuple(name for name in names if name not in requested)
+        if not errors and not names:
+            errors['fields'] = ["At least one field must be left."]
+        if errors:
+            raise ValidationError(errors)
+        return names
+
+    def list_projection(self, queryset):
+        """only() the columns the list renders and pages on (the reader's values_list() reads the same)."""
+        return LIST_READERS[self.get_serializer_class()].only(queryset, None, self.get_cursor_columns())
+
+    def get_cursor_columns(self):
+        # Cursor pagination reads these off every row of a page, so they are always loaded.
+        return tuple(name.lstrip('-') for name in getattr(self, 'cursor_ordering', ()))
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            kwargs.setdefault('fields', fields)
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            queryset = LIST_READERS[self.get_serializer_class()].only(queryset, fields, self.get_cursor_columns())
+        return queryset
+
+
+class ValuesListMixin(SparseFieldsMixin):
+    """
+    list() built by the values_list() reader registered for the serializer (tracker.readers)
+    instead of one ModelSerializer pass per row. TRACKER_FAST_LISTS = False falls back to
+    the serializer; retrieve and writes always use it.
+    """
+
+    def get_list_reader(self):
+        if not getattr(settings, 'TRACKER_FAST_LISTS', True):
+            return None
+        return LIST_READERS.get(self.get_serializer_class())
+
+    def list_response(self, queryset, ordering=None):
+        """Paginated or plain list response; `ordering` applies to unpaginated lists only."""
+        reader, fields = self.get_list_reader(), self.get_sparse_fields()
+        rows = reader.rows(queryset, fields, self.get_cursor_columns()) if reader else queryset
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            data = reader.render(page, fields) if reader else self.get_serializer(page, many=True).data
+            return self.get_paginated_response(data)
+        if ordering:
+            rows = rows.order_by(*ordering)
+        return Response(reader.render(rows, fields) if reader else self.get_serializer(rows, many=True).data)
+
+    def list(self, request, *args, **kwargs):
+        return self.list_response(self.filter_queryset(self.get_queryset()))
+
+
+class RollupMixin:
+    """
+    Keeps PeriodRollup in step with writes. Subclasses define rollup_contribution(instance),
+    the columns (and amounts) one row adds to its period's rollup.
+    """
+
+    def save_with_rollup(self, serializer, **kwargs):
+        before = serializer.instance
+        if before is not None:
+            old_period, old = before.period_id, self.rollup_contribution(before)
+        with transaction.atomic():
+            instance = serializer.save(**kwargs)
+            if before is None:
+                apply_rollup_delta(instance.period, **self.rollup_contribution(instance))
+                bump_versions(self.request.user, [instance.period_id])
+            else:
+                apply_rollup_change(old_period, old, instance.period, self.rollup_contribution(instance))
+                bump_versions(self.request.user, [old_period, instance.period_id])
+        return instance
+
+    def perform_destroy(self, instance):
+        period, contribution = instance.period_id, self.rollup_contribution(instance)
+        kind, pk = KIND_BY_MODEL[type(instance)], instance.pk
+        with transaction.atomic():
+            super().perform_destroy(instance)
+            apply_rollup_delta(period, **negate(contribution))
+            bump_versions(self.request.user, [period])
+            record_tombstones(self.request.user, kind, [pk])
+
 # ----- Periods -----
-class PeriodViewSet(ModelViewSet):
+class PeriodViewSet(ConditionalGetMixin, ValuesListMixin, ModelViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = PeriodSerializer
+    cursor_ordering = ('-start_date', '-id')
+
+    def get_version_period(self):
+        # A period's detail and summary change only with writes to that period.
+        return self.kwargs.get(self.lookup_field) if self.detail else None
 
     def get_queryset(self):
-        return Period.objects.filter(user=self.request.user)
+        qs = Period.objects.filter(user=self.request.user)
+        if self.action == 'list':
+            qs = self.list_projection(qs)
+        elif self.action == 'summary':
+            qs = qs.select_related('rollup')
+        return qs
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        with transaction.atomic():
+            period = serializer.save(user=self.request.user)
+            PeriodRollup.objects.create(period=period)
+            bump_versions(self.request.user, [period])
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            period = serializer.save()
+            bump_versions(self.request.user, [period])
+    # Deletes need no hook: the Period post_delete receiver (tracker.signals) bumps and evicts,
+    # for admin deletes too.
+
+    @action(detail=True, methods=['get'])
+    def summary(self, request, pk=None):
+        """
+        GET /api/periods/{id}/summary/ — income, budget, misc-cost and spending totals
+        for the period, read from its PeriodRollup row.
+        """
+        period = self.get_object()
+        try:
+            rollup = period.rollup
+        except PeriodRollup.DoesNotExist:
+            rollup = rebuild_rollup(period)
+        return Response(PeriodSummarySerializer(period_summary(period.pk, rollup)).data)
 
 # ----- Incomes -----
-class IncomeViewSet(ModelViewSet):
+class IncomeViewSet(ConditionalGetMixin, ValuesListMixin, RollupMixin, ModelViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = IncomeSerializer
+    cursor_ordering = ('-date_received', '-id')
 
     def get_queryset(self):
         user = self.request.user
         qs = Income.objects.filter(user=user)
+        if self.action == 'list':
+            qs = self.list_projection(qs)
+        else:
+            # Writes check the current period's ownership and date range.
+            qs = qs.select_related('period')
         period_id = self.request.query_params.get('period')
         if period_id:
             qs = qs.filter(period_id=period_id)
         return qs
 
+    def rollup_contribution(self, income):
+        return {'income_total': income.amount}
+
     def perform_create(self, serializer):
         period = serializer.validated_data['period']
         validate_ownership(period, self.request.user)
-        serializer.save(user=self.request.user)
+        self.save_with_rollup(serializer, user=self.request.user)
 
     def perform_update(self, serializer):
         period = serializer.validated_data.get('period', serializer.instance.period)
         validate_ownership(period, self.request.user)
-        serializer.save()
+        self.save_with_rollup(serializer)
 
 # ----- Budget Categories -----
-class BudgetCategoryViewSet(ModelViewSet):
+class BudgetCategoryViewSet(ConditionalGetMixin, ValuesListMixin, ModelViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = BudgetCategorySerializer
+    cursor_ordering = ('name', 'id')
 
     def get_queryset(self):
-        return BudgetCategory.objects.filter(user=self.request.user)
+        qs = BudgetCategory.objects.filter(user=self.request.user)
+        if self.action == 'list':
+            qs = self.list_projection(qs)
+        return qs
 
+    # Budgets embed their category, so category writes show up in every period.
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        with transaction.atomic():
+            serializer.save(user=self.request.user)
+            bump_versions(self.request.user, everything=True)
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            category = serializer.save()
+            # Re-sync the budgets that embed the renamed category, under the rename's change number.
+            Budget.objects.filter(category=category).update(updated_at=timezone.now(), change_seq=category.change_seq)
+            bump_versions(self.request.user, everything=True)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            budgets = list(Budget.objects.filter(category=instance).values_list('id', 'period_id'))
+            pk = instance.pk
+            instance.delete()
+            # The budgets went with the category (CASCADE): recount their periods' rollups.
+            for period in {period for _, period in budgets}:
+                rebuild_rollup(period)
+            bump_versions(self.request.user, everything=True)
+            record_tombstones(self.request.user, 'budgets', [budget for budget, _ in budgets])
+            record_tombstones(self.request.user, 'categories', [pk])
 
 # ----- Budgets -----
-class BudgetViewSet(ModelViewSet):
+class BudgetViewSet(ConditionalGetMixin, ValuesListMixin, RollupMixin, ModelViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = BudgetSerializer
+    cursor_ordering = ('-id',)
 
     def get_queryset(self):
-        qs = Budget.objects.filter(user=self.request.user)
+        qs = Budget.objects.filter(user=self.request.user).select_related('category')
+        if self.action == 'list':
+            qs = self.list_projection(qs)
+        else:
+            qs = qs.select_related('period')
         period_id = self.request.query_params.get('period')
         if period_id:
             qs = qs.filter(period_id=period_id)
         return qs
 
+    def rollup_contribution(self, budget):
+        paid = budget.amount_allocated if budget.status == 'paid' else 0
+        return {'budgets_allocated': budget.amount_allocated, 'budgets_paid': paid}
+
     def perform_create(self, serializer):
         period = serializer.validated_data['period']
         category = serializer.validated_data['category']
         validate_ownership(period, self.request.user)
         validate_ownership(category, self.request.user)
-        serializer.save(user=self.request.user)
+        self.save_with_rollup(serializer, user=self.request.user)
 
     def perform_update(self, serializer):
         period = serializer.validated_data.get('period', serializer.instance.period)
         category = serializer.validated_data.get('category', serializer.instance.category)
         validate_ownership(period, self.request.user)
         validate_ownership(category, self.request.user)
-        serializer.save()
+        self.save_with_rollup(serializer)
 
 # ----- Daily House Spendings -----
-class DailyHouseSpendingViewSet(ModelViewSet):
+class DailyHouseSpendingViewSet(ConditionalGetMixin, ValuesListMixin, ModelViewSet):
     """
     Strategy:
-    - READS (list/retrieve): recompute carryover in memory for fresh API responses.
-    - WRITES (create/update/delete): save, then rectify carryover across the period.
+    - READS (list/retrieve): serve the stored carryover column; writes keep it correct.
+      With TRACKER_CARRYOVER_SAMPLE_RATE > 0, a sample of period lists is verified and repaired.
+    - WRITES (create/update/delete): save, then rectify carryover from the changed date onward,
+      then update the period rollup (days over limit is recounted since carryovers moved).
     """
     permission_classes = [IsAuthenticated]
     serializer_class = DailyHouseSpendingSerializer
+    cursor_ordering = ('date', 'id')
 
     def get_queryset(self):
         qs = DailyHouseSpending.objects.filter(user=self.request.user)
+        if self.action == 'list':
+            qs = self.list_projection(qs)
+        else:
+            # The unique (user, period, date) validator compares instance.user on updates.
+            qs = qs.select_related('period', 'user')
         period_id = self.request.query_params.get('period')
         if period_id:
             qs = qs.filter(period_id=period_id)
         return qs
 
-    def _recompute_sequence_in_memory(self, queryset):
-        rows = list(queryset.order_by("date", "id"))
-        carry = Decimal("0")
-        for row in rows:
-            row.carryover = carry
-            remaining = row.carryover + row.fixed_daily_limit - row.spent_amount
-            carry = remaining
-        return rows
-
-    def _rectify_carryovers_in_db(self, period, user):
-        with transaction.atomic():
-            rows = list(
-                DailyHouseSpending.objects
-                .select_for_update()
-                .filter(user=user, period=period)
-                .order_by("date", "id")
+    def _rectify_carryovers_in_db(self, period, user, since=None, through=None):
+        if since is None:
+            rectify_period(period=period, user=user)
+        else:
+            rectify_from(period=period, user=user, since=since, through=through)
+
+    def prepare_versioned_get(self, period):
+        # Repair before the ETag is taken, so the repaired body is not sent or cached under
+        # the counter it had before the repair.
+        if self.action == 'list':
+            self._maybe_verify_period(period)
+
+    def _maybe_verify_period(self, period_id):
+        rate = getattr(settings, 'TRACKER_CARRYOVER_SAMPLE_RATE', 0)
+        if not period_id or rate <= 0 or random.random() >= rate:
+            return
+        drifted = find_drift(period=period_id, user=self.request.user)
+        if drifted:
+            logger.warning(
+                "Carryover drift in period %s (user %s): %d row(s), repairing.",
+                period_id, self.request.user.pk, len(drifted),
             )
-            carry = Decimal("0")
-            for row in rows:
-                row.carryover = carry
-                remaining = row.carryover + row.fixed_daily_limit - row.spent_amount
-                carry = remaining
-            if rows:
-                DailyHouseSpending.objects.bulk_update(rows, ["carryover"])
+            with transaction.atomic():
+                self._rectify_carryovers_in_db(period=period_id, user=self.request.user)
+                bump_versions(self.request.user, [period_id])
 
     def list(self, request, *args, **kwargs):
         qs = self.filter_queryset(self.get_queryset())
-        rows = self._recompute_sequence_in_memory(qs)
-        serializer = self.get_serializer(rows, many=True)
-        return Response(serializer.data)
-
-    def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        rows = self._recompute_sequence_in_memory(
-            DailyHouseSpending.objects.filter(user=request.user, period=instance.period)
-        )
-        by_id = {r.id: r for r in rows}
-        corrected = by_id.get(instance.id, instance)
-        serializer = self.get_serializer(corrected)
-        return Response(serializer.data)
+        # Carryovers are stored per row, so every page is correct on its own.
+        return self.list_response(qs, ordering=("date", "id"))
 
     def perform_create(self, serializer):
         period = serializer.validated_data['period']
         validate_ownership(period, self.request.user)
-        instance = serializer.save()
-        if period.default_daily_limit is None:
-            period.default_daily_limit = instance.fixed_daily_limit
-            period.save(update_fields=['default_daily_limit'])
-        self._rectify_carryovers_in_db(period=instance.period, user=self.request.user)
+        with transaction.atomic():
+            instance = serializer.save()
+            if period.default_daily_limit is None:
+                period.default_daily_limit = instance.fixed_daily_limit
+                period.save(update_fields=['default_daily_limit', 'updated_at'])
+            self._rectify_carryovers_in_db(
+                period=instance.period, user=self.request.user, since=instance.date
+            )
+            apply_rollup_delta(
+                instance.period, recount_over_limit=True, **self.rollup_contribution(instance)
+            )
+            bump_versions(self.request.user, [instance.period_id])
+
+    def rollup_contribution(self, spending):
+        return {
+            'spending_total': spending.spent_amount,
+            'daily_limit_total': spending.fixed_daily_limit,
+            'days_recorded': 1,
+        }
 
     def perform_update(self, serializer):
         period = serializer.validated_data.get('period', serializer.instance.period)
         validate_ownership(period, self.request.user)
-        instance = serializer.save()
-        self._rectify_carryovers_in_db(period=instance.period, user=self.request.user)
+        old_period, old_date = serializer.instance.period, serializer.instance.date
+        old = self.rollup_contribution(serializer.instance)
+        with transaction.atomic():
+            instance = serializer.save()
+            if instance.period_id != old_period.id:
+                # Moved across periods: close the gap in the old one, open it in the new one.
+                self._rectify_carryovers_in_db(
+                    period=old_period, user=self.request.user, since=old_date
+                )
+                self._rectify_carryovers_in_db(
+                    period=instance.period, user=self.request.user, since=instance.date
+                )
+            else:
+                self._rectify_carryovers_in_db(
+                    period=instance.period,
+                    user=self.request.user,
+                    since=min(old_date, instance.date),
+                    through=max(old_date, instance.date),
+                )
+            apply_rollup_change(
+                old_period, old, instance.period, self.rollup_contribution(instance),
+                recount_over_limit=True,
+            )
+            bump_versions(self.request.user, [old_period, instance.period_id])
 
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
-        period = instance.period
-        user = request.user
-        response = super().destroy(request, *args, **kwargs)
-        self._rectify_carryovers_in_db(period=period, user=user)
-        return response
+        period, date, pk = instance.period, instance.date, instance.pk
+        contribution = self.rollup_contribution(instance)
+        with transaction.atomic():
+            self.perform_destroy(instance)
+            self._rectify_carryovers_in_db(period=period, user=request.user, since=date)
+            apply_rollup_delta(period, recount_over_limit=True, **negate(contribution))
+            bump_versions(request.user, [period])
+            record_tombstones(request.user, 'daily_house_spendings', [pk])
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    bulk_max_items = 1000
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """
+        POST /api/daily-house-spendings/bulk/ with a list of spendings.
+        New days are created and existing days (same user/period/date) are overwritten in one
+        transaction, then carryover is rectified once per affected period.
+        Returns {"results": [...], "errors": [{"index": i, "errors": {...}}]}; invalid items
+        are reported without aborting the valid ones.
+        """
+        if not isinstance(request.data, list):
+            return Response({"detail": "Expected a list of items."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(request.data) > self.bulk_max_items:
+            return Response(
+                {"detail": f"At most {self.bulk_max_items} items per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        serializer = self.get_serializer(data=request.data, many=True)
+        # Existing (user, period, date) rows are upserted, so skip the unique-together validator.
+        serializer.child.validators = []
+        rows, errors, seen = [], [], set()
+        for index, item in enumerate(request.data):
+            try:
+                attrs = serializer.child.run_validation(item)
+            except ValidationError as exc:
+                errors.append({"index": index, "errors": exc.detail})
+                continue
+            key = (attrs['period'].id, attrs['date'])
+            if key in seen:
+                errors.append({"index": index, "errors": {"date": ["Duplicate date for this period in the batch."]}})
+                continue
+            seen.add(key)
+            rows.append(DailyHouseSpending(**attrs))
+
+        if not rows:
+            return Response({"results": [], "errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            periods = upsert_daily_spendings(request.user, rows)
+            bump_versions(request.user, periods)
+
+        saved = [
+            r for r in DailyHouseSpending.objects
+            .filter(user=request.user, period__in=periods, date__in={r.date for r in rows})
+            .order_by('date', 'id')
+            if (r.period_id, r.date) in seen
+        ]
+        data = self.get_serializer(saved, many=True).data
+        return Response({"results": data, "errors": errors}, status=status.HTTP_201_CREATED)
 
 
 # ----- Miscellaneous Costs -----
-class MiscellaneousCostViewSet(ModelViewSet):
+class MiscellaneousCostViewSet(ConditionalGetMixin, ValuesListMixin, RollupMixin, ModelViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = MiscellaneousCostSerializer
+    cursor_ordering = ('-date_added', '-id')
 
     def get_queryset(self):
         user = self.request.user
         qs = MiscellaneousCost.objects.filter(user=user)
+        if self.action == 'list':
+            qs = self.list_projection(qs)
+        else:
+            qs = qs.select_related('period')
         period_id = self.request.query_params.get('period')
         if period_id:
             qs = qs.filter(period_id=period_id)
         return qs
 
+    def rollup_contribution(self, cost):
+        return {'misc_cost_total': cost.amount}
+
     def perform_create(self, serializer):
         period = serializer.validated_data['period']
         validate_ownership(period, self.request.user)
-        serializer.save(user=self.request.user)
+        self.save_with_rollup(serializer, user=self.request.user)
+
+    def perform_update(self, serializer):
+        period = serializer.validated_data.get('period', serializer.instance.period)
+        validate_ownership(period, self.request.user)
+        self.save_with_rollup(serializer)
+
+
+# ----- Dashboard -----
+class DashboardView(ConditionalGetMixin, APIView):
+    """
+    GET /api/dashboard/?period=<id> — periods, categories, and the period's collections and
+    summary in one response (see tracker.dashboard). Without ?period= the latest period is used.
+    The payload spans all periods, so it hangs on the user-wide counter for ETags and caching.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get_version_period(self):
+        return None
+
+    def get(self, request):
+        period = request.query_params.get('period')
+        if period is not None and not period.isdigit():
+            raise ValidationError({'period': ['A valid period id is required.']})
+        context = {'request': request, 'view': self}
+        try:
+            payload = dashboard_payload(request.user, int(period) if period else None, context)
+        except PeriodNotFound:
+            raise NotFound("Period not found.")
+        return Response(payload)
+
+
+# ----- Export -----
+class ExportView(APIView):
+    """
+    GET /api/export/?format=csv|jsonl&period=<id> — the user's ledger (incomes, budgets,
+    misc costs, daily spendings with recomputed carryovers), streamed (see tracker.export).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def perform_content_negotiation(self, request, force=False):
+        # ?format= picks the export format here, not a DRF renderer; errors are sent as JSON.
+        renderer = JSONRenderer()
+        return renderer, renderer.media_type
+
+    def get(self, request):
+        fmt = request.query_params.get('format', 'csv')
+        if fmt not in EXPORT_FORMATS:
+            raise ValidationError({'format': [f"Choose one of: {', '.join(EXPORT_FORMATS)}."]})
+        period = request.query_params.get('period')
+        if period is not None:
+            if not period.isdigit():
+                raise ValidationError({'period': ['A valid period id is required.']})
+            if not Period.objects.filter(pk=period, user=request.user).exists():
+                raise NotFound("Period not found.")
+        content_type, extension = EXPORT_FORMATS[fmt]
+        response = StreamingHttpResponse(stream_ledger(request.user, fmt, period), content_type=content_type)
+        name = f"ledger-period-{period}" if period else "ledger"
+        response['Content-Disposition'] = f'attachment; filename="{name}.{extension}"'
+        return response
+
+
+class ImportView(APIView):
+    """
+    POST /api/import/ (multipart) with a CSV statement in `file`; optional `period` (only rows
+    dated inside it are accepted) and `debits` (daily_spending or misc_cost: where debits
+    without a `kind` column go). See tracker.importer for the columns.
+    Returns {"created": {...}, "errors": [{"line": n, "errors": {...}}], "error_count": n}.
+    """
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            raise ValidationError({'file': ['A CSV file is required.']})
+        debits = request.data.get('debits', 'daily_spending')
+        if debits not in IMPORT_KINDS[1:]:
+            raise ValidationError({'debits': [f"Choose one of: {', '.join(IMPORT_KINDS[1:])}."]})
+        period = request.data.get('period') or None
+        if period is not None:
+            if not period.isdigit():
+                raise ValidationError({'period': ['A valid period id is required.']})
+            if not Period.objects.filter(pk=period, user=request.user).exists():
+                raise NotFound("Period not found.")
+        try:
+            result = StatementImport(request.user, period=period, debits=debits).run(upload.file)
+        except ImportFormatError as exc:
+            raise ValidationError({'file': [str(exc)]})
+        created = any(result['created'].values())
+        return Response(result, status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST)
+
+
+# ----- Delta sync -----
+class SyncView(APIView):
+    """
+    GET /api/sync/?since=<cursor> — periods, incomes, categories, budgets, daily spendings and
+    misc costs created or updated since the cursor, plus the ids deleted since then:
+    {"cursor", "full", "reset", "more", "changes": {collection: [rows]}, "deleted": {collection: [ids]}}.
+    Without `since` every row is returned. Store the returned cursor and pass it next time;
+    while `more` is true, the rest of this sync follows with that cursor (see tracker.sync).
+    Rows deleted together with their period are not listed; drop them with the period.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        since = request.query_params.get('since')
+        try:
+            since = decode_cursor(since) if since else None
+        except InvalidCursor as exc:
+            raise ValidationError({'since': [str(exc)]})
+        return Response(changes_since(request.user, since, self.get_serializer_context()))
+
+    def get_serializer_context(self):
+        return {'request': self.request, 'view': self}
 
 
 # =========================
@@ -268,6 +766,33 @@ class LogoutView(APIView):
         clear_refresh_cookie(response)
         return response
 
+class LogoutAllView(APIView):
+    """
+    POST /api/logout/all/ — revokes every token of the user (all devices) and clears the cookie.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        revoke_tokens(request.user)
+        response = Response({"detail": "Logged out everywhere."}, status=status.HTTP_200_OK)
+        clear_refresh_cookie(response)
+        return response
+
+# ----- Metrics -----
+class MetricsView(APIView):
+    """
+    GET /api/_metrics/ (staff only) — per-endpoint query/latency report of this worker process.
+    DELETE resets it.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({"pid": os.getpid(), "endpoints": metrics.report(metrics.REGISTRY.raw())})
+
+    def delete(self, request):
+        metrics.REGISTRY.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
 # ----- Signup -----
 class SignupView(APIView):
     permission_classes = [AllowAny]
@@ -1,23 +1,15 @@
 // frontend/src/components/BudgetSummary.jsx
-import React, { useMemo } from 'react';
+import React from 'react';
 import { formatAmount } from '../utils/format';
 
 /**
  * Shows "incomes - budgets" for the active period.
- * Computes totals internally and renders a single concise line.
+ * Reads `left_after_budgets` from the period summary computed by the server.
  */
-export default function BudgetSummary({ incomes = [], budgets = [] }) {
-  const totalIncome = useMemo(
-    () => incomes.reduce((sum, inc) => sum + Number(inc?.amount || 0), 0),
-    [incomes]
-  );
-
-  const totalBudget = useMemo(
-    () => budgets.reduce((sum, b) => sum + Number(b?.amount_allocated || 0), 0),
-    [budgets]
-  );
+export default function BudgetSummary({ summary }) {
+  if (!summary) return null;
 
-  const leftover = totalIncome - totalBudget;
+  const leftover = Number(summary.left_after_budgets);
   const color = leftover < 0 ? '#dc2626' : '#16a34a'; // red if negative, green otherwise
 
   return (
@@ -18,7 +18,7 @@ function toAmericanDate(isoDate) {
   return `${y}-${m}-${d}`;
 }
 
-function DailyHouseSpendings({ periodId, defaultDailyLimit }) {
+function DailyHouseSpendings({ periodId, defaultDailyLimit, initialEntries, pageSize }) {
   const [entries, setEntries] = useState([]);
   const [loading, setLoading] = useState(false);
   const [err, setErr] = useState(null);
@@ -41,9 +41,14 @@ function DailyHouseSpendings({ periodId, defaultDailyLimit }) {
       setEntries([]);
       return;
     }
+    if (initialEntries) {
+      // Already loaded by the dashboard endpoint, in date order.
+      setEntries(initialEntries);
+      return;
+    }
     fetchEntries();
     // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, [periodId]);
+  }, [periodId, initialEntries, pageSize]);
 
   const normalizeListPayload = (payload) => {
     if (Array.isArray(payload)) return payload;
@@ -55,8 +60,7 @@ function DailyHouseSpendings({ periodId, defaultDailyLimit }) {
     setLoading(true);
     setErr(null);
     try {
-      const response = await listDailyHouseSpendings({ period: periodId });
-      const data = normalizeListPayload(response?.data);
+      const data = normalizeListPayload(await listDailyHouseSpendings({ period: periodId }, { pageSize }));
       const sorted = [...data].sort((a, b) => String(a.date).localeCompare(String(b.date)));
       setEntries(sorted);
     } catch (e) {
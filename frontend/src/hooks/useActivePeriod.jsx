@@ -1,10 +1,17 @@
 // frontend/src/hooks/useActivePeriod.js
 import { useEffect, useState } from 'react';
 import { listPeriods, deletePeriod } from '../services/periods';
+import { getDashboard } from '../services/dashboard';
 
-export default function useActivePeriod() {
+/**
+ * Loads the periods and picks the active one. Without `pageSize` the first load goes through
+ * the dashboard endpoint, and `dashboard` holds the active period's collections so the other
+ * hooks can skip their own requests; it is dropped once another period is selected.
+ */
+export default function useActivePeriod({ pageSize } = {}) {
   const [periods, setPeriods] = useState([]);
-  const [activePeriodId, setActivePeriodId] = useState(null);
+  const [activePeriodId, setActive] = useState(null);
+  const [dashboard, setDashboard] = useState(null);
   const [loadingPeriods, setLoading] = useState(true);
   const [errorPeriods, setError] = useState(null);
   const [deletingPeriod, setDeletingPeriod] = useState(false); // deletion state
@@ -15,7 +22,14 @@ export default function useActivePeriod() {
       setLoading(true);
       setError(null);
       try {
-        const ps = await listPeriods();
+        let ps;
+        if (pageSize) {
+          ps = await listPeriods({}, { pageSize });
+        } else {
+          const boot = await getDashboard();
+          ps = boot.periods;
+          if (mounted) setDashboard(boot);
+        }
         if (!mounted) return;
         setPeriods(ps || []);
 
@@ -25,7 +39,7 @@ export default function useActivePeriod() {
         if (active) defaultId = active.id;
         else if (ps?.length) defaultId = ps[ps.length - 1].id;
 
-        setActivePeriodId(defaultId ?? null);
+        setActive(defaultId ?? null);
       } catch (e) {
         if (!mounted) return;
         setError(e?.response?.data || e.message);
@@ -36,7 +50,12 @@ export default function useActivePeriod() {
     return () => {
       mounted = false;
     };
-  }, []);
+  }, [pageSize]);
+
+  const setActivePeriodId = (id) => {
+    setActive(id);
+    setDashboard((boot) => (boot && boot.active_period === id ? boot : null));
+  };
 
   /**
    * Delete currently active period and cascade updates to local state.
@@ -73,6 +92,7 @@ export default function useActivePeriod() {
     setPeriods,
     activePeriodId,
     setActivePeriodId,
+    dashboard,          // first-screen payload for the active period, or null
     loadingPeriods,
     errorPeriods,
     deletingPeriod,     // expose deletion state
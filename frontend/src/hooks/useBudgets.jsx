@@ -2,7 +2,8 @@
 import { useEffect, useState } from 'react';
 import { listBudgets, updateBudgetStatus } from '../services/budgets';
 
-export default function useBudgets(activePeriodId) {
+// `initial`: rows already loaded for activePeriodId (e.g. by the dashboard endpoint); skips the request.
+export default function useBudgets(activePeriodId, { pageSize, initial } = {}) {
   const [budgets, setBudgets] = useState([]);
   const [loadingBudgets, setLoading] = useState(true);
   const [errorBudgets, setError] = useState(null);
@@ -11,6 +12,11 @@ export default function useBudgets(activePeriodId) {
   useEffect(() => {
     let mounted = true;
     (async () => {
+      if (initial) {
+        setBudgets(initial);
+        setLoading(false);
+        return;
+      }
       if (!activePeriodId) {
         setBudgets([]);
         setLoading(false);
@@ -19,12 +25,12 @@ export default function useBudgets(activePeriodId) {
       setLoading(true);
       setError(null);
       try {
-        const serverFiltered = await listBudgets({ period: activePeriodId });
+        const serverFiltered = await listBudgets({ period: activePeriodId }, { pageSize });
         if (!mounted) return;
         setBudgets(serverFiltered);
       } catch (e) {
         try {
-          const all = await listBudgets();
+          const all = await listBudgets({}, { pageSize });
           if (!mounted) return;
           const filtered = (all || []).filter((b) => {
             const pid = typeof b.period === 'object' ? b.period?.id : b.period;
@@ -42,7 +48,7 @@ export default function useBudgets(activePeriodId) {
     return () => {
       mounted = false;
     };
-  }, [activePeriodId]);
+  }, [activePeriodId, pageSize, initial]);
 
   const addBudget = (newBudget) => {
     const pid =
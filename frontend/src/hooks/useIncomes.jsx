@@ -2,7 +2,8 @@
 import { useEffect, useState } from 'react';
 import { listIncomes } from '../services/incomes';
 
-export default function useIncomes(activePeriodId) {
+// `initial`: rows already loaded for activePeriodId (e.g. by the dashboard endpoint); skips the request.
+export default function useIncomes(activePeriodId, { pageSize, initial } = {}) {
   const [incomes, setIncomes] = useState([]);
   const [loadingIncomes, setLoading] = useState(true);
   const [errorIncomes, setError] = useState(null);
@@ -10,6 +11,11 @@ export default function useIncomes(activePeriodId) {
   useEffect(() => {
     let mounted = true;
     (async () => {
+      if (initial) {
+        setIncomes(initial);
+        setLoading(false);
+        return;
+      }
       if (!activePeriodId) {
         setIncomes([]);
         setLoading(false);
@@ -18,12 +24,12 @@ export default function useIncomes(activePeriodId) {
       setLoading(true);
       setError(null);
       try {
-        const serverFiltered = await listIncomes({ period: activePeriodId });
+        const serverFiltered = await listIncomes({ period: activePeriodId }, { pageSize });
         if (!mounted) return;
         setIncomes(serverFiltered);
       } catch (e) {
         try {
-          const all = await listIncomes();
+          const all = await listIncomes({}, { pageSize });
           if (!mounted) return;
           const filtered = (all || []).filter((i) => {
             const pid = typeof i.period === 'object' ? i.period?.id : i.period;
@@ -41,7 +47,7 @@ export default function useIncomes(activePeriodId) {
     return () => {
       mounted = false;
     };
-  }, [activePeriodId]);
+  }, [activePeriodId, pageSize, initial]);
 
   const addIncome = (newIncome) => {
     const pid =
@@ -2,7 +2,8 @@
 import { useEffect, useState } from 'react';
 import { listMiscellaneousCosts } from '../services/miscellaneousCosts';
 
-export default function useMiscellaneousCosts(activePeriodId) {
+// `initial`: rows already loaded for activePeriodId (e.g. by the dashboard endpoint); skips the request.
+export default function useMiscellaneousCosts(activePeriodId, { pageSize, initial } = {}) {
   const [miscCosts, setMiscCosts] = useState([]);
   const [loadingMiscCosts, setLoading] = useState(true);
   const [errorMiscCosts, setError] = useState(null);
@@ -10,6 +11,11 @@ export default function useMiscellaneousCosts(activePeriodId) {
   useEffect(() => {
     let mounted = true;
     (async () => {
+      if (initial) {
+        setMiscCosts(initial);
+        setLoading(false);
+        return;
+      }
       if (!activePeriodId) {
         setMiscCosts([]);
         setLoading(false);
@@ -18,7 +24,7 @@ export default function useMiscellaneousCosts(activePeriodId) {
       setLoading(true);
       setError(null);
       try {
-        const data = await listMiscellaneousCosts({ period: activePeriodId });
+        const data = await listMiscellaneousCosts({ period: activePeriodId }, { pageSize });
         if (!mounted) return;
         setMiscCosts(data || []);
       } catch (e) {
@@ -31,7 +37,7 @@ export default function useMiscellaneousCosts(activePeriodId) {
     return () => {
       mounted = false;
     };
-  }, [activePeriodId]);
+  }, [activePeriodId, pageSize, initial]);
 
   const addMiscCost = (newCost) => {
     const pid = typeof newCost.period === 'object' ? newCost.period?.id : newCost.period;
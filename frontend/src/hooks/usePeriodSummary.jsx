@@ -0,0 +1,45 @@
+// frontend/src/hooks/usePeriodSummary.jsx
+import { useEffect, useState } from 'react';
+import { getPeriodSummary } from '../services/periods';
+
+// Server-side totals for the active period (GET periods/<id>/summary/).
+// `initial`: the summary already loaded for activePeriodId (e.g. by the dashboard endpoint); skips the request.
+// `version`: bump it after writes to the period's rows to fetch fresh totals.
+export default function usePeriodSummary(activePeriodId, { initial, version = 0 } = {}) {
+  const [summary, setSummary] = useState(null);
+  const [loadingSummary, setLoading] = useState(true);
+  const [errorSummary, setError] = useState(null);
+
+  useEffect(() => {
+    let mounted = true;
+    (async () => {
+      if (initial && !version) {
+        setSummary(initial);
+        setLoading(false);
+        return;
+      }
+      if (!activePeriodId) {
+        setSummary(null);
+        setLoading(false);
+        return;
+      }
+      setLoading(true);
+      setError(null);
+      try {
+        const data = await getPeriodSummary(activePeriodId);
+        if (!mounted) return;
+        setSummary(data);
+      } catch (e) {
+        if (!mounted) return;
+        setError(e?.response?.data || e.message);
+      } finally {
+        if (mounted) setLoading(false);
+      }
+    })();
+    return () => {
+      mounted = false;
+    };
+  }, [activePeriodId, initial, version]);
+
+  return { summary, loadingSummary, errorSummary };
+}
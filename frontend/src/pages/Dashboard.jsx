@@ -19,6 +19,7 @@ import useActivePeriod from '../hooks/useActivePeriod';
 import useIncomes from '../hooks/useIncomes';
 import useBudgets from '../hooks/useBudgets';
 import useMiscellaneousCosts from '../hooks/useMiscellaneousCosts';
+import usePeriodSummary from '../hooks/usePeriodSummary';
 import MiscellaneousCosts from '../components/MiscellaneousCosts';
 import { formatAmount } from '../utils/format';
 import Modal from '../components/Modal';
@@ -29,6 +30,7 @@ export default function Dashboard() {
   const [showAddPeriod, setShowAddPeriod] = useState(false);
   const [showAddBudget, setShowAddBudget] = useState(false);
   const [showAddCategory, setShowAddCategory] = useState(false);
+  const [summaryVersion, setSummaryVersion] = useState(0); // bumped after writes that move the totals
 
   const navigate = useNavigate();
   const {
@@ -36,6 +38,7 @@ export default function Dashboard() {
     setPeriods,
     activePeriodId,
     setActivePeriodId,
+    dashboard,
     loadingPeriods,
     errorPeriods,
     deletingPeriod,
@@ -47,7 +50,7 @@ export default function Dashboard() {
     errorIncomes,
     addIncome,
     removeIncome,
-  } = useIncomes(activePeriodId);
+  } = useIncomes(activePeriodId, { initial: dashboard?.incomes });
   const {
     budgets,
     loadingBudgets,
@@ -56,17 +59,27 @@ export default function Dashboard() {
     addBudget,
     removeBudget,
     toggleBudgetStatus,
-  } = useBudgets(activePeriodId);
+  } = useBudgets(activePeriodId, { initial: dashboard?.budgets });
   const {
     miscCosts,
     loadingMiscCosts,
     errorMiscCosts,
     addMiscCost,
     removeMiscCost,
-  } = useMiscellaneousCosts(activePeriodId);
+  } = useMiscellaneousCosts(activePeriodId, { initial: dashboard?.misc_costs });
+  const { summary, errorSummary } = usePeriodSummary(activePeriodId, {
+    initial: dashboard?.summary,
+    version: summaryVersion,
+  });
 
   const loading = loadingPeriods || loadingIncomes || loadingBudgets || loadingMiscCosts;
-  const err = errorPeriods || errorIncomes || errorBudgets || errorMiscCosts;
+  const err = errorPeriods || errorIncomes || errorBudgets || errorMiscCosts || errorSummary;
+
+  // Wrap a local list update so the server totals are fetched again afterwards.
+  const refreshingSummary = (update) => (...args) => {
+    update(...args);
+    setSummaryVersion((v) => v + 1);
+  };
 
   const handleLogout = async () => {
     try { await api.post('logout/'); } catch (_) {}
@@ -74,7 +87,7 @@ export default function Dashboard() {
     navigate('/', { replace: true });
   };
   const handleAddIncome = (newIncome) => {
-    addIncome(newIncome);
+    refreshingSummary(addIncome)(newIncome);
     setShowIncomeForm(false);
   };
   const handleAddPeriod = (newPeriod) => {
@@ -83,7 +96,7 @@ export default function Dashboard() {
     setShowAddPeriod(false);
   };
   const handleAddBudget = (newBudget) => {
-    addBudget(newBudget);
+    refreshingSummary(addBudget)(newBudget);
     setShowAddBudget(false);
   };
   const handleAddCategory = () => {
@@ -125,15 +138,13 @@ export default function Dashboard() {
   const totalDefaultDaily = activePeriod?.default_daily_limit != null
     ? Number(activePeriod.default_daily_limit) * periodDays
     : null;
-  const leftAfterBudgets =
-    memoIncomes.reduce((sum, inc) => sum + Number(inc?.amount || 0), 0) -
-    memoBudgets.reduce((sum, b) => sum + Number(b?.amount_allocated || 0), 0);
+  const leftAfterBudgets = Number(summary?.left_after_budgets || 0);
 
   const diffFromLeftover = totalDefaultDaily != null
     ? leftAfterBudgets - totalDefaultDaily
     : null;
 
-  const totalMiscCosts = memoMiscCosts.reduce((sum, cost) => sum + Number(cost.amount || 0), 0);
+  const totalMiscCosts = Number(summary?.misc_cost_total || 0);
   
   const finalRemaining = diffFromLeftover != null ? diffFromLeftover - totalMiscCosts : null;
 
@@ -173,7 +184,7 @@ export default function Dashboard() {
           <div className="card">
             <h2>Your Incomes</h2>
             {activePeriodId ? (
-              <IncomeList incomes={memoIncomes} onDeleted={removeIncome} />
+              <IncomeList incomes={memoIncomes} onDeleted={refreshingSummary(removeIncome)} />
             ) : (
               <p>Please select a period to view incomes.</p>
             )}
@@ -187,9 +198,9 @@ export default function Dashboard() {
                   budgets={memoBudgets}
                   updatingBudget={updatingBudget}
                   onToggleStatus={toggleBudgetStatus}
-                  onDeleted={removeBudget}
+                  onDeleted={refreshingSummary(removeBudget)}
                 />
-                <BudgetSummary incomes={memoIncomes} budgets={memoBudgets} />
+                <BudgetSummary summary={summary} />
               </>
             ) : (
               <p>Please select a period to view budgets.</p>
@@ -208,6 +219,7 @@ export default function Dashboard() {
                 <DailyHouseSpendings
                   periodId={activePeriodId}
                   defaultDailyLimit={activePeriod?.default_daily_limit}
+                  initialEntries={dashboard?.daily_house_spendings}
                 />
                 {diffFromLeftover != null && (
                   <div style={{ marginTop: '1.5rem', fontWeight: 600, fontSize: '1.1rem' }}>
@@ -226,8 +238,8 @@ export default function Dashboard() {
               <MiscellaneousCosts 
                 periodId={activePeriodId}
                 costs={memoMiscCosts}
-                onCostAdded={addMiscCost}
-                onCostDeleted={removeMiscCost}
+                onCostAdded={refreshingSummary(addMiscCost)}
+                onCostDeleted={refreshingSummary(removeMiscCost)}
               />
               {finalRemaining != null && (
                  <div
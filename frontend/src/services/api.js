@@ -72,5 +72,27 @@ api.interceptors.response.use(
   }
 );
 
+/**
+ * GET a tracker list endpoint.
+ * Without `pageSize` the server returns the full list in one response (the default).
+ * With `pageSize` it opts into cursor pagination and follows `next` links until every page is loaded.
+ */
+export async function getList(url, params = {}, { pageSize } = {}) {
+  if (!pageSize) {
+    const { data } = await api.get(url, { params });
+    return data?.results ?? data;
+  }
+  const items = [];
+  let next = url;
+  let query = { ...params, page_size: pageSize };
+  while (next) {
+    const { data } = await api.get(next, { params: query });
+    items.push(...(data?.results ?? []));
+    next = data?.next || null;
+    query = undefined; // `next` already carries the cursor and filters
+  }
+  return items;
+}
+
 export default api;
 export { getAccessToken, setAccessToken, clearAccessToken };
@@ -1,13 +1,12 @@
 // frontend/src/services/budgets.js
-import api from './api';
+import api, { getList } from './api';
 
 /**
  * Fetch budgets.
- * Supports optional query params and both paginated (`results`) and plain array responses.
+ * Supports optional query params; pass `{ pageSize }` to load the list page by page.
  */
-export async function listBudgets(params = {}) {
-  const { data } = await api.get('budgets/', { params });
-  return data?.results ?? data;
+export async function listBudgets(params = {}, options = {}) {
+  return getList('budgets/', params, options);
 }
 
 /**
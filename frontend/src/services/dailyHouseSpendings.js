@@ -1,13 +1,18 @@
 // /home/alireza/cost-tracker/frontend/src/services/dailyHouseSpendings.js
-import api from './api';
+import api, { getList } from './api';
 
 const ENDPOINT = 'daily-house-spendings/';
 
-export const listDailyHouseSpendings = (params = {}) =>
-  api.get(ENDPOINT, { params });
+// Rows come back in date order; pass `{ pageSize }` to load the list page by page.
+export const listDailyHouseSpendings = (params = {}, options = {}) =>
+  getList(ENDPOINT, params, options);
 
 export const createDailyHouseSpending = (data) =>
   api.post(ENDPOINT, data);
 
 export const deleteDailyHouseSpending = (id) =>
   api.delete(`${ENDPOINT}${id}/`);
+
+// Create or overwrite many days at once; returns { results, errors } with per-item errors.
+export const bulkUpsertDailyHouseSpendings = (items) =>
+  api.post(`${ENDPOINT}bulk/`, items);
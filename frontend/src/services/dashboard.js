@@ -0,0 +1,12 @@
+// frontend/src/services/dashboard.js
+import api from './api';
+
+/**
+ * Fetch the dashboard's first screen in one request: periods, categories, and the
+ * chosen period's incomes, budgets, misc costs, daily spendings and summary totals.
+ * Without `periodId` the server picks the latest period (see `active_period`).
+ */
+export async function getDashboard(periodId) {
+  const { data } = await api.get('dashboard/', { params: periodId ? { period: periodId } : {} });
+  return data;
+}
@@ -0,0 +1,19 @@
+// frontend/src/services/export.js
+import api from './api';
+
+/**
+ * Download the ledger as `csv` or `jsonl` (optionally one period) and save it as a file.
+ */
+export async function downloadLedger(format = 'csv', periodId) {
+  const params = { format, ...(periodId ? { period: periodId } : {}) };
+  const res = await api.get('export/', { params, responseType: 'blob' });
+  const match = /filename="([^"]+)"/.exec(res.headers['content-disposition'] || '');
+  const url = URL.createObjectURL(res.data);
+  const link = document.createElement('a');
+  link.href = url;
+  link.download = match ? match[1] : `ledger.${format}`;
+  document.body.appendChild(link);
+  link.click();
+  link.remove();
+  URL.revokeObjectURL(url);
+}
@@ -0,0 +1,16 @@
+// frontend/src/services/import.js
+import api from './api';
+
+/**
+ * Upload a CSV statement. `debits` (daily_spending or misc_cost) says where debits go;
+ * `periodId` restricts the import to one period.
+ * Resolves to { created, errors: [{ line, errors }], error_count }.
+ */
+export async function importStatement(file, { debits = 'daily_spending', periodId } = {}) {
+  const form = new FormData();
+  form.append('file', file);
+  form.append('debits', debits);
+  if (periodId) form.append('period', periodId);
+  const res = await api.post('import/', form);
+  return res.data;
+}
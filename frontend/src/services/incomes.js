@@ -1,8 +1,7 @@
-import api from './api';
+import api, { getList } from './api';
 
-export async function listIncomes(params = {}) {
-  const { data } = await api.get('incomes/', { params });
-  return data?.results ?? data;
+export async function listIncomes(params = {}, options = {}) {
+  return getList('incomes/', params, options);
 }
 
 export async function createIncome(payload) {
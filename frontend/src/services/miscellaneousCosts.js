@@ -1,11 +1,9 @@
-import api from './api';
+import api, { getList } from './api';
 
 const ENDPOINT = 'misc-costs/';
 
-export const listMiscellaneousCosts = async (params = {}) => {
-  const { data } = await api.get(ENDPOINT, { params });
-  return data?.results ?? data;
-};
+export const listMiscellaneousCosts = (params = {}, options = {}) =>
+  getList(ENDPOINT, params, options);
 
 export const createMiscellaneousCost = async (payload) => {
   const { data } = await api.post(ENDPOINT, payload);
@@ -1,12 +1,19 @@
 // frontend/src/services/periods.js
-import api from './api';
+import api, { getList } from './api';
 
 /**
- * Fetch all periods (supports paginated and non-paginated responses).
+ * Fetch all periods; pass `{ pageSize }` to load them page by page.
  */
-export async function listPeriods(params = {}) {
-  const { data } = await api.get('periods/', { params });
-  return data?.results ?? data;
+export async function listPeriods(params = {}, options = {}) {
+  return getList('periods/', params, options);
+}
+
+/**
+ * Fetch server-side totals for a period (incomes, budgets, misc costs, spendings).
+ */
+export async function getPeriodSummary(id) {
+  const { data } = await api.get(`periods/${id}/summary/`);
+  return data;
 }
 
 /**
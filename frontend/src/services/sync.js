@@ -0,0 +1,41 @@
+// frontend/src/services/sync.js
+import api from './api';
+
+/**
+ * Fetch rows changed since `cursor` (everything when omitted), following the pages of the sync.
+ * Returns { cursor, full, reset, changes: { collection: [rows] }, deleted: { collection: [ids] } };
+ * keep `cursor` for the next call. With `reset` true, replace the local copy instead of merging.
+ */
+export async function syncChanges(cursor) {
+  const { data } = await api.get('sync/', { params: cursor ? { since: cursor } : {} });
+  let page = data;
+  while (page.more) {
+    ({ data: page } = await api.get('sync/', { params: { since: page.cursor } }));
+    for (const [name, rows] of Object.entries(page.changes)) {
+      data.changes[name] = [...(data.changes[name] || []), ...rows];
+    }
+    for (const [name, ids] of Object.entries(page.deleted)) {
+      data.deleted[name] = [...(data.deleted[name] || []), ...ids];
+    }
+  }
+  return { ...data, cursor: page.cursor, more: false };
+}
+
+/**
+ * Merge a sync response into a local copy shaped like `changes` ({ collection: [rows] }).
+ * Rows are upserted by id; deleted ids are dropped, and rows of deleted periods go with them.
+ */
+export function applySync(local, { full, changes, deleted }) {
+  const goneIds = (name) => new Set(deleted?.[name] || []);
+  const gonePeriods = goneIds('periods');
+  const next = {};
+  for (const [name, rows] of Object.entries(changes)) {
+    const byId = new Map(full ? [] : (local?.[name] || []).map((row) => [row.id, row]));
+    rows.forEach((row) => byId.set(row.id, row));
+    const gone = goneIds(name);
+    next[name] = [...byId.values()].filter(
+      (row) => !gone.has(row.id) && !gonePeriods.has(row.period)
+    );
+  }
+  return next;
+}